@@ -1,6 +1,12 @@
 import pandas as pd
 import os
 
+CRITICAL_TRUST_SCORE = 20  # Packets scoring below this are dropped
+
+def safe_mask(df, threshold=CRITICAL_TRUST_SCORE):
+    """Return a boolean array marking the rows of a scored DataFrame that are kept."""
+    return (df['trust_score'] >= threshold).to_numpy()
+
 def drop_critical_packets(input_path):
     """
     Drop packets with trust score less than 20 (Critical Risk)
@@ -18,7 +24,7 @@ def drop_critical_packets(input_path):
     original_count = len(df)
     
     # Filter out critical packets (trust_score < 20)
-    safe_packets = df[df['trust_score'] >= 20].copy()
+    safe_packets = df[safe_mask(df)].copy()
     
     # Count of dropped packets
     dropped_count = original_count - len(safe_packets)
@@ -1,8 +1,35 @@
+import numpy as np
 import pandas as pd
 import csv
 import os
 from . import DropPackets  # Import the DropPackets module
 
+# Base risk levels for different attack types (higher number = higher risk)
+ATTACK_RISK_LEVELS = {
+    "DDoS": 95,
+    "SQL Injection": 90,
+    "Malware": 95,
+    "XSS": 85,
+    "Command Injection": 90,
+    "Brute Force": 85,
+    "Port Scanning": 80,
+    "Path Traversal": 75,
+    "CSRF": 70,
+    "Reconnaissance": 65,
+    "Normal": 10  # Very low base risk
+}
+DEFAULT_RISK_LEVEL = 80  # Attack types not listed above
+
+# Trust level categories and the scores where the next one starts
+TRUST_LEVELS = [
+    "Critical Risk - Block",
+    "High Risk - Strict Verification",
+    "Medium Risk - Additional Verification",
+    "Low Risk - Standard Verification",
+    "Trusted - Minimal Verification"
+]
+TRUST_LEVEL_BOUNDS = [20, 40, 60, 80]
+
 def calculate_trust_score(attack_type, confidence_score):
     """
     Calculate trust score based on attack type and confidence score.
@@ -17,23 +44,8 @@ def calculate_trust_score(attack_type, confidence_score):
     - 81-100: Trusted (minimal verification)
     """
     
-    # Base risk levels for different attack types (higher number = higher risk)
-    attack_risk_levels = {
-        "DDoS": 95,
-        "SQL Injection": 90,
-        "Malware": 95,
-        "XSS": 85,
-        "Command Injection": 90,
-        "Brute Force": 85,
-        "Port Scanning": 80,
-        "Path Traversal": 75,
-        "CSRF": 70,
-        "Reconnaissance": 65,
-        "Normal": 10  # Very low base risk
-    }
-    
     # Get base risk level for this attack type
-    base_risk = attack_risk_levels.get(attack_type, 80)  # Default to 80 if attack type not found
+    base_risk = ATTACK_RISK_LEVELS.get(attack_type, DEFAULT_RISK_LEVEL)
     
     if attack_type == "Normal":
         # For normal traffic, higher confidence that it's normal means higher trust
@@ -47,6 +59,50 @@ def calculate_trust_score(attack_type, confidence_score):
     # Ensure score is within 0-100 range
     return max(0, min(100, trust_score))
 
+def get_trust_level(trust_score):
+    """Return the trust level category of a trust score."""
+    for bound, level in zip(TRUST_LEVEL_BOUNDS, TRUST_LEVELS):
+        if trust_score < bound:
+            return level
+    return TRUST_LEVELS[-1]
+
+def _round2(values):
+    """
+    Round to 2 decimals exactly like Python's round().
+
+    np.round scales by 100 first, which can tip values that sit next to a
+    half-cent the wrong way; only those few are re-rounded with round().
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_half = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    rounded[near_half] = [round(x, 2) for x in values[near_half].tolist()]
+    return rounded
+
+def score_frame(df):
+    """
+    Vectorized calculate_trust_score/get_trust_level for a whole DataFrame.
+
+    Args:
+        df (pd.DataFrame): packet_id, attack_type and confidence_score columns.
+
+    Returns:
+        pd.DataFrame: The process_dataset columns (packet_id, attack_type,
+        confidence_score, trust_score rounded to 2 places, trust_level).
+    """
+    confidence = df['confidence_score'].to_numpy(dtype=np.float64)
+    base_risk = df['attack_type'].map(ATTACK_RISK_LEVELS).to_numpy(dtype=np.float64, na_value=np.nan)
+    base_risk = np.where(np.isnan(base_risk), DEFAULT_RISK_LEVEL, base_risk)
+    trust_score = np.clip(100 - (confidence / 100) * base_risk, 0, 100)
+    levels = np.array(TRUST_LEVELS, dtype=object)[np.searchsorted(TRUST_LEVEL_BOUNDS, trust_score, side='right')]
+    return pd.DataFrame({
+        'packet_id': df['packet_id'].to_numpy(),
+        'attack_type': df['attack_type'].to_numpy(),
+        'confidence_score': confidence,
+        'trust_score': _round2(trust_score),
+        'trust_level': levels
+    })
+
 def process_dataset(file_path):
     """Process the dataset and calculate trust scores for each packet."""
     
@@ -66,16 +122,7 @@ def process_dataset(file_path):
             trust_score = calculate_trust_score(attack_type, confidence_score)
             
             # Determine trust level category
-            if trust_score < 20:
-                trust_level = "Critical Risk - Block"
-            elif trust_score < 40:
-                trust_level = "High Risk - Strict Verification"
-            elif trust_score < 60:
-                trust_level = "Medium Risk - Additional Verification"
-            elif trust_score < 80:
-                trust_level = "Low Risk - Standard Verification"
-            else:
-                trust_level = "Trusted - Minimal Verification"
+            trust_level = get_trust_level(trust_score)
             
             # Add to results
             results.append({
@@ -1,8 +1,10 @@
-from flask import Flask, render_template, jsonify, request, redirect, url_for, flash
+from flask import Flask, Response, render_template, jsonify, request, redirect, url_for, flash, stream_with_context
 from flask_socketio import SocketIO
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from services import mitigation_service, database_service, summary_service
+from services import mitigation_service, database_service, summary_service, export_service, aggregate_service, talker_service, classifier_service
+from services.cache_service import LRUCache
 from user import User
+from config import INGEST_DEDUP_SIZE
 
 # --- Initialization ---
 app = Flask(__name__)
@@ -11,6 +13,7 @@ app.config['SECRET_KEY'] = 'secret!'
 socketio = SocketIO(app)
 database_service.init_db()
 packet_logs = []
+ingested_ids = LRUCache(INGEST_DEDUP_SIZE)
 
 # --- Flask-Login Setup ---
 login_manager = LoginManager()
@@ -70,14 +73,60 @@ def ingest_packet():
     if not packet_data or not prediction_data:
         return jsonify({"error": "Invalid data received"}), 400
 
+    _ingest(packet_data, prediction_data)
+    return jsonify({"status": "ok"}), 200
+
+@app.route('/api/ingest/batch', methods=['POST'])
+def ingest_batch():
+    """
+    Receives a batch of packets forwarded by the honeypot, as
+    {"packets": [{"packet_data": ..., "prediction_data": ..., "forward_id": ...}, ...]}.
+
+    Invalid entries and packets that fail to ingest are skipped and counted,
+    so the batch is still answered with 200 and the forwarder does not resend
+    it. Packets whose forward_id was already ingested (a retry or replay of a
+    post that timed out after the dashboard processed it) are skipped too.
+    """
+    packets = (request.get_json(silent=True) or {}).get('packets')
+    if not isinstance(packets, list):
+        return jsonify({"error": "Invalid data received"}), 400
+
+    ingested = duplicates = 0
+    for packet in packets:
+        packet_data = packet.get('packet_data') if isinstance(packet, dict) else None
+        prediction_data = packet.get('prediction_data') if isinstance(packet, dict) else None
+        if not packet_data or not prediction_data:
+            continue
+        forward_id = packet.get('forward_id')
+        if forward_id is not None and not ingested_ids.put_if_absent(forward_id, True):
+            duplicates += 1
+            continue
+        try:
+            _ingest(packet_data, prediction_data)
+        except Exception as e:
+            print(f"[Dashboard] ⚠️ Rejected a forwarded packet: {e!r}")
+            continue
+        ingested += 1
+    print(f"[Dashboard] Ingested {ingested} of {len(packets)} packets at /api/ingest/batch ({duplicates} duplicates).")
+
+    return jsonify({
+        "status": "ok", "ingested": ingested, "duplicates": duplicates,
+        "rejected": len(packets) - ingested - duplicates
+    }), 200
+
+def _ingest(packet_data, prediction_data):
+    """Score, mitigate, record and broadcast one packet."""
+    # Score the packet with the live classifier when it is enabled
+    packet_data = classifier_service.score_packet(packet_data, prediction_data)
+
     # Process the packet using the mitigation service
     response_data = mitigation_service.process_packet(packet_data, prediction_data)
     packet_logs.append(response_data)
+    aggregate_service.record(response_data)
 
     # Broadcast the results to all connected SocketIO clients
     socketio.emit('packet_data_response', response_data)
-
-    return jsonify({"status": "ok"}), 200
+    return response_data
 
 
 @app.route('/api/unblock_ip', methods=['POST'])
@@ -91,14 +140,29 @@ def unblock_ip_route():
 @app.route('/api/blocked_ips', methods=['GET'])
 @login_required
 def get_blocked_ips_route():
-    """Return the list of currently permanently blocked IP addresses."""
-    return jsonify(mitigation_service.get_blocked_ips())
+    """Return the blocked IPs, or only the changes after `?since=<version>`."""
+    since = request.args.get('since', type=int)
+    return _versioned_response(mitigation_service.get_blocked_ips(since), 'blocked', since)
 
 @app.route('/api/alerts', methods=['GET'])
 @login_required
 def get_alerts_route():
-    """Return the list of IPs in the alert state with remaining time."""
-    return jsonify(mitigation_service.get_alerts())
+    """Return the alerted IPs with remaining time, or only the changes after `?since=<version>`."""
+    since = request.args.get('since', type=int)
+    return _versioned_response(mitigation_service.get_alerts(since), 'alerts', since)
+
+def _versioned_response(payload, tag, since=None):
+    """
+    Build a JSON response tagged with the list version so that polling clients
+    sending If-None-Match get an empty 304 while nothing has changed.
+    """
+    response = jsonify(payload)
+    etag = f"{tag}-{payload.get('version')}"
+    if since is not None:
+        etag += f"-since-{since}"
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/api/clear_all_blocks', methods=['POST'])
 @login_required
@@ -111,20 +175,74 @@ def clear_all_blocks_route():
 def generate_summary_route():
     """Generate a summary of recent network activity."""
     interval = request.args.get('interval', default=15, type=int)
-    summary = summary_service.generate_summary_from_llm(interval, packet_logs)
+    summary = summary_service.get_summary(interval)
     return jsonify({"summary": summary})
 
+@app.route('/api/top_talkers', methods=['GET'])
+@login_required
+def top_talkers_route():
+    """Return the top source IPs and ports by malicious volume over the last `interval` minutes."""
+    interval = request.args.get('interval', default=15, type=int)
+    n = request.args.get('n', default=10, type=int)
+    return jsonify(talker_service.get_top_talkers(interval, n))
+
 @app.route('/api/get_logs', methods=['GET'])
 @login_required
 def get_logs_route():
     """Return the list of all packet logs."""
     return jsonify(packet_logs)
 
+@app.route('/api/export/<kind>', methods=['GET'])
+@login_required
+def export_route(kind):
+    """
+    Stream packet logs or mitigation decisions as NDJSON or CSV.
+
+    Query parameters: format (ndjson|csv), gzip (0|1), start/end (epoch seconds
+    or ISO 8601) and, for logs, action, prediction, src_ip and trust_level.
+    Rows are encoded one at a time and sent with chunked transfer encoding.
+    """
+    fmt = request.args.get('format', default='ndjson')
+    compress = request.args.get('gzip', default=0, type=int) == 1
+    if fmt not in export_service.EXPORT_FORMATS:
+        return jsonify({"error": f"Unsupported export format '{fmt}'."}), 400
+
+    if kind == 'logs':
+        try:
+            start = export_service.parse_time(request.args.get('start'))
+            end = export_service.parse_time(request.args.get('end'))
+        except ValueError:
+            return jsonify({"error": "Invalid start/end time."}), 400
+        rows = export_service.iter_log_rows(
+            packet_logs, start=start, end=end,
+            action=request.args.get('action'),
+            prediction=request.args.get('prediction'),
+            src_ip=request.args.get('src_ip'),
+            trust_level=request.args.get('trust_level')
+        )
+        fields = export_service.LOG_EXPORT_FIELDS
+    elif kind == 'decisions':
+        rows = export_service.iter_decision_rows()
+        fields = export_service.DECISION_EXPORT_FIELDS
+    else:
+        return jsonify({"error": f"Unknown export '{kind}'. Use 'logs' or 'decisions'."}), 404
+
+    filename = f"{kind}.{fmt}" + (".gz" if compress else "")
+    mimetype = 'application/gzip' if compress else ('text/csv' if fmt == 'csv' else 'application/x-ndjson')
+    chunks = export_service.stream_export(rows, fmt, fields, compress=compress)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 @app.route('/api/clear_logs', methods=['POST'])
 @login_required
 def clear_logs_route():
     """Clear all packet logs."""
     packet_logs.clear()
+    aggregate_service.reset()
+    talker_service.reset()
     return jsonify({"message": "Logs cleared successfully"})
 
 if __name__ == '__main__':
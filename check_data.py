@@ -1,5 +1,5 @@
-import pandas as pd
 import os
+from services.dataset_cache import read_dataset
 
 TRAFFIC_DATA_PATH = os.path.join('Models', 'cicids2018', 'CICIDS2018_test_balanced_alligned.csv')
 DETAILS_DATA_PATH = os.path.join('Models', 'ztadatasetfile.csv')
@@ -7,8 +7,9 @@ DETAILS_DATA_PATH = os.path.join('Models', 'ztadatasetfile.csv')
 print("--- Data Integrity Check ---")
 
 try:
-    traffic_df = pd.read_csv(TRAFFIC_DATA_PATH)
-    details_df = pd.read_csv(DETAILS_DATA_PATH)
+    # Only the row count of the traffic data is needed, so load a single column
+    traffic_df = read_dataset(TRAFFIC_DATA_PATH, columns=['attack_cat'])
+    details_df = read_dataset(DETAILS_DATA_PATH)
 
     traffic_len = len(traffic_df)
     details_len = len(details_df)
@@ -23,3 +23,117 @@ REPUTATION_MANUAL_UNBLOCK_RESET_SCORE = 75 # Score to reset to on manual unblock
 TRUST_SCORE_THRESHOLD_BLOCK = 19  # Trust score at or below which an IP is permanently blocked
 TRUST_SCORE_THRESHOLD_ALERT = 60  # Trust score at or below which an IP is temporarily blocked
 
+
+# Summary Service Configuration
+SUMMARY_BUCKET_RETENTION_MINUTES = 24 * 60  # Per-minute aggregate buckets kept in memory
+SUMMARY_TOP_SOURCE_IPS = 5  # Number of top source IPs reported in summaries
+SUMMARY_CACHE_SIZE = 32  # Generated summaries kept in the LRU cache
+
+# Top Talkers Configuration (heavy-hitter sketches over malicious traffic)
+TOP_TALKERS_SKETCH_CAPACITY = 100  # Items tracked per sketch; fixes memory regardless of distinct IPs
+TOP_TALKERS_RETENTION_MINUTES = 60  # Per-minute sketch windows kept in memory
+
+# LLM Summary Backend Configuration
+SUMMARY_BACKEND = 'template'  # 'template' (offline report) or 'http' (LLM server at SUMMARY_LLM_URL)
+SUMMARY_LLM_URL = 'http://127.0.0.1:8090/generate'
+SUMMARY_LLM_API_KEY = None
+SUMMARY_LLM_CONNECT_TIMEOUT_SECONDS = 1
+SUMMARY_LLM_READ_TIMEOUT_SECONDS = 5
+SUMMARY_LLM_MAX_TOKENS = 500
+SUMMARY_LLM_POOL_SIZE = 4  # Keep-alive connections kept open to the LLM server
+SUMMARY_PROMPT_TOKEN_BUDGET = 1000  # Upper bound on prompt size regardless of traffic volume
+SUMMARY_CIRCUIT_FAILURE_THRESHOLD = 3  # Consecutive failures before the LLM is skipped
+SUMMARY_CIRCUIT_RESET_SECONDS = 30  # Time before a failing LLM is tried again
+
+# Controller Configuration
+CONTROLLER_LIVE_CSV_PATH = 'live_data/latest.csv'  # CSV appended to by the Traffic Aggregator
+CONTROLLER_CHUNK_ROWS = 5000  # Maximum rows handed to the pipeline per batch
+CONTROLLER_BLOCK_THRESHOLD = 0.30  # Zero-trust score below which an IP is blocked
+CONTROLLER_RATE_LIMIT_THRESHOLD = 0.60  # Zero-trust score below which an IP is rate-limited
+CONTROLLER_INFERENCE_MODE = 'thread'  # 'serial', 'thread' or 'process' for base-model inference
+CONTROLLER_INFERENCE_WORKERS = 4
+CONTROLLER_MODEL_TIMEOUT_SECONDS = 5  # Models slower than this are left out of the batch's ensemble
+CONTROLLER_ENSEMBLE_MODE = 'full'  # 'full' runs every base model; 'cascade' escalates only uncertain rows
+CONTROLLER_CASCADE_MODEL = 'log_reg'  # Cheap model that scores every row in cascade mode
+CONTROLLER_CASCADE_BAND = (0.2, 0.8)  # Cheap-model probabilities in this band are escalated
+CONTROLLER_CASCADE_AUDIT_EVERY = 20  # Compare against the full ensemble every N batches (0 disables)
+CONTROLLER_SHARDS = 1  # Worker processes the pipeline is split across by src_ip (1 runs it in the controller process)
+CONTROLLER_SHARD_TIMEOUT_SECONDS = 60  # Longest the coordinator waits for a shard's plan
+CONTROLLER_IP_STATE_SIZE = 100_000  # Source IPs whose running score each controller process remembers
+CONTROLLER_IP_SCORE_DECAY = 0.5  # Weight of an IP's running score against its worst score in a new batch
+
+# Model Registry Configuration (paths relative to the repository root)
+MODEL_PATHS = {
+    # Controller base models
+    "log_reg": "models/log_reg.pkl",
+    "svm": "models/svm.pkl",
+    "random_forest": "models/random_forest.pkl",
+    "mlp": "models/mlp.pkl",
+    # CICIDS2018 models
+    "cicids_rf": "Models/cicids2018/rf.pkl",
+    "cicids_xgb": "Models/cicids2018/xgb.pkl",
+    "cicids_lgb": "Models/cicids2018/lgb.pkl",
+    "cicids_cat": "Models/cicids2018/cat.pkl",
+    "cicids_scaler": "Models/cicids2018/scaler (1).pkl",
+    # UNSW-NB15 models
+    "nb15_rf": "Models/nsbw/nb15_rf.pkl",
+    "nb15_xgb": "Models/nsbw/nb15_xgb.pkl",
+    "nb15_lgb": "Models/nsbw/nb15_lgb.pkl",
+    "nb15_cat": "Models/nsbw/nb15_cat.pkl",
+    "nb15_scaler": "Models/nsbw/nb15_aligned_scaler.pkl",
+    "aligned_feature_list": "Models/aligned_feature_list.pkl",
+}
+MODEL_MMAP_MODE = 'r'  # Memory-map model arrays so worker processes share them
+
+# Live Classifier Configuration (scores packets at ingest with the CICIDS2018 models)
+LIVE_CLASSIFIER_ENABLED = False  # When False the precomputed attack_type/confidence_score are used
+LIVE_CLASSIFIER_MODELS = ['cicids_rf']  # Soft-voted tree models; add cicids_xgb/lgb/cat where those libraries are installed
+LIVE_CLASSIFIER_SCALER = 'cicids_scaler'
+LIVE_CLASSIFIER_FEATURES = 'aligned_feature_list'
+LIVE_CLASSIFIER_COMPILE_TREES = True  # Evaluate the tree models as flattened NumPy node arrays (services/tree_compiler.py)
+LIVE_CLASSIFIER_CLASS_NAMES = {}  # attack_cat code -> dashboard attack type; unmapped codes are reported as 'Unknown'
+LIVE_CLASSIFIER_BATCH_SIZE = 256  # Largest micro-batch scored in one call
+LIVE_CLASSIFIER_MAX_DELAY_MS = 5  # Longest a packet waits for its micro-batch to fill
+LIVE_CLASSIFIER_TIMEOUT_SECONDS = 2  # Fall back to the precomputed prediction after this
+LIVE_CLASSIFIER_BENCHMARK_CSV = 'Models/cicids2018/CICIDS2018_test_balanced_alligned.csv'
+
+# Prediction Cache Configuration (ensemble scores of repeated flows)
+PREDICTION_CACHE_ENABLED = True
+PREDICTION_CACHE_SIZE = 100_000  # Distinct feature vectors kept
+PREDICTION_CACHE_QUANTUM = 1e-4  # Scaled features are rounded to this step before hashing
+
+# Dataset Cache Configuration (columnar copies of the CSV datasets)
+DATASET_CACHE_DIR = '.dataset_cache'  # Relative paths here are resolved against the repository root
+DATASET_CACHE_FORMAT = 'npy'  # 'npy' (per-column memory-mapped arrays), or 'feather'/'parquet' with pyarrow installed
+DATASET_CACHE_AUTO_BUILD = False  # Build a missing or stale cache on first load instead of only via convert_datasets.py
+DATASET_CACHE_MMAP_MODE = 'c'  # Copy-on-write maps: DataFrames stay writable without changing the cache
+DATASET_CACHE_SOURCES = [
+    'Models/cicids_live_predictions.csv',
+    'honeypot_dataset.csv',
+    'Models/ztadatasetfile.csv',
+    'Models/cicids2018/CICIDS2018_train_balanced_alligned.csv',
+    'Models/cicids2018/CICIDS2018_test_balanced_alligned.csv',
+    'Models/nsbw/UNSW_aligned_train_ordered.csv',
+    'Models/nsbw/UNSW_aligned_test_ordered.csv',
+]
+
+# Honeypot Replay Configuration
+REPLAY_CHUNK_ROWS = 10_000  # Rows parsed at a time when streaming the replay files
+REPLAY_DEFAULT_SPEED = 1.0  # Timestamp replay speed factor (10 = ten times faster, None = as fast as possible)
+
+# Honeypot Forwarding Configuration (honeypot -> dashboard /api/ingest/batch)
+FORWARD_QUEUE_SIZE = 10_000  # Payloads waiting to be forwarded; overflow is spilled to disk
+FORWARD_WORKERS = 2  # Forwarding threads, each holding a keep-alive connection
+FORWARD_BATCH_SIZE = 100  # Payloads per post
+FORWARD_MAX_DELAY_MS = 50  # Longest a payload waits for its batch to fill
+FORWARD_TIMEOUT_SECONDS = 2
+FORWARD_MAX_RETRIES = 3  # Retries of a failed post before its batch is spilled
+FORWARD_BACKOFF_SECONDS = 0.2  # Base of the jittered exponential backoff between retries
+FORWARD_BACKOFF_MAX_SECONDS = 5
+FORWARD_CIRCUIT_RESET_SECONDS = 5  # After a failed batch, later batches are spilled without trying for this long
+FORWARD_SPILL_PATH = 'forward_spill.ndjson'  # Undeliverable payloads, replayed when the dashboard is back
+INGEST_DEDUP_SIZE = 100_000  # Forward ids the dashboard remembers to drop payloads that a retry or replay sends again
+
+# Batch Zero-Trust Scoring Configuration (score_packets.py)
+BATCH_SCORING_CHUNK_ROWS = 100_000  # Rows read, scored and filtered at a time
+BATCH_SCORING_WORKERS = None  # Scoring processes (None = one per CPU)
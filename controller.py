@@ -1,15 +1,28 @@
 import pandas as pd
 import time
-import joblib
+from config import (
+    CONTROLLER_LIVE_CSV_PATH, CONTROLLER_CHUNK_ROWS, CONTROLLER_INFERENCE_MODE,
+    CONTROLLER_INFERENCE_WORKERS, CONTROLLER_MODEL_TIMEOUT_SECONDS, CONTROLLER_ENSEMBLE_MODE,
+    CONTROLLER_CASCADE_MODEL, CONTROLLER_CASCADE_BAND, CONTROLLER_CASCADE_AUDIT_EVERY,
+    PREDICTION_CACHE_ENABLED, CONTROLLER_SHARDS, CONTROLLER_SHARD_TIMEOUT_SECONDS
+)
+from services.tail_service import CSVTailer
+from services.batch_mitigation_service import IPStateTracker, apply_plan
+from services.sharding_service import ShardedController
+from services.inference_service import ModelRunner, CascadeRunner
+from services.model_registry import load_model, registry
+from services.prediction_cache import PredictionCache
 
 # -----------------------------
 #  IMPORT MODELS
 # -----------------------------
-# Base ML models
-log_reg_model      = joblib.load("models/log_reg.pkl")
-svm_model          = joblib.load("models/svm.pkl")
-rf_model           = joblib.load("models/random_forest.pkl")
-mlp_model          = joblib.load("models/mlp.pkl")
+# Base ML models, loaded (memory-mapped) from the model registry on first use
+BASE_MODELS = {
+    "log_reg": "log_reg",
+    "svm":     "svm",
+    "rf":      "random_forest",
+    "mlp":     "mlp",
+}
 
 # Ensemble/Confidence module
 from ensemble import compute_ensemble_score
@@ -27,44 +40,129 @@ from preprocess import preprocess_features
 # -----------------------------
 #  LIVE DATA COLLECTION
 # -----------------------------
-def collect_live_csv(path="live_data/latest.csv"):
+live_tailer = CSVTailer(CONTROLLER_LIVE_CSV_PATH, chunk_size=CONTROLLER_CHUNK_ROWS)
+
+def collect_live_csv():
     """
-    Reads the most recent CSV exported by your Traffic Aggregator.
+    Yields DataFrame chunks of the rows the Traffic Aggregator appended
+    since the previous call, so rows are never reprocessed.
     """
-    return pd.read_csv(path)
+    return live_tailer.read_chunks()
 
 
 # -----------------------------
 #  BASE MODEL INFERENCE
 # -----------------------------
+def load_base_model(key):
+    """Loads a base model by its controller key through the model registry."""
+    return load_model(BASE_MODELS[key])
+
+base_model_runner = ModelRunner(
+    list(BASE_MODELS),
+    mode=CONTROLLER_INFERENCE_MODE,
+    workers=CONTROLLER_INFERENCE_WORKERS,
+    timeout=CONTROLLER_MODEL_TIMEOUT_SECONDS,
+    loader=load_base_model,
+)
+
+cascade_runner = CascadeRunner(
+    base_model_runner,
+    cheap_model=CONTROLLER_CASCADE_MODEL,
+    band=CONTROLLER_CASCADE_BAND,
+    combine=compute_ensemble_score,
+    audit_every=CONTROLLER_CASCADE_AUDIT_EVERY,
+)
+
 def run_base_models(features):
-    preds = {}
+    """
+    Runs the base models concurrently on the shared feature matrix.
+    Models that fail or exceed the timeout are left out of the result.
+    In cascade mode only rows the cheap model is unsure about reach the others.
+    """
+    if CONTROLLER_ENSEMBLE_MODE == "cascade":
+        preds = cascade_runner.predict(features)
+        stats = cascade_runner.stats()
+        agreement = stats["agreement_with_full_ensemble"]
+        print(
+            f"Cascade: {stats['escalation_rate']:.1%} of rows escalated, agreement with full ensemble: "
+            + ("not audited yet" if agreement is None else f"{agreement:.1%}")
+        )
+        return preds
 
-    preds["log_reg"] = log_reg_model.predict_proba(features)[:,1]
-    preds["svm"]     = svm_model.predict_proba(features)[:,1]
-    preds["rf"]      = rf_model.predict_proba(features)[:,1]
-    preds["mlp"]     = mlp_model.predict_proba(features)[:,1]
+    preds = base_model_runner.predict(features)
+
+    timings = ", ".join(f"{name}={secs * 1000:.1f}ms" for name, secs in base_model_runner.last_timings.items())
+    print(f"Base models: {timings}")
 
     return preds
 
 
+prediction_cache = PredictionCache()
+_model_version = None
+
+def current_model_version():
+    """
+    Returns the fingerprint of the base models, reloading any whose artifact
+    changed on disk; the runner then switches to the reloaded models.
+    """
+    global _model_version
+    version = registry.version(list(BASE_MODELS.values()))
+    if _model_version is not None and version != _model_version:
+        base_model_runner.reload_models()
+    _model_version = version
+    return version
+
+def score_features(features):
+    """
+    Returns the ensemble score of every row. Rows whose quantized feature
+    vector was scored before reuse the cached score and skip inference.
+    """
+    def run_ensemble(rows):
+        return compute_ensemble_score(run_base_models(rows))
+
+    model_version = current_model_version()
+    if not PREDICTION_CACHE_ENABLED:
+        return run_ensemble(features)
+
+    scores = prediction_cache.predict(features, run_ensemble, model_version=model_version)
+    stats = prediction_cache.stats()
+    print(f"Prediction cache: hit rate {stats['hit_rate']:.1%}, {stats['inference_skip_rate']:.1%} of rows skipped inference")
+    return scores
+
+
 # -----------------------------
 #  ZERO TRUST DECISION + MITIGATION
 # -----------------------------
-def mitigation_handler(zero_trust_score_val, row):
+def score_dataframe(df):
     """
-    Applies your threshold logic.
+    Runs preprocessing, the (cached) ensemble and zero-trust scoring on a
+    batch. Also the per-shard stage executed by the sharded controller's workers.
     """
-    if zero_trust_score_val < 0.30:
-        print("⚠️ Malicious traffic detected → Blocking IP")
-        block_ip(row["src_ip"])
+    features = preprocess_features(df)
+    ensemble_scores = score_features(features)
+    return zero_trust_score(df, ensemble_scores)
 
-    elif 0.30 <= zero_trust_score_val < 0.60:
-        print("⚠️ Suspicious traffic → Rate-limiting")
-        rate_limit(row["src_ip"])
+# Per-IP running scores of the serial controller (each shard keeps its own in sharded mode)
+ip_state = IPStateTracker()
 
-    else:
-        print("✅ Clean traffic → No mitigation action")
+def mitigation_handler(zero_trust_scores, df):
+    """
+    Applies your threshold logic to a whole batch: one action per source IP,
+    based on its worst score and its running score from earlier batches,
+    handed to the mitigation layer in one call.
+    """
+    return apply_mitigation(ip_state.plan(df["src_ip"].to_numpy(), zero_trust_scores))
+
+def apply_mitigation(plan):
+    """Hands a batch plan to the mitigation layer and logs the action counts."""
+    counts = apply_plan(plan, block_ip=block_ip, rate_limit=rate_limit)
+
+    print(
+        f"Batch of {counts['rows']} rows from {counts['ips']} IPs: "
+        f"⚠️ {counts['block']} blocked, ⚠️ {counts['rate_limit']} rate-limited, "
+        f"✅ {counts['allow']} clean"
+    )
+    return counts
 
 
 # -----------------------------
@@ -75,30 +173,45 @@ def controller_loop():
 
     while True:
         try:
-            # 1. Fetch incoming live traffic batch
-            df = collect_live_csv()
-
-            # 2. Preprocess
-            features = preprocess_features(df)
-
-            # 3. Base-model predictions
-            base_preds = run_base_models(features)
+            # 1. Fetch newly appended live traffic, in fixed-size batches
+            for df in collect_live_csv():
 
-            # 4. Ensemble confidence
-            ensemble_scores = compute_ensemble_score(base_preds)
+                # 2-5. Preprocess, base models and ensemble (cached for repeated flows), Zero-Trust scoring
+                zt_scores = score_dataframe(df)
 
-            # 5. Zero-Trust scoring
-            zt_scores = zero_trust_score(df, ensemble_scores)
-
-            # 6. Apply mitigation per row
-            for idx, row in df.iterrows():
-                mitigation_handler(zt_scores[idx], row)
+                # 6. Apply mitigation per source IP for the whole batch
+                mitigation_handler(zt_scores, df)
 
         except Exception as e:
             print(f"[Error] {str(e)}")
 
         time.sleep(1)  # throttle loop
 
+def sharded_controller_loop(n_shards):
+    """
+    Parallel controller: rows are hash-partitioned by src_ip across worker
+    processes that run score_dataframe and plan mitigation for their IPs,
+    keeping those IPs' running scores; the merged plan is applied here, in
+    the coordinator.
+    """
+    print(f"AIRS Controller Running on {n_shards} shards...")
+    sharded = ShardedController(score_dataframe, n_shards, result_timeout=CONTROLLER_SHARD_TIMEOUT_SECONDS)
+
+    try:
+        while True:
+            try:
+                for df in collect_live_csv():
+                    apply_mitigation(sharded.process(df))
+            except Exception as e:
+                print(f"[Error] {str(e)}")
+
+            time.sleep(1)  # throttle loop
+    finally:
+        sharded.close()
+
 
 if __name__ == "__main__":
-    controller_loop()
+    if CONTROLLER_SHARDS > 1:
+        sharded_controller_loop(CONTROLLER_SHARDS)
+    else:
+        controller_loop()
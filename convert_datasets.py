@@ -0,0 +1,30 @@
+import argparse
+import os
+from services import dataset_cache
+from config import DATASET_CACHE_SOURCES, DATASET_CACHE_FORMAT
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert CSV datasets into the columnar dataset cache.")
+    parser.add_argument('sources', nargs='*', help="CSV files to convert (defaults to DATASET_CACHE_SOURCES).")
+    parser.add_argument('--format', choices=dataset_cache.CACHE_FORMATS, default=DATASET_CACHE_FORMAT)
+    parser.add_argument('--force', action='store_true', help="Rebuild caches that are already up to date.")
+    parser.add_argument('--compare', action='store_true', help="Time CSV parsing against loading the cache.")
+    args = parser.parse_args()
+
+    for source in args.sources or [dataset_cache.resolve_path(source) for source in DATASET_CACHE_SOURCES]:
+        if not os.path.exists(source):
+            print(f"⚠️ Skipping '{source}': file not found.")
+            continue
+        meta = None if args.force else dataset_cache.is_fresh(source)
+        if meta is not None and meta["format"] == args.format:
+            print(f"✅ '{source}' is already cached ({meta['rows']} rows).")
+        else:
+            meta = dataset_cache.build_cache(source, args.format)
+            print(f"✅ Cached '{source}' as {args.format}: {meta['rows']} rows, {len(meta['columns'])} columns.")
+        if args.compare:
+            csv_seconds, cache_seconds = dataset_cache.compare_load(source)
+            print(f"   CSV {csv_seconds * 1000:.1f} ms vs cache {cache_seconds * 1000:.1f} ms "
+                  f"({csv_seconds / max(cache_seconds, 1e-9):.0f}x faster)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import shutil
+import sys
+import requests
+from services import export_service
+
+DASHBOARD_URL = "http://127.0.0.1:5000"
+
+def export_decisions(fmt, compress, output):
+    """Stream the blocked/alerted IPs straight from the local database."""
+    rows = export_service.iter_decision_rows()
+    chunks = export_service.stream_export(rows, fmt, export_service.DECISION_EXPORT_FIELDS, compress=compress)
+    for chunk in chunks:
+        output.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+
+def export_logs(args, output):
+    """Stream packet logs from a running dashboard, since they only live in its memory."""
+    session = requests.Session()
+    login = session.post(f"{args.url}/login", data={"username": args.username, "password": args.password})
+    login.raise_for_status()
+
+    params = {
+        "format": args.format, "gzip": int(args.gzip), "start": args.start, "end": args.end,
+        "action": args.action, "prediction": args.prediction,
+        "src_ip": args.src_ip, "trust_level": args.trust_level
+    }
+    params = {key: value for key, value in params.items() if value is not None}
+    with session.get(f"{args.url}/api/export/logs", params=params, stream=True, allow_redirects=False) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"Export failed with status {response.status_code}. Check the login credentials.")
+        # Copy the raw body so gzip exports are written exactly as the dashboard compressed them
+        shutil.copyfileobj(response.raw, output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream packet logs or mitigation decisions as NDJSON or CSV.")
+    parser.add_argument('kind', choices=['logs', 'decisions'])
+    parser.add_argument('--format', choices=export_service.EXPORT_FORMATS, default='ndjson')
+    parser.add_argument('--gzip', action='store_true', help="Compress the output on the fly.")
+    parser.add_argument('-o', '--output', help="Output file (defaults to stdout).")
+    parser.add_argument('--start', help="Only logs ingested at or after this time (epoch seconds or ISO 8601).")
+    parser.add_argument('--end', help="Only logs ingested at or before this time (epoch seconds or ISO 8601).")
+    parser.add_argument('--action')
+    parser.add_argument('--prediction')
+    parser.add_argument('--src-ip')
+    parser.add_argument('--trust-level')
+    parser.add_argument('--url', default=DASHBOARD_URL, help="Dashboard base URL used for log exports.")
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='password')
+    args = parser.parse_args()
+
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        if args.kind == 'decisions':
+            export_decisions(args.format, args.gzip, output)
+        else:
+            export_logs(args, output)
+    finally:
+        if args.output:
+            output.close()
+            print(f"✅ Export written to '{args.output}'.", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
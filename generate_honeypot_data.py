@@ -1,79 +1,39 @@
-import csv
-import random
-import uuid
-from datetime import datetime, timedelta
+import argparse
+import time
+from services.traffic_generator import generate_chunks, parse_attack_mix, write_dataset, OUTPUT_FORMATS
 
 # Configuration
 NUM_ROWS = 2000
 OUTPUT_FILE = 'honeypot_dataset.csv'
-
-# Attack types from app.py's ATTACK_CATEGORY_MAP
-ATTACK_TYPES = [
-    "Normal", "Brute Force", "Port Scanning", "DDoS", "DoS attacks-Hulk",
-    "Botnet", "Infiltration", "Web attacks", "DoS attacks-GoldenEye",
-    "DoS attacks-Slowloris", "SSH-Bruteforce", "FTP-BruteForce",
-    "Heartbleed", "SQL Injection", "XSS"
-]
-
-# Headers for the CSV file
-HEADERS = [
-    'timestamp', 'src_ip', 'dst_ip', 'protocol', 'port',
-    'attack_type', 'confidence_score', 'is_malicious'
-]
-
-def generate_random_ip():
-    """Generates a random IPv4 address."""
-    return f"{random.randint(1, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
-
-def generate_honeypot_data():
-    """Generates the honeypot dataset."""
-    # Create a pool of 20 source IPs to ensure repetition for filtering
-    src_ip_pool = [generate_random_ip() for _ in range(20)]
-    
-    data = []
-    current_time = datetime.now()
-
-    for _ in range(NUM_ROWS):
-        # Determine if the packet is normal or an attack
-        is_attack = random.random() > 0.5
-        
-        if is_attack:
-            attack_type = random.choice([at for at in ATTACK_TYPES if at != "Normal"])
-            # Confidence for attacks should be high to be realistic
-            confidence = round(random.uniform(80, 99), 2)
-            is_malicious = 1
-        else:
-            attack_type = "Normal"
-            # Confidence for normal traffic should be low (as it's confidence of being an attack)
-            # to ensure trust score is > 60
-            confidence = round(random.uniform(1, 20), 2)
-            is_malicious = 0
-
-        row = {
-            'timestamp': current_time.strftime('%Y-%m-%d %H:%M:%S'),
-            'src_ip': random.choice(src_ip_pool),  # Pick a random IP from the pool
-            'dst_ip': generate_random_ip(),
-            'protocol': random.choice(['TCP', 'UDP', 'ICMP']),
-            'port': random.randint(1, 65535),
-            'attack_type': attack_type,
-            'confidence_score': confidence,
-            'is_malicious': is_malicious
-        }
-        data.append(row)
-        
-        # Increment time for the next packet
-        current_time += timedelta(milliseconds=random.randint(50, 500))
-
-    return data
-
-def save_to_csv(data, filename):
-    """Saves the generated data to a CSV file."""
-    with open(filename, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=HEADERS)
-        writer.writeheader()
-        writer.writerows(data)
-    print(f"✅ Successfully generated {len(data)} rows of honeypot data in '{filename}'.")
+CHUNK_ROWS = 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic honeypot traffic dataset.")
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help="CSV or .parquet file to write.")
+    parser.add_argument('--rows', type=int, default=NUM_ROWS)
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help="Output format (defaults to the file extension).")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="Rows generated and written at a time.")
+    parser.add_argument('--seed', type=int, help="Seed for reproducible output.")
+    parser.add_argument('--ips', type=int, default=20, help="Number of distinct source IPs.")
+    parser.add_argument('--zipf', type=float, default=1.2, help="Zipf exponent of source IP popularity (0 = uniform).")
+    parser.add_argument('--attack-ratio', type=float, default=0.5, help="Share of background rows that are attacks.")
+    parser.add_argument('--attack-mix', help='Relative attack weights, e.g. "DDoS=5,Port Scanning=2,XSS=1" (default: all equal).')
+    parser.add_argument('--campaign-rate', type=float, default=0.0, help="Probability per row that an attack campaign starts.")
+    parser.add_argument('--campaign-rows', type=int, default=500, help="Mean rows per attack campaign.")
+    parser.add_argument('--start', help="Timestamp of the first row (default: now).")
+    args = parser.parse_args()
+
+    chunks = generate_chunks(
+        args.rows, args.chunk_rows, seed=args.seed, n_ips=args.ips, zipf_exponent=args.zipf, attack_ratio=args.attack_ratio,
+        attack_mix=parse_attack_mix(args.attack_mix) if args.attack_mix else None,
+        campaign_rate=args.campaign_rate, campaign_rows=args.campaign_rows, start=args.start
+    )
+
+    started = time.perf_counter()
+    rows = write_dataset(chunks, args.output, args.format)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Successfully generated {rows} rows of honeypot data in '{args.output}' "
+          f"({rows / max(elapsed, 1e-9):,.0f} rows/sec).")
 
 if __name__ == "__main__":
-    honeypot_data = generate_honeypot_data()
-    save_to_csv(honeypot_data, OUTPUT_FILE)
+    main()
@@ -2,73 +2,86 @@ from flask import Flask, render_template, jsonify, request
 from flask_socketio import SocketIO
 import requests
 import os
-import pandas as pd
 import time
 import threading
 import json
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from services import replay_service
+from services.forwarding_service import Forwarder
+from config import FORWARD_SPILL_PATH, REPLAY_DEFAULT_SPEED
 
 app = Flask(__name__)
 socketio = SocketIO(app)
 
 # --- Configuration ---
-DASHBOARD_INGEST_URL = "http://127.0.0.1:5000/api/ingest"
-HONEYPOT_ATTACK_URL = "http://127.0.0.1:8080/api/attack"
+DASHBOARD_INGEST_BATCH_URL = "http://127.0.0.1:5000/api/ingest/batch"
 PACKET_INTERVAL_SECONDS = 2
+SIMULATION_MODES = ('interval', 'timestamps')
 simulation_thread = None
 simulation_running = False
+simulation_stop = threading.Event()
+
+# --- Data Paths ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HONEYPOT_DATA_PATH = os.path.join(BASE_DIR, '..', 'honeypot_dataset.csv')
+PREDICTION_DATA_PATH = os.path.join(BASE_DIR, '..', 'Models', 'cicids_live_predictions.csv')
 
-# --- Data Loading ---
-try:
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    HONEYPOT_DATA_PATH = os.path.join(BASE_DIR, '..', 'honeypot_dataset.csv')
-    PREDICTION_DATA_PATH = os.path.join(BASE_DIR, '..', 'Models', 'cicids_live_predictions.csv')
-    honeypot_df = pd.read_csv(HONEYPOT_DATA_PATH)
-    prediction_df = pd.read_csv(PREDICTION_DATA_PATH)
-    print("✅ Datasets loaded successfully for simulation.")
-except FileNotFoundError as e:
-    print(f"❌ CRITICAL ERROR: Could not find dataset files. The simulation cannot run. {e}")
-    honeypot_df = None
-    prediction_df = None
+# Packets are forwarded to the dashboard in the background, in batches
+forwarder = Forwarder(DASHBOARD_INGEST_BATCH_URL, spill_path=os.path.join(BASE_DIR, '..', FORWARD_SPILL_PATH))
 
 # --- Simulation Logic ---
-def run_simulation_logic():
+def run_simulation_logic(mode='interval', speed=REPLAY_DEFAULT_SPEED):
     """
     The core simulation logic, moved from the old attacker_simulator.py.
-    This will run in a background thread.
+    This will run in a background thread. Both datasets are streamed in
+    chunks rather than loaded up front, so memory stays flat for any file size.
+
+    In 'interval' mode a packet is sent every PACKET_INTERVAL_SECONDS. In
+    'timestamps' mode packets are replayed at their recorded inter-arrival
+    times divided by `speed` (None replays as fast as possible).
     """
     global simulation_running
-    if honeypot_df is None or prediction_df is None:
-        print("❌ Cannot start simulation, datasets not loaded.")
+    missing = [path for path in (HONEYPOT_DATA_PATH, PREDICTION_DATA_PATH) if not os.path.exists(path)]
+    if missing:
+        print(f"❌ CRITICAL ERROR: Could not find dataset files. The simulation cannot run. {missing}")
         simulation_running = False
         return
 
-    print("🚀 Starting attack simulation thread...")
-
-    for index, row in honeypot_df.iterrows():
-        # Check the flag at the start of each loop
-        if not simulation_running:
-            print("🛑 Simulation thread received stop signal.")
-            break
-        try:
-            packet_data = row.to_dict()
-            prediction_data = prediction_df.iloc[index].to_dict()
-
-            packet_data = {k: v.item() if hasattr(v, 'item') else v for k, v in packet_data.items()}
-            prediction_data = {k: v.item() if hasattr(v, 'item') else v for k, v in prediction_data.items()}
-
-            payload = {"packet_data": packet_data, "prediction_data": prediction_data}
-            
-            # Post the attack to its own endpoint to trigger the synced flow
-            requests.post(HONEYPOT_ATTACK_URL, json=payload)
-            
-            time.sleep(PACKET_INTERVAL_SECONDS)
-
-        except Exception as e:
-            print(f"Error during simulation loop: {e}")
-            break
-    
+    print(f"🚀 Starting attack simulation thread ({mode} mode)...")
+
+    payloads = replay_service.iter_payloads(HONEYPOT_DATA_PATH, PREDICTION_DATA_PATH)
+    scheduler = replay_service.ReplayScheduler(speed, stop=simulation_stop) if mode == 'timestamps' else None
+    try:
+        for payload in (scheduler.replay(payloads) if scheduler else payloads):
+            # Check the flag at the start of each loop
+            if not simulation_running:
+                print("🛑 Simulation thread received stop signal.")
+                break
+            try:
+                # Dispatch in-process to the same logic /api/attack runs, skipping the HTTP round trip
+                handle_attack(payload)
+
+                if scheduler is None and simulation_stop.wait(PACKET_INTERVAL_SECONDS):
+                    print("🛑 Simulation thread received stop signal.")
+                    break
+
+            except Exception as e:
+                print(f"Error during simulation loop: {e}")
+                break
+    except Exception as e:
+        # Reading a later chunk of the replay files failed
+        print(f"Error while reading the simulation data: {e}")
+    finally:
+        payloads.close()
+        # Always clear the flag so the simulation can be started again
+        simulation_running = False
+
+    if scheduler:
+        stats = scheduler.stats()
+        print(f"📊 Replayed {stats['released']} packets, mean lag {stats['mean_lag_ms']:.1f} ms, max lag {stats['max_lag_ms']:.1f} ms.")
     print("✅ Simulation thread finished.")
-    simulation_running = False
 
 
 # --- Routes and API Endpoints ---
@@ -79,13 +92,27 @@ def index():
 
 @app.route('/api/start_simulation', methods=['POST'])
 def start_simulation():
-    """Starts the simulation in a background thread."""
+    """
+    Starts the simulation in a background thread. An optional JSON body
+    {"mode": "timestamps", "speed": 10} replays the dataset's recorded
+    timing, sped up 10x ("max" for no waiting).
+    """
     global simulation_thread, simulation_running
     if simulation_running:
         return jsonify({"message": "Simulation is already running."}), 400
 
+    options = request.get_json(silent=True) or {}
+    mode = options.get('mode', 'interval')
+    if mode not in SIMULATION_MODES:
+        return jsonify({"error": f"Unknown mode '{mode}'. Use one of: {', '.join(SIMULATION_MODES)}."}), 400
+    try:
+        speed = replay_service.parse_speed(options.get('speed', REPLAY_DEFAULT_SPEED))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     simulation_running = True
-    simulation_thread = threading.Thread(target=run_simulation_logic)
+    simulation_stop.clear()
+    simulation_thread = threading.Thread(target=run_simulation_logic, args=(mode, speed))
     simulation_thread.daemon = True
     simulation_thread.start()
     
@@ -100,42 +127,95 @@ def stop_simulation():
     
     print("Received request to stop simulation.")
     simulation_running = False
+    simulation_stop.set()
     return jsonify({"message": "Simulation stopping."})
 
 @app.route('/api/attack', methods=['POST'])
 def receive_attack():
     """
-    This endpoint receives an attack from the simulator (running in its own thread).
-    It then notifies its own frontend via WebSocket and forwards the data
-    to the main dashboard for analysis.
+    This endpoint receives an attack from an external source. It then
+    notifies its own frontend via WebSocket and forwards the data to the
+    main dashboard for analysis. The built-in simulator calls
+    handle_attack directly instead.
     """
     attack_data = request.json
     if not attack_data:
         return jsonify({"error": "Invalid data"}), 400
 
+    handle_attack(attack_data)
+    return jsonify({"status": "ok"}), 200
+
+def handle_attack(attack_data):
+    """Notify the honeypot frontend of an attack and queue it for the dashboard."""
     # 1. Notify the honeypot's own frontend to display the animation
     socketio.emit('attack_notification', attack_data)
     print(f"[Honeypot] Received attack: {attack_data.get('packet_data', {}).get('attack_type')}. Notifying frontend and forwarding to dashboard.")
 
-    # 2. Forward the exact same data to the main dashboard
-    try:
-        dashboard_payload = {
-            "packet_data": attack_data.get("packet_data"),
-            "prediction_data": attack_data.get("prediction_data")
-        }
-        response = requests.post(DASHBOARD_INGEST_URL, json=dashboard_payload, timeout=2)
-        
-        if response.status_code == 200:
-            print(f"[Honeypot] Successfully forwarded. Dashboard responded with {response.status_code}.")
-        else:
-            print(f"[Honeypot] ⚠️  Dashboard responded with an error: {response.status_code} {response.text}")
+    # 2. Queue the exact same data for the dashboard; the forwarder posts it in the background
+    dashboard_payload = {
+        "packet_data": attack_data.get("packet_data"),
+        "prediction_data": attack_data.get("prediction_data")
+    }
+    if not forwarder.submit(dashboard_payload):
+        print("[Honeypot] ⚠️  Forwarding queue is full; the packet was spilled to disk.")
+
+def benchmark_dispatch(packets=2000):
+    """
+    Print the CPU time per packet of dispatching simulator attacks over
+    HTTP to /api/attack (the old path) and in-process via handle_attack.
 
-    except requests.exceptions.RequestException as e:
-        print(f"[Honeypot] ❌ CRITICAL: Could not forward data to dashboard: {e}")
+    The honeypot is served on a local port for the HTTP path; forwarding
+    is replaced by an in-memory queue so only the dispatch cost is measured.
+    """
+    global forwarder
+    import logging
+    from contextlib import redirect_stdout
+    from werkzeug.serving import make_server
+
+    payload = {
+        "packet_data": {"src_ip": "172.16.0.1", "dst_ip": "10.0.0.1", "port": 80,
+                        "attack_type": "DDoS", "confidence_score": 97.5},
+        "prediction_data": {"Flow Duration": 1200, "Tot Fwd Pkts": 8, "Dst Port": 80}
+    }
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    attack_url = f"http://127.0.0.1:{server.server_port}/api/attack"
+    real_forwarder = forwarder
+    forwarder = Forwarder(DASHBOARD_INGEST_BATCH_URL, workers=0, queue_size=2 * packets + 1)
+
+    def measure(dispatch):
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            cpu, wall = time.process_time(), time.perf_counter()
+            for _ in range(packets):
+                dispatch()
+            return (time.process_time() - cpu) / packets, (time.perf_counter() - wall) / packets
 
-    return jsonify({"status": "ok"}), 200
+    try:
+        results = {
+            "HTTP /api/attack": measure(lambda: requests.post(attack_url, json=payload)),
+            "in-process": measure(lambda: handle_attack(payload))
+        }
+    finally:
+        server.shutdown()
+        forwarder = real_forwarder
+
+    print(f"📊 Dispatching {packets} simulator packets")
+    print(f"{'Path':>18} | {'CPU us/packet':>13} | {'Wall us/packet':>14}")
+    print("-" * 52)
+    for name, (cpu, wall) in results.items():
+        print(f"{name:>18} | {1e6 * cpu:>13.1f} | {1e6 * wall:>14.1f}")
+    http_cpu, direct_cpu = results["HTTP /api/attack"][0], results["in-process"][0]
+    print(f"CPU saved per packet: {1e6 * (http_cpu - direct_cpu):.1f} us ({http_cpu / direct_cpu:.0f}x less)")
 
 if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        benchmark_dispatch()
+        sys.exit(0)
     # Running on port 8080 to avoid conflict with the main dashboard on port 5000
-    app.run(debug=True, port=8080, use_reloader=False) # use_reloader=False is important for threading
+    try:
+        app.run(debug=True, port=8080, use_reloader=False) # use_reloader=False is important for threading
+    finally:
+        forwarder.close(timeout=10)
 
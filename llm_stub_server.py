@@ -0,0 +1,74 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """Answers POST /generate like the LLM summary API, echoing what it was sent."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so the pooled client connections are reused
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        self.server.requests_served += 1
+
+        if self.server.delay_seconds:
+            time.sleep(self.server.delay_seconds)
+        if self.server.fail:
+            self._send(500, {"error": "Stub LLM failure"})
+            return
+        if self.server.response_body is not None:
+            self._send(200, self.server.response_body)
+            return
+
+        prompt = body.get('prompt', '')
+        summary = (
+            f"Stub LLM summary of a {len(prompt)}-character prompt "
+            f"(max_tokens={body.get('max_tokens')}).\n" + "\n".join(prompt.splitlines()[-5:])
+        )
+        self._send(200, {"summary": summary})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(host='127.0.0.1', port=0, delay_seconds=0.0, fail=False, response_body=None):
+    """
+    Start the stand-in LLM server in a background thread.
+
+    Use port=0 to pick a free port; the bound address is server.server_address.
+    `response_body` replaces the summary payload, e.g. to send malformed answers.
+    Call server.shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), StubLLMHandler)
+    server.daemon_threads = True
+    server.delay_seconds = delay_seconds
+    server.fail = fail
+    server.response_body = response_body
+    server.requests_served = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local stand-in for the LLM summary API.")
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--delay', type=float, default=0.0, help="Seconds to wait before answering.")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubLLMHandler)
+    server.delay_seconds = args.delay
+    server.fail = False
+    server.response_body = None
+    server.requests_served = 0
+    print(f"✅ Stub LLM server listening on http://127.0.0.1:{args.port}/generate")
+    server.serve_forever()
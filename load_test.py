@@ -0,0 +1,41 @@
+import argparse
+import json
+from services import loadgen_service, replay_service
+from config import ATTACK_RISK_LEVELS, HONEYPOT_DATASET_PATH, PREDICTION_DATASET_PATH
+
+DASHBOARD_INGEST_URL = "http://127.0.0.1:5000/api/ingest"
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test of the dashboard's /api/ingest endpoint.")
+    parser.add_argument('--url', default=DASHBOARD_INGEST_URL)
+    parser.add_argument('--rate', type=float, default=100, help="Requests per second (start rate when ramping).")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds to run.")
+    parser.add_argument('--pacing', choices=loadgen_service.PACING_MODES, default='constant')
+    parser.add_argument('--ramp-to', type=float, help="Rate to ramp to linearly.")
+    parser.add_argument('--ramp-seconds', type=float, default=0, help="Length of the ramp (defaults to the whole run).")
+    parser.add_argument('--concurrency', type=int, default=32, help="Sender threads, each with a keep-alive connection.")
+    parser.add_argument('--timeout', type=float, default=5)
+    parser.add_argument('--synthetic', action='store_true', help="Send random packets instead of replaying the datasets.")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        payloads = loadgen_service.synthetic_payloads(list(ATTACK_RISK_LEVELS), seed=args.seed)
+    else:
+        payloads = loadgen_service.cycle_payloads(
+            lambda: replay_service.iter_payloads(HONEYPOT_DATASET_PATH, PREDICTION_DATASET_PATH)
+        )
+
+    generator = loadgen_service.LoadGenerator(args.url, payloads, concurrency=args.concurrency, timeout=args.timeout)
+    report = generator.run(
+        args.rate, args.duration, pacing=args.pacing, ramp_to=args.ramp_to,
+        ramp_seconds=args.ramp_seconds or (args.duration if args.ramp_to is not None else 0), seed=args.seed
+    )
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        loadgen_service.print_report(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import argparse
+import os
+from services import batch_scoring_service
+from config import BATCH_SCORING_CHUNK_ROWS, BATCH_SCORING_WORKERS
+
+DEFAULT_INPUT = os.path.join('Models', 'ztadatasetfile.csv')
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute zero-trust scores for a packet dataset and drop critical packets in one streaming pass."
+    )
+    parser.add_argument('input', nargs='?', default=DEFAULT_INPUT,
+                        help="CSV with packet_id, attack_type, confidence_score and is_malicious columns.")
+    parser.add_argument('--filtered-out', default='filtered_packets.csv', help="Where to write the packets that are kept.")
+    parser.add_argument('--scores-out', help="Also write every packet's trust score (zero_trust_scores.csv).")
+    parser.add_argument('--chunk-rows', type=int, default=BATCH_SCORING_CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, default=BATCH_SCORING_WORKERS, help="Scoring processes (default: one per CPU).")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ Input file not found: {args.input}")
+        return
+    report = batch_scoring_service.run_pipeline(
+        args.input, scores_path=args.scores_out, filtered_path=args.filtered_out,
+        chunk_rows=args.chunk_rows, workers=args.workers
+    )
+    batch_scoring_service.print_report(report)
+    print(f"\nFiltered packets saved to: {args.filtered_out}")
+    if args.scores_out:
+        print(f"Results saved to: {args.scores_out}")
+
+if __name__ == '__main__':
+    main()
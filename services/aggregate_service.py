@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import Counter
+from services.talker_service import SpaceSaving
+from config import SUMMARY_BUCKET_RETENTION_MINUTES, SUMMARY_TOP_SOURCE_IPS
+
+# Per-minute buckets keyed by epoch minute, kept in insertion (= time) order
+_buckets = {}
+_lock = threading.Lock()
+# Incremented on every change to the buckets; used to key cached summaries
+_high_water_mark = 0
+
+def _new_bucket():
+    """Create an empty per-minute bucket."""
+    return {"total": 0, "combos": Counter(), "src_ips": SpaceSaving()}
+
+def record(log, timestamp=None):
+    """
+    Add a processed packet log to the bucket of the minute it was ingested in.
+
+    Args:
+        log (dict): A packet log as returned by mitigation_service.process_packet.
+        timestamp (float): Ingest time in epoch seconds (defaults to the log's ingested_at or now).
+    """
+    if timestamp is None:
+        timestamp = log.get('ingested_at') or time.time()
+    minute = int(timestamp // 60)
+    combo = (log.get('attack_prediction', 'N/A'), log.get('action', 'N/A'), log.get('trust_level', 'N/A'))
+    src_ip = (log.get('details') or {}).get('src_ip', 'N/A')
+
+    global _high_water_mark
+    with _lock:
+        _high_water_mark += 1
+        bucket = _buckets.get(minute)
+        if bucket is None:
+            bucket = _buckets[minute] = _new_bucket()
+            _evict_expired(minute)
+        bucket["total"] += 1
+        bucket["combos"][combo] += 1
+        bucket["src_ips"].add(src_ip)
+
+def _evict_expired(current_minute):
+    """Drop buckets that fell out of the retention window (caller holds the lock)."""
+    cutoff = current_minute - SUMMARY_BUCKET_RETENTION_MINUTES
+    while _buckets:
+        oldest = next(iter(_buckets))
+        if oldest > cutoff:
+            break
+        del _buckets[oldest]
+
+def get_aggregates(interval_minutes, now=None):
+    """
+    Merge the buckets of the last `interval_minutes` minutes (including the current one).
+
+    The cost depends on the number of buckets merged, not on the number of logs.
+
+    Returns:
+        dict: Totals and breakdowns by prediction, action, trust level and top source IPs.
+    """
+    if now is None:
+        now = time.time()
+    current_minute = int(now // 60)
+    interval_minutes = max(1, min(interval_minutes, SUMMARY_BUCKET_RETENTION_MINUTES))
+
+    total = 0
+    combos = Counter()
+    src_ips = SpaceSaving()
+    with _lock:
+        for minute in range(current_minute - interval_minutes + 1, current_minute + 1):
+            bucket = _buckets.get(minute)
+            if bucket is None:
+                continue
+            total += bucket["total"]
+            combos.update(bucket["combos"])
+            src_ips = src_ips.merge(bucket["src_ips"])
+
+    predictions, actions, trust_levels = Counter(), Counter(), Counter()
+    for (prediction, action, trust_level), count in combos.items():
+        predictions[prediction] += count
+        actions[action] += count
+        trust_levels[trust_level] += count
+
+    return {
+        "interval_minutes": interval_minutes,
+        "total": total,
+        "predictions": dict(predictions.most_common()),
+        "actions": dict(actions.most_common()),
+        "trust_levels": dict(trust_levels.most_common()),
+        "breakdown": [
+            {"prediction": prediction, "action": action, "trust_level": trust_level, "count": count}
+            for (prediction, action, trust_level), count in combos.most_common()
+        ],
+        "top_src_ips": [(ip, count) for ip, count, _ in src_ips.top(SUMMARY_TOP_SOURCE_IPS)]
+    }
+
+def get_high_water_mark():
+    """Return a counter that increases whenever the aggregates change."""
+    return _high_water_mark
+
+def reset():
+    """Discard all buckets, e.g. when the packet logs are cleared."""
+    global _high_water_mark
+    with _lock:
+        _buckets.clear()
+        _high_water_mark += 1
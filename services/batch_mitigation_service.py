@@ -0,0 +1,133 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from config import (
+    CONTROLLER_BLOCK_THRESHOLD, CONTROLLER_RATE_LIMIT_THRESHOLD, CONTROLLER_IP_STATE_SIZE, CONTROLLER_IP_SCORE_DECAY
+)
+
+def plan_mitigation(src_ips, zero_trust_scores):
+    """
+    Decide one action per source IP for a whole batch using vectorized masks.
+
+    Each IP is judged on its worst (lowest) zero-trust score in the batch:
+    below CONTROLLER_BLOCK_THRESHOLD it is blocked, below
+    CONTROLLER_RATE_LIMIT_THRESHOLD it is rate-limited, otherwise left alone.
+
+    Args:
+        src_ips (array-like): Source IP of each row.
+        zero_trust_scores (array-like): Zero-trust score of each row (0-1, lower is worse).
+
+    Returns:
+        dict: IP lists per action ('block', 'rate_limit', 'allow'), the worst
+        score per IP and per-batch counts.
+    """
+    scores = np.asarray(zero_trust_scores, dtype=float)
+    worst = pd.Series(scores).groupby(np.asarray(src_ips), sort=False).min()
+    return _plan_from_worst(worst, len(scores))
+
+def _plan_from_worst(worst, rows):
+    """Build a plan from the score each IP is judged on (a Series indexed by IP)."""
+    ips = worst.index.to_numpy()
+    values = worst.to_numpy()
+    block_mask = values < CONTROLLER_BLOCK_THRESHOLD
+    rate_limit_mask = ~block_mask & (values < CONTROLLER_RATE_LIMIT_THRESHOLD)
+    allow_mask = ~(block_mask | rate_limit_mask)
+
+    return {
+        "block": ips[block_mask].tolist(),
+        "rate_limit": ips[rate_limit_mask].tolist(),
+        "allow": ips[allow_mask].tolist(),
+        "worst_scores": worst.to_dict(),
+        "counts": {
+            "rows": int(rows),
+            "ips": int(len(ips)),
+            "block": int(block_mask.sum()),
+            "rate_limit": int(rate_limit_mask.sum()),
+            "allow": int(allow_mask.sum())
+        }
+    }
+
+class IPStateTracker:
+    """
+    Bounded per-IP memory for planning mitigation across batches.
+
+    Each IP keeps a running score, an exponentially weighted average of its
+    worst score per batch, and the number of rows seen. An IP is judged on
+    the lower of its worst score in the batch and its running score, so an
+    IP that recently misbehaved recovers over a few clean batches instead of
+    being allowed again at once. The least recently seen IPs are forgotten
+    beyond `maxsize`.
+    """
+
+    def __init__(self, maxsize=CONTROLLER_IP_STATE_SIZE, decay=CONTROLLER_IP_SCORE_DECAY):
+        self.maxsize = maxsize
+        self.decay = decay
+        self._state = OrderedDict()  # IP -> (running score, rows seen)
+
+    def plan(self, src_ips, zero_trust_scores):
+        """Update the state with a batch and return its plan in the plan_mitigation format."""
+        scores = np.asarray(zero_trust_scores, dtype=float)
+        grouped = pd.Series(scores).groupby(np.asarray(src_ips), sort=False)
+        worst = grouped.min()
+        rows = grouped.size()
+
+        judged = []
+        for ip, batch_worst, count in zip(worst.index.tolist(), worst.tolist(), rows.tolist()):
+            previous = self._state.pop(ip, None)
+            if previous is None:
+                running, seen = batch_worst, count
+            else:
+                running = self.decay * previous[0] + (1 - self.decay) * batch_worst
+                seen = previous[1] + count
+            self._state[ip] = (running, seen)
+            judged.append(min(batch_worst, running))
+        while len(self._state) > self.maxsize:
+            self._state.popitem(last=False)
+        return _plan_from_worst(pd.Series(judged, index=worst.index), len(scores))
+
+    def get(self, ip):
+        """Return (running score, rows seen) for an IP, or None if it is not tracked."""
+        return self._state.get(ip)
+
+    def __len__(self):
+        return len(self._state)
+
+def apply_plan(plan, block_ip, rate_limit):
+    """
+    Hand a batch plan to the mitigation layer in one call, invoking each action at most once per IP.
+
+    Args:
+        plan (dict): Result of plan_mitigation.
+        block_ip (callable): Mitigation-layer function that blocks an IP.
+        rate_limit (callable): Mitigation-layer function that rate-limits an IP.
+
+    Returns:
+        dict: The per-batch action counts.
+    """
+    for ip in plan["block"]:
+        block_ip(ip)
+    for ip in plan["rate_limit"]:
+        rate_limit(ip)
+    return plan["counts"]
+
+def merge_plans(plans):
+    """
+    Combine plans computed for disjoint sets of IPs (e.g. by controller shards) into one.
+
+    Args:
+        plans (list): Results of plan_mitigation.
+
+    Returns:
+        dict: A single plan in the plan_mitigation format.
+    """
+    merged = {
+        "block": [], "rate_limit": [], "allow": [], "worst_scores": {},
+        "counts": {"rows": 0, "ips": 0, "block": 0, "rate_limit": 0, "allow": 0}
+    }
+    for plan in plans:
+        for action in ("block", "rate_limit", "allow"):
+            merged[action].extend(plan[action])
+        merged["worst_scores"].update(plan["worst_scores"])
+        for name, count in plan["counts"].items():
+            merged["counts"][name] += count
+    return merged
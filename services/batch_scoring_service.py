@@ -0,0 +1,179 @@
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from Models import DropPackets
+from Models.zerotrustpacketanalyzer2 import score_frame, TRUST_LEVELS
+from services.traffic_generator import TrafficGenerator
+from config import BATCH_SCORING_CHUNK_ROWS, BATCH_SCORING_WORKERS
+
+INPUT_COLUMNS = ['packet_id', 'attack_type', 'confidence_score', 'is_malicious']
+SCORE_COLUMNS = ['packet_id', 'attack_type', 'confidence_score', 'trust_score', 'trust_level']
+STAGES = ('read', 'score', 'filter', 'format', 'write')
+
+def process_chunk(chunk, format_scores=False):
+    """
+    Score one chunk, drop its critical packets and render the output rows.
+
+    Only CSV text (without header) and small summaries leave the worker, so
+    the CSV formatting, the slowest step, runs in parallel too.
+
+    Returns:
+        dict: filtered (CSV text), scores (CSV text or None), rows, kept,
+        trust_levels, dropped_by_attack and per-stage seconds.
+    """
+    timer = time.perf_counter
+    started = timer()
+    scored = score_frame(chunk)
+    scored_at = timer()
+    keep = DropPackets.safe_mask(scored)
+    safe, dropped = scored[keep], scored[~keep]
+    filtered_at = timer()
+    filtered = safe.to_csv(header=False, index=False)
+    scores = scored.to_csv(header=False, index=False) if format_scores else None
+    formatted_at = timer()
+
+    grouped = dropped.groupby('attack_type', sort=False)['confidence_score'].agg(['count', 'sum'])
+    return {
+        "filtered": filtered,
+        "scores": scores,
+        "rows": len(scored),
+        "kept": len(safe),
+        "trust_levels": scored['trust_level'].value_counts(sort=False).to_dict(),
+        "dropped_by_attack": {attack: (int(row['count']), float(row['sum'])) for attack, row in grouped.iterrows()},
+        "seconds": {"score": scored_at - started, "filter": filtered_at - scored_at, "format": formatted_at - filtered_at}
+    }
+
+def run_pipeline(input_path, scores_path=None, filtered_path=None, chunk_rows=BATCH_SCORING_CHUNK_ROWS,
+                 workers=BATCH_SCORING_WORKERS):
+    """
+    Score a packet dataset and drop its critical packets in one streaming pass.
+
+    The CSV is read `chunk_rows` rows at a time. Each chunk is scored,
+    filtered and rendered with vectorized operations by one of `workers`
+    processes (inline when `workers` is 1), at most two chunks per worker in
+    flight. The results come back in memory and are appended in input order
+    to `filtered_path` (the kept packets) and, optionally, `scores_path`
+    (every packet's score, the old zero_trust_scores.csv); no intermediate
+    file is read back.
+
+    Returns:
+        dict: Row counts, trust level counts, dropped packets per attack
+        type, and seconds spent in each stage.
+    """
+    workers = workers or os.cpu_count() or 1
+    report = {
+        "rows": 0, "kept": 0,
+        "trust_levels": dict.fromkeys(TRUST_LEVELS, 0),
+        "dropped_by_attack": {},
+        "stage_seconds": dict.fromkeys(STAGES, 0.0),
+        "workers": workers
+    }
+    stage_seconds = report["stage_seconds"]
+    header = ",".join(SCORE_COLUMNS) + "\n"
+    outputs = {name: open(path, 'w', newline='') for name, path in (("filtered", filtered_path), ("scores", scores_path)) if path}
+    for f in outputs.values():
+        f.write(header)
+
+    def collect(result):
+        for stage, value in result["seconds"].items():
+            stage_seconds[stage] += value
+        report["rows"] += result["rows"]
+        report["kept"] += result["kept"]
+        for level, count in result["trust_levels"].items():
+            report["trust_levels"][level] += int(count)
+        for attack, (count, total_confidence) in result["dropped_by_attack"].items():
+            entry = report["dropped_by_attack"].setdefault(attack, {"count": 0, "total_confidence": 0.0})
+            entry["count"] += count
+            entry["total_confidence"] += total_confidence
+
+        started = time.perf_counter()
+        for name, f in outputs.items():
+            f.write(result[name])
+        stage_seconds["write"] += time.perf_counter() - started
+
+    wall_started = time.perf_counter()
+    format_scores = "scores" in outputs
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        with pd.read_csv(input_path, usecols=INPUT_COLUMNS, dtype={'attack_type': 'category'},
+                         chunksize=chunk_rows) as reader:
+            pending = deque()
+            while True:
+                started = time.perf_counter()
+                chunk = next(reader, None)
+                stage_seconds["read"] += time.perf_counter() - started
+                if chunk is None:
+                    break
+                if executor is None:
+                    collect(process_chunk(chunk, format_scores))
+                    continue
+                pending.append(executor.submit(process_chunk, chunk, format_scores))
+                if len(pending) >= 2 * workers:
+                    collect(pending.popleft().result())
+            while pending:
+                collect(pending.popleft().result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        for f in outputs.values():
+            f.close()
+
+    report["dropped"] = report["rows"] - report["kept"]
+    report["wall_seconds"] = time.perf_counter() - wall_started
+    return report
+
+def print_report(report):
+    """Print the pipeline summary and per-stage throughput."""
+    rows = report["rows"]
+    print(f"\nSummary Statistics:")
+    print(f"Total packets analyzed: {rows}")
+    for level, count in report["trust_levels"].items():
+        if count:
+            print(f"{level}: {count} packets ({count / rows * 100:.1f}%)")
+    print(f"Dropped packets: {report['dropped']} ({report['dropped'] / max(rows, 1) * 100:.1f}% of traffic)")
+    print(f"Remaining packets: {report['kept']}")
+
+    if report["dropped_by_attack"]:
+        print("\nDetails on filtered (dropped) packets:")
+        print(f"{'Attack Type':<17} | {'Count':<6} | {'Avg Confidence':<15}")
+        print("-" * 45)
+        for attack, data in report["dropped_by_attack"].items():
+            print(f"{attack:<17} | {data['count']:<6} | {data['total_confidence'] / data['count']:<15.2f}")
+
+    print(f"\n📊 Throughput ({report['workers']} worker{'s' if report['workers'] > 1 else ''}; "
+          f"score/filter/format seconds are summed over workers)")
+    print(f"{'Stage':>8} | {'Seconds':>8} | {'Rows/sec':>12}")
+    print("-" * 34)
+    for stage, seconds in report["stage_seconds"].items():
+        print(f"{stage:>8} | {seconds:>8.2f} | {rows / max(seconds, 1e-9):>12,.0f}")
+    print(f"{'total':>8} | {report['wall_seconds']:>8.2f} | {rows / max(report['wall_seconds'], 1e-9):>12,.0f}")
+
+def write_synthetic_dataset(path, rows, seed=0):
+    """Write a packet dataset in the ztadatasetfile.csv layout for benchmarking."""
+    generator = TrafficGenerator(seed=seed)
+    with open(path, 'w', newline='') as f:
+        for start in range(0, rows, 1_000_000):
+            chunk = generator.chunk(min(1_000_000, rows - start))
+            chunk.insert(0, 'packet_id', np.arange(start, start + len(chunk)))
+            chunk[INPUT_COLUMNS].to_csv(f, header=start == 0, index=False)
+
+def benchmark(rows=1_000_000, max_workers=None):
+    """Print pipeline throughput for 1..max_workers processes on a synthetic dataset."""
+    max_workers = max_workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'packets.csv')
+        write_synthetic_dataset(input_path, rows)
+        print(f"📊 {rows} packets")
+        print(f"{'Workers':>8} | {'Seconds':>8} | {'Rows/sec':>12}")
+        print("-" * 34)
+        for workers in range(1, max_workers + 1):
+            report = run_pipeline(input_path, filtered_path=os.path.join(directory, 'filtered.csv'), workers=workers)
+            print(f"{workers:>8} | {report['wall_seconds']:>8.2f} | {rows / report['wall_seconds']:>12,.0f}")
+
+if __name__ == '__main__':
+    benchmark(max_workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
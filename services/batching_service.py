@@ -0,0 +1,186 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+_STOP = object()
+
+class MicroBatcher:
+    """
+    Deadline-aware micro-batching scheduler for model inference.
+
+    Callers submit single feature rows and get a Future back. A background
+    thread collects rows until `batch_size` rows are waiting or the oldest
+    one has waited `delay` seconds, whichever comes first, then makes one
+    vectorized `predict_fn` call for the whole batch and resolves each
+    caller's Future with its own row of the result.
+
+    `predict_fn` receives a 2-D array and returns either an array with one
+    entry per row or a dict of such arrays (e.g. ModelRunner.predict); in
+    the dict case each caller receives a dict for its row. A custom `collate`
+    function can turn the list of submitted rows into the predict_fn input
+    (the default stacks them with np.vstack).
+
+    With `adaptive=True` the batch size doubles whenever a batch fills up
+    before its deadline and halves when the observed arrival rate could
+    not fill a quarter of it within the maximum delay. The delay tracks the
+    time the arrival rate needs to fill a batch, and drops to the minimum
+    when waiting would not gather another row, so light traffic is not held
+    back and bursts are batched efficiently.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=256, max_delay_ms=10.0,
+                 min_batch_size=8, min_delay_ms=0.5, adaptive=True, collate=None):
+        self.predict_fn = predict_fn
+        self.collate = collate or np.vstack
+        self.max_batch_size = max_batch_size
+        self.min_batch_size = min(min_batch_size, max_batch_size)
+        self.max_delay = max_delay_ms / 1000
+        self.min_delay = min(min_delay_ms / 1000, self.max_delay)
+        self.adaptive = adaptive
+        self.batch_size = max_batch_size
+        self.delay = self.max_delay
+
+        self.batches = 0
+        self.rows = 0
+        self.total_wait = 0.0
+        self._arrival_rate = None
+        self._last_dispatch = time.monotonic()
+        self._closed = False
+        # Orders submissions before the stop marker, so every queued row is flushed
+        self._close_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        """
+        Queue one feature row for inference and return a Future for its result.
+
+        Raises:
+            RuntimeError: If the batcher has been closed.
+        """
+        future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed.")
+            self._queue.put((row, future, time.monotonic()))
+        return future
+
+    def predict(self, row, timeout=None):
+        """Submit a row and wait for its result."""
+        return self.submit(row).result(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = first[2] + self.delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+
+        # Flush whatever was queued before close()
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftovers.append(item)
+        for start in range(0, len(leftovers), self.max_batch_size):
+            self._dispatch(leftovers[start:start + self.max_batch_size])
+
+    def _dispatch(self, batch):
+        """
+        Run one vectorized prediction for a batch and resolve its futures.
+
+        Rows whose Future was cancelled are left out. A failing predict_fn,
+        or a result without one entry per row, fails the batch's futures
+        rather than the scheduler thread.
+        """
+        dispatched_at = time.monotonic()
+        live = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if live:
+            self._resolve(live)
+
+        self.batches += 1
+        self.rows += len(batch)
+        self.total_wait += sum(dispatched_at - enqueued_at for _, _, enqueued_at in batch)
+        if self.adaptive:
+            self._adapt(len(batch), dispatched_at)
+
+    def _resolve(self, batch):
+        """Predict the batch's rows and hand each Future its own row of the result."""
+        try:
+            result = self.predict_fn(self.collate([row for row, _, _ in batch]))
+            lengths = {len(values) for values in result.values()} if isinstance(result, dict) else {len(result)}
+            if lengths != {len(batch)}:
+                raise ValueError(f"predict_fn returned {sorted(lengths)} rows for a batch of {len(batch)}.")
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for i, (_, future, _) in enumerate(batch):
+            try:
+                value = {name: values[i] for name, values in result.items()} if isinstance(result, dict) else result[i]
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(value)
+
+    def _adapt(self, size, dispatched_at):
+        """Adjust batch size and delay from how full batches are and how fast rows arrive."""
+        elapsed = max(dispatched_at - self._last_dispatch, 1e-6)
+        self._last_dispatch = dispatched_at
+        rate = size / elapsed
+        self._arrival_rate = rate if self._arrival_rate is None else 0.8 * self._arrival_rate + 0.2 * rate
+
+        # Rows expected to arrive while waiting the longest allowed delay
+        expected_rows = self._arrival_rate * self.max_delay
+        if size >= self.batch_size:
+            self.batch_size = min(self.batch_size * 2, self.max_batch_size)
+        elif expected_rows < self.batch_size / 4:
+            self.batch_size = max(self.batch_size // 2, self.min_batch_size)
+
+        if expected_rows < 1:
+            # Waiting would not gather another row, so answer right away
+            self.delay = self.min_delay
+        else:
+            fill_time = self.batch_size / self._arrival_rate
+            self.delay = min(max(fill_time, self.min_delay), self.max_delay)
+
+    def stats(self):
+        """Return batching statistics and the current adaptive settings."""
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "mean_wait_ms": 1000 * self.total_wait / self.rows if self.rows else 0.0,
+            "batch_size": self.batch_size,
+            "delay_ms": 1000 * self.delay
+        }
+
+    def close(self):
+        """Stop the scheduler after flushing queued rows; later submits raise RuntimeError."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
@@ -0,0 +1,108 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+class LRUCache:
+    """
+    Thread-safe bounded LRU cache with single-flight computation.
+
+    Concurrent get_or_compute calls for the same missing key share one
+    computation: the first caller computes the value while the others wait
+    for its result instead of repeating the work.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return a cached value and mark it as most recently used."""
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._put(key, value)
+
+    def put_if_absent(self, key, value):
+        """
+        Store a value unless the key is already cached.
+
+        Returns:
+            bool: True if the value was stored, False if the key was present.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return False
+            self._put(key, value)
+            return True
+
+    def _put(self, key, value):
+        """Store a value (caller holds the lock)."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for `key`, computing it once with `compute()` on a miss."""
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+            else:
+                self.hits += 1
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._put(key, value)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        """Drop all cached values (in-flight computations still complete)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Return size and hit-rate statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
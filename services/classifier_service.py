@@ -0,0 +1,206 @@
+import os
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from services.batching_service import MicroBatcher
+from services.model_registry import registry, BASE_DIR
+from services.tree_compiler import compile_ensemble
+from services.prediction_cache import PredictionCache
+from config import (
+    LIVE_CLASSIFIER_ENABLED, LIVE_CLASSIFIER_MODELS, LIVE_CLASSIFIER_COMPILE_TREES, LIVE_CLASSIFIER_SCALER,
+    LIVE_CLASSIFIER_FEATURES, LIVE_CLASSIFIER_CLASS_NAMES, LIVE_CLASSIFIER_BATCH_SIZE, LIVE_CLASSIFIER_MAX_DELAY_MS,
+    LIVE_CLASSIFIER_TIMEOUT_SECONDS, LIVE_CLASSIFIER_BENCHMARK_CSV, PREDICTION_CACHE_ENABLED
+)
+
+class LiveClassifier:
+    """
+    Scores packets with the CICIDS2018 scaler and tree models.
+
+    Feature vectors are written into one preallocated float32 matrix (grown
+    only when a larger batch arrives), scaled and passed to every model; the
+    models' class probabilities are averaged (soft vote) as in training. The
+    most likely class becomes the packet's attack_type and its probability,
+    as a percentage, the confidence_score.
+
+    With a PredictionCache, scaled vectors seen before reuse their cached
+    scores and only new ones reach the models; `model_version` identifies
+    the models so the cache is dropped when they change.
+
+    Not thread-safe: the feature matrix is reused between calls, so calls
+    are serialised through a lock (or a single MicroBatcher thread).
+    """
+
+    def __init__(self, feature_names, scaler, models, class_names=None, capacity=LIVE_CLASSIFIER_BATCH_SIZE,
+                 cache=None, model_version=None):
+        self.feature_names = list(feature_names)
+        self._columns = {name: i for i, name in enumerate(self.feature_names)}
+        self.scaler = scaler
+        self.models = list(models)
+        self.cache = cache
+        self.model_version = model_version
+        if not self.models:
+            raise ValueError("The live classifier needs at least one model.")
+
+        classes = self.models[0].classes_
+        for model in self.models[1:]:
+            if not np.array_equal(model.classes_, classes):
+                raise ValueError("All live classifier models must be trained on the same classes.")
+        class_names = class_names or {}
+        self.labels = np.array([class_names.get(c, 'Unknown') for c in classes.tolist()], dtype=object)
+
+        self._matrix = np.zeros((capacity, len(self.feature_names)), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def _rows(self, n):
+        """Return the first n rows of the feature matrix, growing it if needed."""
+        if n > len(self._matrix):
+            self._matrix = np.zeros((max(n, 2 * len(self._matrix)), len(self.feature_names)), dtype=np.float32)
+        return self._matrix[:n]
+
+    def collate(self, records):
+        """Write feature dicts into the preallocated matrix; unknown keys are ignored, missing or non-numeric values become 0."""
+        features = self._rows(len(records))
+        features.fill(0)
+        columns = self._columns
+        for i, record in enumerate(records):
+            row = features[i]
+            for name, value in record.items():
+                j = columns.get(name)
+                if j is None:
+                    continue
+                try:
+                    row[j] = value
+                except (TypeError, ValueError):
+                    pass
+        return self._clean(features)
+
+    def collate_frame(self, df):
+        """Copy a DataFrame's feature columns into the preallocated matrix; missing columns become 0."""
+        features = self._rows(len(df))
+        features[...] = df.reindex(columns=self.feature_names, fill_value=0).to_numpy(dtype=np.float32, na_value=0)
+        return self._clean(features)
+
+    @staticmethod
+    def _clean(features):
+        np.nan_to_num(features, copy=False, nan=0.0)
+        return features
+
+    def predict(self, features):
+        """Return arrays of attack_type and confidence_score (0-100) for a feature matrix."""
+        scaled = self.scaler.transform(features)
+        if self.cache is not None:
+            return self.cache.predict(scaled, self._score, model_version=self.model_version)
+        return self._score(scaled)
+
+    def _score(self, scaled):
+        proba = self.models[0].predict_proba(scaled)
+        for model in self.models[1:]:
+            proba = proba + model.predict_proba(scaled)
+        proba /= len(self.models)
+        best = proba.argmax(axis=1)
+        return {
+            "attack_type": self.labels[best],
+            "confidence_score": 100.0 * proba[np.arange(len(best)), best]
+        }
+
+    def classify(self, records):
+        """Score a list of feature dicts."""
+        with self._lock:
+            return self.predict(self.collate(records))
+
+    def classify_frame(self, df):
+        """Score the rows of a DataFrame."""
+        with self._lock:
+            return self.predict(self.collate_frame(df))
+
+def _load_model(name):
+    """Load a tree model, compiled to node arrays when LIVE_CLASSIFIER_COMPILE_TREES is set."""
+    model = registry.get(name)
+    if not LIVE_CLASSIFIER_COMPILE_TREES:
+        return model
+    try:
+        return compile_ensemble(model)
+    except NotImplementedError as e:
+        print(f"⚠️ Model '{name}' could not be compiled, using it as is: {e}")
+        return model
+
+def load_classifier():
+    """Build the live classifier from the model registry artifacts."""
+    return LiveClassifier(
+        feature_names=registry.get(LIVE_CLASSIFIER_FEATURES),
+        scaler=registry.get(LIVE_CLASSIFIER_SCALER),
+        models=[_load_model(name) for name in LIVE_CLASSIFIER_MODELS],
+        class_names=LIVE_CLASSIFIER_CLASS_NAMES,
+        cache=PredictionCache() if PREDICTION_CACHE_ENABLED else None,
+        model_version=registry.version([LIVE_CLASSIFIER_SCALER, *LIVE_CLASSIFIER_MODELS])
+    )
+
+_classifier = None
+_batcher = None
+_init_lock = threading.Lock()
+
+def get_batcher():
+    """Return the shared micro-batcher feeding the live classifier, creating it on first use."""
+    global _classifier, _batcher
+    if _batcher is None:
+        with _init_lock:
+            if _batcher is None:
+                _classifier = load_classifier()
+                _batcher = MicroBatcher(
+                    _classifier.predict, max_batch_size=LIVE_CLASSIFIER_BATCH_SIZE,
+                    max_delay_ms=LIVE_CLASSIFIER_MAX_DELAY_MS, collate=_classifier.collate
+                )
+    return _batcher
+
+def score_packet(packet_data, features):
+    """
+    Replace a packet's precomputed attack_type/confidence_score with a live prediction.
+
+    Concurrent ingest requests are grouped into micro-batches so the models
+    run once per batch. If the classifier is disabled or fails, the packet is
+    returned unchanged.
+
+    Args:
+        packet_data (dict): The packet as received at ingest.
+        features (dict): Flow features keyed by the aligned feature names.
+
+    Returns:
+        dict: The packet with attack_type and confidence_score set.
+    """
+    if not LIVE_CLASSIFIER_ENABLED:
+        return packet_data
+    try:
+        result = get_batcher().predict(features, timeout=LIVE_CLASSIFIER_TIMEOUT_SECONDS)
+    except Exception as e:
+        print(f"⚠️ Live classification failed, using the precomputed prediction: {e}")
+        return packet_data
+    return {
+        **packet_data,
+        "attack_type": str(result["attack_type"]),
+        "confidence_score": float(result["confidence_score"])
+    }
+
+def benchmark(csv_path=LIVE_CLASSIFIER_BENCHMARK_CSV, batch_sizes=(1, 64, 1024, 8192), max_rows=50000):
+    """
+    Print live classifier throughput in rows/sec for several batch sizes.
+
+    Batch size 1 is limited to 1000 rows so the run stays short.
+    """
+    path = csv_path if os.path.isabs(csv_path) else os.path.join(BASE_DIR, csv_path)
+    classifier = load_classifier()
+    df = pd.read_csv(path, nrows=max_rows, usecols=lambda c: c in classifier._columns)
+    print(f"📊 Benchmarking on {len(df)} rows from {path}")
+    print(f"{'Batch size':>10} | {'Rows':>7} | {'Seconds':>8} | {'Rows/sec':>10}")
+    print("-" * 45)
+    for batch_size in batch_sizes:
+        rows = df if batch_size > 1 else df.iloc[:1000]
+        started = time.perf_counter()
+        for start in range(0, len(rows), batch_size):
+            classifier.classify_frame(rows.iloc[start:start + batch_size])
+        elapsed = time.perf_counter() - started
+        print(f"{batch_size:>10} | {len(rows):>7} | {elapsed:>8.2f} | {len(rows) / elapsed:>10.0f}")
+
+if __name__ == '__main__':
+    benchmark(*sys.argv[1:2])
@@ -1,10 +1,13 @@
+import weakref
+import numpy as np
 import pandas as pd
+from services.dataset_cache import read_dataset
 from config import PREDICTION_DATASET_PATH, HONEYPOT_DATASET_PATH
 
 def load_honeypot_dataset():
-    """Load the honeypot dataset."""
+    """Load the honeypot dataset (from its columnar cache when available)."""
     try:
-        dataset_df = pd.read_csv(HONEYPOT_DATASET_PATH)
+        dataset_df = read_dataset(HONEYPOT_DATASET_PATH)
         print(f"✅ Honeypot data loaded successfully: {len(dataset_df)} records.")
         return dataset_df
     except FileNotFoundError as e:
@@ -12,36 +15,100 @@ def load_honeypot_dataset():
         return None
 
 def load_prediction_dataset():
-    """Load the prediction dataset."""
+    """Load the prediction dataset (from its columnar cache when available)."""
     try:
-        dataset_df = pd.read_csv(PREDICTION_DATASET_PATH)
+        dataset_df = read_dataset(PREDICTION_DATASET_PATH)
         print(f"✅ Prediction data loaded successfully: {len(dataset_df)} records.")
         return dataset_df
     except FileNotFoundError as e:
         print(f"❌ Error: File not found. {e}")
         return None
 
+class PositionIndex:
+    """
+    Per-DataFrame lookup structures for packet replay.
+
+    Maps every dst_ip and src_ip value to the sorted array of row positions
+    where it occurs, so the next match after a position is one binary
+    search, and keeps each column as a NumPy array so a row can be read
+    as a plain dict without building a pandas Series.
+    """
+
+    IP_COLUMNS = ('dst_ip', 'src_ip')
+
+    def __init__(self, df):
+        self.length = len(df)
+        self.columns = {name: df[name].to_numpy() for name in df.columns}
+        self.positions = {name: self._build(df[name]) for name in self.IP_COLUMNS if name in df.columns}
+
+    @staticmethod
+    def _build(column):
+        codes, values = pd.factorize(column)
+        order = np.argsort(codes, kind='stable')
+        # Rows with a missing IP (code -1) sort first and are left out
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        return {value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(values.tolist())}
+
+    def next_position(self, column, value, start):
+        """Return the first row position >= start holding `value` in `column`, or None."""
+        positions = self.positions.get(column, {}).get(value)
+        if positions is None:
+            return None
+        i = np.searchsorted(positions, start)
+        return int(positions[i]) if i < len(positions) else None
+
+    def record(self, position):
+        """Return row `position` as a dict of Python values."""
+        return {
+            name: value.item() if isinstance(value, np.generic) else value
+            for name, value in ((name, values[position]) for name, values in self.columns.items())
+        }
+
+# Indexes built so far, keyed by DataFrame identity and dropped with the DataFrame
+_indexes = {}
+
+def get_position_index(df):
+    """
+    Return the PositionIndex of a DataFrame, building it on first use.
+
+    The replay datasets are loaded once and only read afterwards, so the
+    index is reused as long as the frame keeps its length and columns.
+    Editing values in place (e.g. with df.loc) is not detected: call
+    invalidate_position_index(df) after such an edit.
+    """
+    key = id(df)
+    entry = _indexes.get(key)
+    if entry is not None and entry[0]() is df and entry[2] == (len(df), tuple(df.columns)):
+        return entry[1]
+    index = PositionIndex(df)
+    _indexes[key] = (weakref.ref(df, lambda _, key=key: _indexes.pop(key, None)), index, (len(df), tuple(df.columns)))
+    return index
+
+def invalidate_position_index(df):
+    """Drop the PositionIndex of a DataFrame that was edited in place, so the next lookup rebuilds it."""
+    entry = _indexes.get(id(df))
+    if entry is not None and entry[0]() is df:
+        del _indexes[id(df)]
+
 def get_packet_by_index(df, index):
-    """Get a packet from the dataframe by index."""
+    """Get a packet from the dataframe by index, as a dict."""
     if index < len(df):
-        return df.iloc[index]
+        return get_position_index(df).record(index)
     return None
 
 def get_prediction_by_index(df, index):
-    """Get a prediction from the dataframe by index."""
+    """Get a prediction from the dataframe by index, as a dict."""
     if df is not None and index < len(df):
-        return df.iloc[index]
+        return get_position_index(df).record(index)
     return None
 
-def get_next_packet_by_ip(df, start_index, target_ip):
-    """Find the next packet with a matching destination IP."""
+def get_next_packet_by_ip(df, start_index, target_ip, column='dst_ip'):
+    """Find the next packet at or after start_index whose `column` (the destination IP by default) matches."""
     if start_index >= len(df):
         return None, start_index
-    
-    # Search from the current index to the end of the dataframe
-    for index in range(start_index, len(df)):
-        if df.iloc[index]['dst_ip'] == target_ip:
-            return df.iloc[index], index
-            
-    # If not found, return None
-    return None, start_index
+
+    index = get_position_index(df)
+    position = index.next_position(column, target_ip, start_index)
+    if position is None:
+        return None, start_index
+    return index.record(position), position
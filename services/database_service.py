@@ -4,6 +4,10 @@ from werkzeug.security import generate_password_hash, check_password_hash
 
 DATABASE_NAME = 'incident_response.db'
 
+# Names of the versioned lists tracked in state_versions/state_changes
+BLOCKED_LIST = 'blocked_ips'
+ALERTED_LIST = 'alerted_ips'
+
 def init_db():
     """Initialize the SQLite database and create tables if they don't exist."""
     conn = sqlite3.connect(DATABASE_NAME)
@@ -42,10 +46,88 @@ def init_db():
         )
     ''')
 
+    # Create state_versions table (one monotonically increasing counter per list)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS state_versions (
+            list_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    ''')
+
+    # Create state_changes table (latest change per IP, used for delta polling)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS state_changes (
+            list_name TEXT NOT NULL,
+            ip TEXT NOT NULL,
+            op TEXT NOT NULL,
+            unblock_time REAL,
+            version INTEGER NOT NULL,
+            PRIMARY KEY (list_name, ip)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_state_changes_version
+        ON state_changes (list_name, version)
+    ''')
+
     conn.commit()
     conn.close()
     print(f"✅ Database '{DATABASE_NAME}' initialized successfully.")
 
+def _bump_version(cursor, list_name):
+    """Increment the version counter of a list and return the new value."""
+    cursor.execute(
+        "INSERT INTO state_versions (list_name, version) VALUES (?, 1) "
+        "ON CONFLICT(list_name) DO UPDATE SET version = version + 1",
+        (list_name,)
+    )
+    cursor.execute("SELECT version FROM state_versions WHERE list_name = ?", (list_name,))
+    return cursor.fetchone()[0]
+
+def _record_change(cursor, list_name, ip, op, unblock_time=None):
+    """Record the latest change to an IP under a new list version."""
+    version = _bump_version(cursor, list_name)
+    cursor.execute(
+        "INSERT OR REPLACE INTO state_changes (list_name, ip, op, unblock_time, version) VALUES (?, ?, ?, ?, ?)",
+        (list_name, ip, op, unblock_time, version)
+    )
+    return version
+
+def _record_clear(cursor, list_name):
+    """Record every IP currently in a list as removed under a single new version."""
+    version = _bump_version(cursor, list_name)
+    cursor.execute(
+        f"INSERT OR REPLACE INTO state_changes (list_name, ip, op, unblock_time, version) "
+        f"SELECT ?, ip, 'removed', NULL, ? FROM {list_name}",
+        (list_name, version)
+    )
+    return version
+
+def get_state_version(list_name):
+    """Return the current version of a list (0 if it has never changed)."""
+    conn = sqlite3.connect(DATABASE_NAME)
+    cursor = conn.cursor()
+    cursor.execute("SELECT version FROM state_versions WHERE list_name = ?", (list_name,))
+    row = cursor.fetchone()
+    conn.close()
+    return row[0] if row else 0
+
+def get_state_changes(list_name, since_version):
+    """Retrieve the latest change per IP recorded after the given version."""
+    conn = sqlite3.connect(DATABASE_NAME)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT ip, op, unblock_time, version FROM state_changes "
+        "WHERE list_name = ? AND version > ? ORDER BY version",
+        (list_name, since_version)
+    )
+    changes = [
+        {"ip": row[0], "op": row[1], "unblock_time": row[2], "version": row[3]}
+        for row in cursor.fetchall()
+    ]
+    conn.close()
+    return changes
+
 def get_ip_reputation(ip):
     """Retrieve the reputation for a given IP."""
     conn = sqlite3.connect(DATABASE_NAME)
@@ -120,6 +202,7 @@ def add_blocked_ip(ip):
     cursor = conn.cursor()
     try:
         cursor.execute("INSERT INTO blocked_ips (ip) VALUES (?)", (ip,))
+        _record_change(cursor, BLOCKED_LIST, ip, 'added')
         conn.commit()
         return True
     except sqlite3.IntegrityError:
@@ -133,9 +216,12 @@ def remove_blocked_ip(ip):
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
     cursor.execute("DELETE FROM blocked_ips WHERE ip = ?", (ip,))
+    removed = cursor.rowcount > 0
+    if removed:
+        _record_change(cursor, BLOCKED_LIST, ip, 'removed')
     conn.commit()
     conn.close()
-    return cursor.rowcount > 0
+    return removed
 
 def get_blocked_ips():
     """Retrieve all blocked IPs."""
@@ -146,17 +232,28 @@ def get_blocked_ips():
     conn.close()
     return ips
 
+def iter_blocked_ips():
+    """Yield blocked IPs one at a time straight from the database cursor."""
+    conn = sqlite3.connect(DATABASE_NAME)
+    try:
+        for row in conn.execute("SELECT ip FROM blocked_ips"):
+            yield row[0]
+    finally:
+        conn.close()
+
 def add_alerted_ip(ip, unblock_time):
     """Add an IP to the alerted_ips table with an unblock time."""
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
     try:
         cursor.execute("INSERT INTO alerted_ips (ip, unblock_time) VALUES (?, ?)", (ip, unblock_time))
+        _record_change(cursor, ALERTED_LIST, ip, 'changed', unblock_time)
         conn.commit()
         return True
     except sqlite3.IntegrityError:
         # IP already exists, update unblock time
         cursor.execute("UPDATE alerted_ips SET unblock_time = ? WHERE ip = ?", (unblock_time, ip))
+        _record_change(cursor, ALERTED_LIST, ip, 'changed', unblock_time)
         conn.commit()
         return True
     finally:
@@ -167,9 +264,12 @@ def remove_alerted_ip(ip):
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
     cursor.execute("DELETE FROM alerted_ips WHERE ip = ?", (ip,))
+    removed = cursor.rowcount > 0
+    if removed:
+        _record_change(cursor, ALERTED_LIST, ip, 'removed')
     conn.commit()
     conn.close()
-    return cursor.rowcount > 0
+    return removed
 
 def get_alerted_ips():
     """Retrieve all alerted IPs with their unblock times."""
@@ -180,6 +280,15 @@ def get_alerted_ips():
     conn.close()
     return alerts
 
+def iter_alerted_ips():
+    """Yield alerted IPs with their unblock times one at a time from the database cursor."""
+    conn = sqlite3.connect(DATABASE_NAME)
+    try:
+        for row in conn.execute("SELECT ip, unblock_time FROM alerted_ips"):
+            yield {"ip": row[0], "unblock_time": row[1]}
+    finally:
+        conn.close()
+
 def is_ip_blocked(ip):
     """Check if an IP is currently permanently blocked."""
     conn = sqlite3.connect(DATABASE_NAME)
@@ -205,6 +314,7 @@ def clear_blocked_ips():
     """Remove all IPs from the blocked_ips table."""
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
+    _record_clear(cursor, BLOCKED_LIST)
     cursor.execute("DELETE FROM blocked_ips")
     conn.commit()
     conn.close()
@@ -214,6 +324,7 @@ def clear_alerted_ips():
     """Remove all IPs from the alerted_ips table."""
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
+    _record_clear(cursor, ALERTED_LIST)
     cursor.execute("DELETE FROM alerted_ips")
     conn.commit()
     conn.close()
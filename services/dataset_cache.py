@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from config import DATASET_CACHE_DIR, DATASET_CACHE_FORMAT, DATASET_CACHE_AUTO_BUILD, DATASET_CACHE_MMAP_MODE
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_FORMATS = ('npy', 'feather', 'parquet')
+_META_FILE = 'meta.json'
+
+def resolve_path(path):
+    """Return a configured path, relative ones taken from the repository root."""
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+def file_hash(path, chunk_size=1 << 20):
+    """Return the BLAKE2b hex digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_path(source, cache_dir=None):
+    """Return the cache directory used for a source CSV."""
+    cache_dir = cache_dir or resolve_path(DATASET_CACHE_DIR)
+    source = os.path.abspath(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    path_key = hashlib.blake2b(source.encode('utf-8'), digest_size=4).hexdigest()
+    return os.path.join(cache_dir, f"{stem}-{path_key}")
+
+def _read_meta(directory):
+    try:
+        with open(os.path.join(directory, _META_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _write_meta(directory, meta):
+    tmp_path = os.path.join(directory, _META_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, _META_FILE))
+
+def is_fresh(source, cache_dir=None):
+    """
+    Return the cache metadata if the cache matches the source file, else None.
+
+    The source is only re-hashed when its size or modification time differ
+    from the ones recorded, so checking an unchanged file costs one stat().
+    """
+    directory = cache_path(source, cache_dir)
+    meta = _read_meta(directory)
+    if meta is None:
+        return None
+    try:
+        stat = os.stat(source)
+    except FileNotFoundError:
+        return None
+    if stat.st_size == meta["source_size"] and stat.st_mtime_ns == meta["source_mtime_ns"]:
+        return meta
+    if stat.st_size != meta["source_size"] or file_hash(source) != meta["source_hash"]:
+        return None
+    # Touched but unchanged: remember the new modification time
+    meta["source_mtime_ns"] = stat.st_mtime_ns
+    _write_meta(directory, meta)
+    return meta
+
+def _require_pyarrow(fmt):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"The '{fmt}' cache format requires pyarrow (pip install pyarrow); use 'npy' instead.")
+
+def build_cache(source, fmt=DATASET_CACHE_FORMAT, cache_dir=None):
+    """
+    Parse a CSV once and store it in columnar form.
+
+    'npy' writes one .npy file per column: numeric, boolean and datetime
+    columns as-is, other columns as int32 codes plus a JSON list of their
+    distinct values, which keeps each value's type (a column mixing 1 and
+    '1' loads back the same). 'feather' and 'parquet' need pyarrow.
+
+    Raises:
+        ValueError: For an 'npy' cache of a column holding values JSON
+            cannot store, such as timestamps in an object column.
+
+    Returns:
+        dict: The cache metadata.
+    """
+    if fmt not in CACHE_FORMATS:
+        raise ValueError(f"Unknown cache format '{fmt}'. Use one of: {', '.join(CACHE_FORMATS)}.")
+    if fmt != 'npy':
+        _require_pyarrow(fmt)
+
+    stat = os.stat(source)
+    source_hash = file_hash(source)
+    df = pd.read_csv(source)
+
+    directory = cache_path(source, cache_dir)
+    tmp_directory = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+
+    columns = []
+    if fmt == 'npy':
+        for i, name in enumerate(df.columns):
+            columns.append(_save_column(tmp_directory, i, name, df[name]))
+    elif fmt == 'feather':
+        df.to_feather(os.path.join(tmp_directory, 'data.feather'))
+    else:
+        df.to_parquet(os.path.join(tmp_directory, 'data.parquet'), index=False)
+
+    meta = {
+        "source": os.path.abspath(source),
+        "source_hash": source_hash,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "format": fmt,
+        "rows": len(df),
+        "columns": columns or [{"name": name} for name in df.columns]
+    }
+    _write_meta(tmp_directory, meta)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_directory, directory)
+    return meta
+
+def _save_column(directory, i, name, series):
+    """Write one column as .npy and return its metadata entry."""
+    values = series.to_numpy()
+    if series.dtype.kind in 'biuf':
+        np.save(os.path.join(directory, f"{i}.npy"), np.ascontiguousarray(values))
+        return {"name": name, "file": f"{i}.npy", "kind": "array", "dtype": series.dtype.str}
+    if series.dtype.kind == 'M':
+        np.save(os.path.join(directory, f"{i}.npy"), values.astype('datetime64[ns]').view(np.int64))
+        return {"name": name, "file": f"{i}.npy", "kind": "datetime"}
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    if not all(isinstance(v, str) for v in uniques):
+        # factorize treats 1, 1.0 and True as one value; keep them apart by type
+        present = series.notna().to_numpy()
+        typed = pd.Series([(type(v), v) for v in series[present].tolist()], dtype=object)
+        present_codes, typed_uniques = pd.factorize(typed)
+        codes = np.full(len(series), -1, dtype=np.int64)
+        codes[present] = present_codes
+        uniques = [v for _, v in typed_uniques]
+    values = [v.item() if isinstance(v, np.generic) else v for v in uniques]
+    if not all(isinstance(v, (str, bool, int, float)) for v in values):
+        raise ValueError(f"Column '{name}' holds values the 'npy' cache cannot store; use 'feather' or 'parquet'.")
+    np.save(os.path.join(directory, f"{i}.npy"), codes.astype(np.int32))
+    return {"name": name, "file": f"{i}.npy", "kind": "codes", "values": values}
+
+def load_cache(source, columns=None, cache_dir=None, meta=None, mmap_mode=DATASET_CACHE_MMAP_MODE):
+    """
+    Load a cached dataset, reading only the requested columns.
+
+    'npy' columns are memory-mapped (copy-on-write by default, so the
+    DataFrame can be modified without touching the cache); encoded text
+    columns are decoded with one vectorized take.
+    """
+    directory = cache_path(source, cache_dir)
+    meta = meta or _read_meta(directory)
+    wanted = list(columns) if columns is not None else [c["name"] for c in meta["columns"]]
+
+    if meta["format"] == 'feather':
+        return pd.read_feather(os.path.join(directory, 'data.feather'), columns=wanted)
+    if meta["format"] == 'parquet':
+        return pd.read_parquet(os.path.join(directory, 'data.parquet'), columns=wanted)
+
+    by_name = {c["name"]: c for c in meta["columns"]}
+    missing = [name for name in wanted if name not in by_name]
+    if missing:
+        raise KeyError(f"Columns not in cached dataset: {', '.join(missing)}")
+
+    data = {}
+    for name in wanted:
+        column = by_name[name]
+        values = np.load(os.path.join(directory, column["file"]), mmap_mode=mmap_mode)
+        if column["kind"] == "datetime":
+            values = values.view('datetime64[ns]')
+        elif column["kind"] == "codes":
+            # Code -1 (missing) picks the trailing NaN
+            lookup = np.array(column["values"] + [np.nan], dtype=object)
+            values = lookup[values]
+        data[name] = values
+    return pd.DataFrame(data, columns=wanted, copy=False)
+
+def read_dataset(path, columns=None):
+    """
+    Read a CSV dataset, using its columnar cache when one is up to date.
+
+    Without a fresh cache the CSV is parsed; with DATASET_CACHE_AUTO_BUILD
+    the cache is built first so later loads are fast.
+
+    Args:
+        path (str): Path of the source CSV.
+        columns (list, optional): Only load these columns.
+
+    Returns:
+        pd.DataFrame: The dataset.
+    """
+    meta = is_fresh(path)
+    if meta is None and DATASET_CACHE_AUTO_BUILD and os.path.exists(path):
+        meta = build_cache(path)
+    if meta is not None:
+        try:
+            return load_cache(path, columns, meta=meta)
+        except ImportError as e:
+            print(f"⚠️ Could not read the {meta['format']} cache for {path}, parsing the CSV: {e}")
+    if columns is None:
+        return pd.read_csv(path)
+    return pd.read_csv(path, usecols=columns)
+
+def compare_load(path, columns=None, repeats=3):
+    """Return best-of-N load seconds for the CSV and for its cache."""
+    def best(fn):
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    csv_seconds = best(lambda: pd.read_csv(path, usecols=columns))
+    cache_seconds = best(lambda: load_cache(path, columns))
+    return csv_seconds, cache_seconds
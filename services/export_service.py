@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from services import database_service
+
+# Columns written for each export kind in CSV mode
+LOG_EXPORT_FIELDS = [
+    'ingested_at', 'src_ip', 'dst_ip', 'protocol', 'port',
+    'attack_prediction', 'confidence', 'trust_score', 'trust_level', 'action'
+]
+DECISION_EXPORT_FIELDS = ['list', 'ip', 'unblock_time']
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+def parse_time(value):
+    """Parse an epoch timestamp or ISO 8601 string into epoch seconds (None passes through)."""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def _flatten_log(log):
+    """Turn a packet log entry into a flat export row."""
+    details = log.get('details') or {}
+    return {
+        'ingested_at': log.get('ingested_at'),
+        'src_ip': details.get('src_ip'),
+        'dst_ip': details.get('dst_ip'),
+        'protocol': details.get('protocol'),
+        'port': details.get('port'),
+        'attack_prediction': log.get('attack_prediction'),
+        'confidence': log.get('confidence'),
+        'trust_score': log.get('trust_score'),
+        'trust_level': log.get('trust_level'),
+        'action': log.get('action')
+    }
+
+def iter_log_rows(packet_logs, start=None, end=None, action=None, prediction=None,
+                  src_ip=None, trust_level=None):
+    """
+    Yield flattened packet log rows matching the given filters, one at a time.
+
+    The log list is walked with a plain iterator rather than copied, so memory
+    use does not depend on how many logs are exported. Entries appended while
+    the export runs are included; clearing the logs simply ends the export.
+    """
+    for log in iter(packet_logs):
+        row = _flatten_log(log)
+        ingested_at = row['ingested_at']
+        if start is not None and (ingested_at is None or ingested_at < start):
+            continue
+        if end is not None and (ingested_at is None or ingested_at > end):
+            continue
+        if action is not None and row['action'] != action:
+            continue
+        if prediction is not None and row['attack_prediction'] != prediction:
+            continue
+        if src_ip is not None and row['src_ip'] != src_ip:
+            continue
+        if trust_level is not None and row['trust_level'] != trust_level:
+            continue
+        yield row
+
+def iter_decision_rows():
+    """Yield the current mitigation decisions (blocked and alerted IPs) from the database."""
+    for ip in database_service.iter_blocked_ips():
+        yield {'list': 'blocked', 'ip': ip, 'unblock_time': None}
+    for alert in database_service.iter_alerted_ips():
+        yield {'list': 'alerted', 'ip': alert['ip'], 'unblock_time': alert['unblock_time']}
+
+def stream_ndjson(rows):
+    """Encode rows as newline-delimited JSON, one line per row."""
+    for row in rows:
+        yield json.dumps(row, default=str) + '\n'
+
+def stream_csv(rows, fields):
+    """Encode rows as CSV with a header line, reusing a single line buffer."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+
+    writer.writeheader()
+    yield _drain(buffer)
+    for row in rows:
+        writer.writerow(row)
+        yield _drain(buffer)
+
+def _drain(buffer):
+    """Return the contents of a StringIO buffer and empty it for reuse."""
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return value
+
+def stream_gzip(chunks, level=6):
+    """Compress a stream of text chunks into gzip bytes on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def stream_export(rows, fmt, fields, compress=False):
+    """
+    Build the chunk generator for an export in the requested format.
+
+    Args:
+        rows (iterable): Flat row dictionaries to export.
+        fmt (str): Either 'ndjson' or 'csv'.
+        fields (list): Column order used in CSV mode.
+        compress (bool): Whether to gzip the stream on the fly.
+
+    Returns:
+        generator: Text chunks, or gzip byte chunks when compressed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}.")
+    chunks = stream_csv(rows, fields) if fmt == 'csv' else stream_ndjson(rows)
+    return stream_gzip(chunks) if compress else chunks
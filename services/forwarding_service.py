@@ -0,0 +1,242 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+import requests
+from requests.adapters import HTTPAdapter
+from services.circuit_breaker import CircuitBreaker
+from config import (
+    FORWARD_QUEUE_SIZE, FORWARD_WORKERS, FORWARD_BATCH_SIZE, FORWARD_MAX_DELAY_MS, FORWARD_TIMEOUT_SECONDS,
+    FORWARD_MAX_RETRIES, FORWARD_BACKOFF_SECONDS, FORWARD_BACKOFF_MAX_SECONDS, FORWARD_CIRCUIT_RESET_SECONDS
+)
+
+_STOP = object()
+
+class Forwarder:
+    """
+    Forwards payloads to the dashboard in the background.
+
+    `submit` only enqueues, so the caller never waits on the dashboard.
+    Worker threads take up to `batch_size` payloads at a time (waiting at
+    most `max_delay_ms` for a batch to fill) and post them as one request
+    to `url` over a shared keep-alive session. Failed posts are retried
+    with exponential backoff and full jitter; a batch that still fails, or
+    that arrives while the circuit is open after such a failure, is
+    appended to the NDJSON `spill_path` instead of being lost. The spill
+    file is replayed once the dashboard accepts a post again. Payloads that
+    do not fit in the bounded queue are spilled straight to disk.
+
+    Without a `spill_path` undeliverable payloads are dropped and counted.
+
+    A post can time out after the dashboard has already ingested it, so
+    retries and replays may send a payload twice. Every dict payload gets a
+    `forward_id` on submit, which the dashboard uses to skip the copies.
+    """
+
+    def __init__(self, url, spill_path=None, workers=FORWARD_WORKERS, queue_size=FORWARD_QUEUE_SIZE,
+                 batch_size=FORWARD_BATCH_SIZE, max_delay_ms=FORWARD_MAX_DELAY_MS, timeout=FORWARD_TIMEOUT_SECONDS,
+                 max_retries=FORWARD_MAX_RETRIES, backoff=FORWARD_BACKOFF_SECONDS,
+                 max_backoff=FORWARD_BACKOFF_MAX_SECONDS, circuit_reset=FORWARD_CIRCUIT_RESET_SECONDS):
+        self.url = url
+        self.spill_path = spill_path
+        self.batch_size = batch_size
+        self.max_delay = max_delay_ms / 1000
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=circuit_reset)
+        self.counts = {"submitted": 0, "sent": 0, "batches": 0, "retries": 0, "spilled": 0, "replayed": 0, "dropped": 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 1), max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._closing = threading.Event()
+        self._workers = [
+            threading.Thread(target=self._run, name=f'forwarder-{i}', daemon=True) for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counts[name] += n
+
+    def submit(self, payload):
+        """
+        Queue a payload for forwarding without blocking.
+
+        Returns:
+            bool: True if it was queued, False if the queue was full and it was spilled or dropped.
+        """
+        self._count("submitted")
+        if isinstance(payload, dict) and "forward_id" not in payload:
+            payload = {**payload, "forward_id": uuid.uuid4().hex}
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            self._spill([payload])
+            return False
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._deliver(batch)
+            if stopping:
+                break
+
+    def _deliver(self, batch):
+        """Post a batch (spilling it if the dashboard cannot take it) and replay spilled payloads after a success."""
+        if not self.breaker.allow():
+            self._spill(batch)
+            return
+        if not self._post_with_retries(batch):
+            self.breaker.record_failure()
+            self._spill(batch)
+            return
+        self.breaker.record_success()
+        self._replay_spill()
+
+    def _post(self, batch):
+        """
+        Post one batch; returns True on success.
+
+        A 4xx answer means the dashboard rejected the data itself, so the
+        batch is dropped rather than retried.
+        """
+        try:
+            response = self.session.post(self.url, json={"packets": batch}, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"[Forwarder] ⚠️ Could not reach the dashboard: {e}")
+            return False
+        if 400 <= response.status_code < 500:
+            print(f"[Forwarder] ❌ Dashboard rejected {len(batch)} packets: {response.status_code} {response.text}")
+            self._count("dropped", len(batch))
+            return True
+        if response.status_code >= 500:
+            print(f"[Forwarder] ⚠️ Dashboard responded with an error: {response.status_code}")
+            return False
+        self._count("sent", len(batch))
+        self._count("batches")
+        return True
+
+    def _post_with_retries(self, batch):
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+                # Full jitter keeps the workers from retrying in lockstep
+                if self._closing.wait(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))):
+                    return False
+            if self._post(batch):
+                return True
+        return False
+
+    def _spill(self, batch):
+        """Append payloads to the spill file, or drop them when there is none."""
+        if not self.spill_path:
+            self._count("dropped", len(batch))
+            return
+        lines = "".join(json.dumps(payload) + "\n" for payload in batch)
+        with self._spill_lock:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+        self._count("spilled", len(batch))
+
+    def _replay_spill(self):
+        """
+        Resend spilled payloads in batches, oldest first.
+
+        The spill file is moved aside first so new failures keep appending
+        to a fresh file, then streamed: each batch is posted as soon as it is
+        read. When a post fails, that batch and the rest of the file are
+        spilled again. Only one worker replays at a time.
+        """
+        if not self.spill_path or not self._replay_lock.acquire(blocking=False):
+            return
+        try:
+            replay_path = self.spill_path + '.replay'
+            with self._spill_lock:
+                if not os.path.exists(replay_path):
+                    if not os.path.exists(self.spill_path):
+                        return
+                    os.replace(self.spill_path, replay_path)
+
+            print("[Forwarder] Replaying spilled packets.")
+            with open(replay_path, encoding='utf-8') as f:
+                for batch in self._read_batches(f):
+                    if self._closing.is_set() or not self._post(batch):
+                        self.breaker.record_failure()
+                        self._spill(batch)
+                        self._spill_lines(f)
+                        break
+                    self._count("replayed", len(batch))
+            os.remove(replay_path)
+        finally:
+            self._replay_lock.release()
+
+    def _read_batches(self, lines):
+        """Yield the payloads of an NDJSON stream in batches of at most `batch_size`."""
+        batch = []
+        for line in lines:
+            try:
+                batch.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A line cut short by a crash while spilling
+                self._count("dropped")
+                continue
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _spill_lines(self, lines):
+        """Copy the unread lines of a replayed spill file back to the spill file."""
+        spilled = 0
+        with self._spill_lock:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                for line in lines:
+                    f.write(line if line.endswith('\n') else line + '\n')
+                    spilled += 1
+        self._count("spilled", spilled)
+
+    def stats(self):
+        """Return forwarding counters and the current queue depth."""
+        with self._lock:
+            return {**self.counts, "queued": self._queue.qsize(), "circuit": self.breaker.state}
+
+    def close(self, timeout=None):
+        """Post the queued payloads once each (spilling what fails) and stop the workers."""
+        self._closing.set()
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout)
+        self.session.close()
@@ -0,0 +1,263 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from multiprocessing import shared_memory
+import numpy as np
+
+INFERENCE_MODES = ('serial', 'thread', 'process')
+
+# Models (or a loader for them) held by each process-pool worker, installed once by the pool initializer
+_worker_models = {}
+_worker_loader = None
+
+def _init_process_worker(models, loader):
+    global _worker_models, _worker_loader
+    _worker_models = models or {}
+    _worker_loader = loader
+
+def _get_worker_model(name):
+    if name not in _worker_models:
+        _worker_models[name] = _worker_loader(name)
+    return _worker_models[name]
+
+def _timed_predict(model, features):
+    """Return the positive-class probabilities of a model and how long it took."""
+    started = time.perf_counter()
+    proba = model.predict_proba(features)[:, 1]
+    return proba, time.perf_counter() - started
+
+def _predict_from_shared_memory(name, shm_name, shape, dtype):
+    """Process-pool task: run one model on the feature matrix held in shared memory."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        features = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        result = _timed_predict(_get_worker_model(name), features)
+        del features
+        return result
+    finally:
+        shm.close()
+
+class ModelRunner:
+    """
+    Runs several models' predict_proba on the same feature matrix.
+
+    Modes:
+        'serial'  - one model after another in the calling thread.
+        'thread'  - concurrently in a thread pool; the feature matrix is shared
+                    read-only, and NumPy/BLAS and sklearn release the GIL.
+        'process' - concurrently in a process pool; models are shipped to each
+                    worker once and the features are passed through shared memory.
+
+    A model that raises or misses the shared deadline is left out of the
+    result (and reported in last_failures) so one slow model cannot stall
+    the pipeline. After a timeout the pool is replaced so the stuck workers
+    do not hold slots needed by later batches: process-pool workers are
+    terminated before the batch's shared memory is unlinked, while a stuck
+    thread cannot be stopped and exits once its predict_proba returns.
+
+    If a `loader` (a picklable callable name -> model, such as
+    model_registry.load_model) is given, `models` may be a list of names: the
+    models are then loaded on first use, and process-pool workers load their
+    own memory-mapped copies instead of receiving pickled ones.
+    """
+
+    def __init__(self, models, mode='thread', workers=4, timeout=None, loader=None):
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode '{mode}'. Use one of: {', '.join(INFERENCE_MODES)}.")
+        self.names = list(models)
+        self.loader = loader
+        self._models = None if loader is not None else dict(models)
+        self.mode = mode
+        self.timeout = timeout
+        self.workers = workers
+        self.last_timings = {}
+        self.last_failures = {}
+        self.pool_restarts = 0
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        if self.mode == 'thread':
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='inference')
+        if self.mode == 'process':
+            return ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_process_worker, initargs=(self._models, self.loader)
+            )
+        return None
+
+    def predict(self, features, names=None):
+        """
+        Returns a dict of model name -> positive-class probabilities.
+
+        Only the models in `names` are run when given (all by default).
+        Per-model timings (seconds) are stored in last_timings and failed or
+        timed-out models in last_failures.
+        """
+        self.last_timings = {}
+        self.last_failures = {}
+        names = self.names if names is None else list(names)
+
+        if self.mode == 'serial':
+            models = self._resolve_models()
+            preds = {}
+            for name in names:
+                model = models[name]
+                try:
+                    preds[name], self.last_timings[name] = _timed_predict(model, features)
+                except Exception as e:
+                    self.last_failures[name] = repr(e)
+            return self._check(preds)
+
+        if self.mode == 'thread':
+            models = self._resolve_models()
+            futures = {name: self._executor.submit(_timed_predict, models[name], features) for name in names}
+            return self._check(self._collect(futures))
+
+        features = np.ascontiguousarray(features)
+        shm = shared_memory.SharedMemory(create=True, size=max(features.nbytes, 1))
+        try:
+            shared = np.ndarray(features.shape, dtype=features.dtype, buffer=shm.buf)
+            shared[...] = features
+            del shared
+            futures = {
+                name: self._executor.submit(
+                    _predict_from_shared_memory, name, shm.name, features.shape, features.dtype.str
+                )
+                for name in names
+            }
+            return self._check(self._collect(futures))
+        finally:
+            # _collect has terminated any worker still using the buffer
+            shm.close()
+            shm.unlink()
+
+    def reload_models(self):
+        """
+        Take the models from the loader again on the next batch, e.g. after
+        their artifacts changed; process-pool workers are replaced so they
+        load them too.
+        """
+        if self.loader is None:
+            return
+        self._models = None
+        if self.mode == 'process':
+            self._restart_pool()
+
+    def _resolve_models(self):
+        """Return the models by name, loading them through the loader on first use."""
+        if self._models is None:
+            self._models = {name: self.loader(name) for name in self.names}
+        return self._models
+
+    def _collect(self, futures):
+        """Gather results, giving every model the same overall deadline."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        preds = {}
+        timed_out = False
+        for name, future in futures.items():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                preds[name], self.last_timings[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                timed_out = True
+                self.last_failures[name] = f"timed out after {self.timeout}s"
+            except Exception as e:
+                self.last_failures[name] = repr(e)
+        if timed_out:
+            self._restart_pool()
+        return preds
+
+    def _restart_pool(self):
+        """Replace the pool after a timeout, terminating process workers that are still busy."""
+        old = self._executor
+        self._executor = self._new_executor()
+        self.pool_restarts += 1
+        old.shutdown(wait=False, cancel_futures=True)
+        if self.mode == 'process':
+            # ProcessPoolExecutor has no public way to stop a running task
+            for process in list((old._processes or {}).values()):
+                process.terminate()
+
+    def _check(self, preds):
+        for name, reason in self.last_failures.items():
+            print(f"⚠️ Model '{name}' skipped for this batch: {reason}")
+        if not preds:
+            raise RuntimeError("All base models failed for this batch.")
+        return preds
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+class CascadeRunner:
+    """
+    Confidence cascade over a ModelRunner.
+
+    The cheap model scores every row; only rows whose probability falls inside
+    the uncertainty band [low, high] are sent to the remaining (expensive)
+    models. For confidently scored rows the expensive models' predictions are
+    filled in with the cheap model's probability, so the ensemble step still
+    receives one full-length array per model. An expensive model that fails
+    or times out on the escalated rows is left out of the batch's result,
+    as ModelRunner does, rather than standing in with the cheap model's
+    probabilities.
+
+    Every `audit_every` batches the full ensemble is also run and compared with
+    the cascade through `combine` (the ensemble function), to track how often
+    both agree on the malicious/benign call at 0.5.
+    """
+
+    def __init__(self, runner, cheap_model, band=(0.2, 0.8), combine=None, audit_every=0):
+        self.runner = runner
+        self.cheap_model = cheap_model
+        self.expensive_models = [name for name in runner.names if name != cheap_model]
+        self.low, self.high = band
+        self.combine = combine
+        self.audit_every = audit_every
+        self.batches = 0
+        self.rows = 0
+        self.escalated_rows = 0
+        self.audited_rows = 0
+        self.agreeing_rows = 0
+
+    def predict(self, features):
+        """Returns a dict of model name -> positive-class probabilities for every row."""
+        cheap = self.runner.predict(features, names=[self.cheap_model])[self.cheap_model]
+        uncertain = (cheap >= self.low) & (cheap <= self.high)
+
+        preds = {self.cheap_model: cheap}
+        if uncertain.any():
+            try:
+                escalated = self.runner.predict(features[uncertain], names=self.expensive_models)
+            except RuntimeError:
+                # Every expensive model failed; the cheap model alone scores the batch
+                escalated = {}
+            for name, proba in escalated.items():
+                preds[name] = cheap.copy()
+                preds[name][uncertain] = proba
+        else:
+            for name in self.expensive_models:
+                preds[name] = cheap.copy()
+
+        self.batches += 1
+        self.rows += len(cheap)
+        self.escalated_rows += int(uncertain.sum())
+        if self.combine is not None and self.audit_every and self.batches % self.audit_every == 0:
+            self._audit(features, preds)
+        return preds
+
+    def _audit(self, features, cascade_preds):
+        """Compare the cascade's ensemble decisions with the full ensemble on this batch."""
+        full = self.combine(self.runner.predict(features))
+        cascade = self.combine(cascade_preds)
+        self.audited_rows += len(full)
+        self.agreeing_rows += int(((np.asarray(full) >= 0.5) == (np.asarray(cascade) >= 0.5)).sum())
+
+    def stats(self):
+        """Return the escalation rate and agreement with the full ensemble so far."""
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "escalated_rows": self.escalated_rows,
+            "escalation_rate": self.escalated_rows / self.rows if self.rows else 0.0,
+            "audited_rows": self.audited_rows,
+            "agreement_with_full_ensemble": self.agreeing_rows / self.audited_rows if self.audited_rows else None
+        }
@@ -0,0 +1,210 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from services.circuit_breaker import CircuitBreaker
+from config import (
+    SUMMARY_BACKEND, SUMMARY_PROMPT_TOKEN_BUDGET, SUMMARY_LLM_URL, SUMMARY_LLM_API_KEY,
+    SUMMARY_LLM_CONNECT_TIMEOUT_SECONDS, SUMMARY_LLM_READ_TIMEOUT_SECONDS,
+    SUMMARY_LLM_MAX_TOKENS, SUMMARY_LLM_POOL_SIZE,
+    SUMMARY_CIRCUIT_FAILURE_THRESHOLD, SUMMARY_CIRCUIT_RESET_SECONDS
+)
+
+# Rough characters-per-token ratio used to keep prompts inside the token budget
+CHARS_PER_TOKEN = 4
+
+class SummarizerError(Exception):
+    """Raised when a summarizer backend cannot produce a summary."""
+
+def estimate_tokens(text):
+    """Estimate the number of LLM tokens in a piece of text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def build_prompt(interval_minutes, aggregates, top_talkers=None, token_budget=SUMMARY_PROMPT_TOKEN_BUDGET):
+    """
+    Build an LLM prompt from pre-aggregated activity that fits in a fixed token budget.
+
+    Sections are added in priority order (counts first, then top IPs/ports, then
+    notable incidents) and each list is cut off with a "... (N more)" marker once
+    the budget runs out, so the prompt size does not grow with traffic volume.
+    """
+    top_talkers = top_talkers or {}
+
+    lines = [
+        "Analyze the following network activity summary and provide a detailed textual summary.",
+        "The summary should include:",
+        "1. An overview of the detected activity.",
+        "2. A breakdown of the types of predictions (e.g., how many 'Benign', 'DDoS', etc.).",
+        "3. A list of the actions taken (e.g., 'Allow', 'Block').",
+        "4. A concluding paragraph that assesses the overall security posture.",
+        "",
+        f"Activity in the last {interval_minutes} minutes: {aggregates.get('total', 0)} packets."
+    ]
+    used = sum(estimate_tokens(line) + 1 for line in lines)
+
+    sections = [
+        ("Predictions", [f"{pred}: {count}" for pred, count in aggregates.get('predictions', {}).items()]),
+        ("Actions", [f"{act}: {count}" for act, count in aggregates.get('actions', {}).items()]),
+        ("Trust levels", [f"{level}: {count}" for level, count in aggregates.get('trust_levels', {}).items()]),
+        ("Top attacking IPs", [f"{t['ip']}: {t['count']}" for t in top_talkers.get('src_ips', [])]),
+        ("Most targeted ports", [f"{t['port']}: {t['count']}" for t in top_talkers.get('ports', [])]),
+        ("Top source IPs", [f"{ip}: {count}" for ip, count in aggregates.get('top_src_ips', [])]),
+        ("Notable incidents", [
+            f"{b['count']} x {b['prediction']} -> {b['action']} ({b['trust_level']})"
+            for b in aggregates.get('breakdown', []) if b['action'] != 'Allow'
+        ])
+    ]
+    # Room kept free for a truncation marker line
+    reserve = estimate_tokens("- ... (999999 more)") + 1
+
+    for title, items in sections:
+        if not items:
+            continue
+        heading = f"{title}:"
+        if used + estimate_tokens(heading) + 1 + reserve > token_budget:
+            break
+        lines.append(heading)
+        used += estimate_tokens(heading) + 1
+        for i, item in enumerate(items):
+            line = f"- {item}"
+            cost = estimate_tokens(line) + 1
+            if used + cost + reserve > token_budget:
+                lines.append(f"- ... ({len(items) - i} more)")
+                used += reserve
+                break
+            lines.append(line)
+            used += cost
+
+    return "\n".join(lines)
+
+class Summarizer:
+    """Interface for summary backends."""
+
+    def summarize(self, prompt, context):
+        """
+        Produce a summary.
+
+        Args:
+            prompt (str): Token-budgeted prompt built by build_prompt.
+            context (dict): interval_minutes, aggregates and top_talkers the prompt was built from.
+
+        Returns:
+            str: The summary text.
+        """
+        raise NotImplementedError
+
+class TemplateSummarizer(Summarizer):
+    """Offline backend that renders a fixed-format report from the aggregates."""
+
+    def summarize(self, prompt, context):
+        interval_minutes = context['interval_minutes']
+        aggregates = context['aggregates']
+        top_talkers = context.get('top_talkers') or {}
+        prediction_counts = aggregates.get('predictions', {})
+        action_counts = aggregates.get('actions', {})
+        top_src_ips = aggregates.get('top_src_ips', [])
+        top_attackers = top_talkers.get('src_ips', [])
+        top_ports = top_talkers.get('ports', [])
+
+        llm_summary = "Detailed Network Activity Report\n\n"
+        llm_summary += "Overview:\n"
+        llm_summary += f"The system has processed {aggregates['total']} packets in the last {interval_minutes} minutes. "
+        llm_summary += "The activity includes a mix of benign and potentially malicious traffic, with corresponding actions taken by the system.\n\n"
+        llm_summary += "Prediction Breakdown:\n"
+        for pred, count in prediction_counts.items():
+            llm_summary += f"- {pred}: {count}\n"
+        llm_summary += "\nActions Taken:\n"
+        for act, count in action_counts.items():
+            llm_summary += f"- {act}: {count}\n"
+        if top_src_ips:
+            llm_summary += "\nTop Source IPs:\n"
+            for ip, count in top_src_ips:
+                llm_summary += f"- {ip}: {count}\n"
+        if top_attackers:
+            llm_summary += "\nTop Attacking IPs (by malicious packets):\n"
+            for talker in top_attackers:
+                llm_summary += f"- {talker['ip']}: {talker['count']}\n"
+        if top_ports:
+            llm_summary += "\nMost Targeted Ports:\n"
+            for talker in top_ports:
+                llm_summary += f"- {talker['port']}: {talker['count']}\n"
+        llm_summary += "\nConclusion:\n"
+        if action_counts.get('Block') or action_counts.get('Temporary Block'):
+            llm_summary += "The system has actively mitigated potential threats by blocking suspicious IP addresses. This indicates that the automated incident response is functioning as expected. However, the presence of malicious traffic warrants continued monitoring."
+        else:
+            llm_summary += "The network activity appears to be normal, with no major threats detected. The system is monitoring the traffic, and all connections have been allowed. The security posture is currently stable."
+
+        return llm_summary
+
+class HTTPSummarizer(Summarizer):
+    """
+    Backend that posts the prompt to an LLM server over a pooled keep-alive session.
+
+    Every call is bounded by connect/read timeouts, and a circuit breaker
+    skips the server entirely while it keeps failing.
+    """
+
+    def __init__(self, url, timeout, max_tokens, pool_size, breaker, api_key=None):
+        self.url = url
+        self.timeout = timeout
+        self.max_tokens = max_tokens
+        self.breaker = breaker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def summarize(self, prompt, context):
+        if not self.breaker.allow():
+            raise SummarizerError("LLM circuit is open; skipping call.")
+        try:
+            response = self.session.post(
+                self.url,
+                json={"prompt": prompt, "max_tokens": self.max_tokens},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            body = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.breaker.record_failure()
+            raise SummarizerError(f"Error calling LLM API: {e}") from e
+
+        llm_summary = body.get("summary") if isinstance(body, dict) else None
+        if not isinstance(llm_summary, str) or not llm_summary:
+            # Also ends a half-open trial call, so the circuit cannot stay half-open
+            self.breaker.record_failure()
+            raise SummarizerError(f"LLM API returned no summary: {str(body)[:200]}")
+        self.breaker.record_success()
+        return llm_summary
+
+def _create_http_summarizer():
+    return HTTPSummarizer(
+        SUMMARY_LLM_URL,
+        timeout=(SUMMARY_LLM_CONNECT_TIMEOUT_SECONDS, SUMMARY_LLM_READ_TIMEOUT_SECONDS),
+        max_tokens=SUMMARY_LLM_MAX_TOKENS,
+        pool_size=SUMMARY_LLM_POOL_SIZE,
+        breaker=CircuitBreaker(SUMMARY_CIRCUIT_FAILURE_THRESHOLD, SUMMARY_CIRCUIT_RESET_SECONDS),
+        api_key=SUMMARY_LLM_API_KEY
+    )
+
+# Backend factories by name; register_summarizer adds new ones
+_factories = {"template": TemplateSummarizer, "http": _create_http_summarizer}
+_instances = {}
+_instances_lock = threading.Lock()
+
+def register_summarizer(name, factory):
+    """Register a summarizer backend factory under a name usable in SUMMARY_BACKEND."""
+    with _instances_lock:
+        _factories[name] = factory
+        _instances.pop(name, None)
+
+def get_summarizer(name=None):
+    """Return the (shared) summarizer instance for a backend name, defaulting to SUMMARY_BACKEND."""
+    name = name or SUMMARY_BACKEND
+    with _instances_lock:
+        if name not in _instances:
+            if name not in _factories:
+                raise ValueError(f"Unknown summary backend '{name}'. Available: {', '.join(_factories)}.")
+            _instances[name] = _factories[name]()
+        return _instances[name]
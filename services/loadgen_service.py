@@ -0,0 +1,212 @@
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+
+PACING_MODES = ('constant', 'poisson')
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram (about 1% relative precision).
+
+    Memory is fixed by the latency range, not the number of samples, so
+    long, high-rate runs can record every request.
+    """
+
+    def __init__(self, precision=0.01):
+        self._log_base = math.log1p(precision)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        bucket = int(math.log(max(seconds, 1e-6) * 1e6) / self._log_base)
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, p):
+        """Return the latency (seconds) at percentile p (0-100), or None without samples."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(self.count * p / 100))
+            seen = 0
+            for bucket in sorted(self._buckets):
+                seen += self._buckets[bucket]
+                if seen >= rank:
+                    # Upper edge of the bucket, capped by the largest sample
+                    return min(math.exp((bucket + 1) * self._log_base) / 1e6, self.max)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * self.total / self.count if self.count else None,
+            **{f"p{label}_ms": None if value is None else 1000 * value
+               for label, value in (("50", self.percentile(50)), ("90", self.percentile(90)),
+                                    ("99", self.percentile(99)), ("999", self.percentile(99.9)))},
+            "max_ms": 1000 * self.max if self.count else None
+        }
+
+def rate_profile(rate, ramp_to=None, ramp_seconds=0):
+    """
+    Return rate(t): requests/second at t seconds into the run.
+
+    With `ramp_to` the rate moves linearly from `rate` to `ramp_to` over
+    `ramp_seconds`, then stays there.
+    """
+    if ramp_to is None or ramp_seconds <= 0:
+        return lambda t: rate
+    return lambda t: rate + (ramp_to - rate) * min(t / ramp_seconds, 1.0)
+
+def arrival_times(profile, duration, pacing='constant', seed=None):
+    """
+    Yield intended send offsets (seconds from start) for an open-loop run.
+
+    'constant' spaces requests 1/rate apart; 'poisson' draws exponential
+    gaps with the same mean, as independent clients would produce.
+    """
+    if pacing not in PACING_MODES:
+        raise ValueError(f"Unknown pacing '{pacing}'. Use one of: {', '.join(PACING_MODES)}.")
+    rng = random.Random(seed)
+    t = 0.0
+    while True:
+        rate = profile(t)
+        if rate <= 0:
+            t += 0.01
+        else:
+            t += rng.expovariate(rate) if pacing == 'poisson' else 1.0 / rate
+        if t >= duration:
+            return
+        yield t
+
+class LoadGenerator:
+    """
+    Open-loop HTTP load generator for the dashboard's /api/ingest endpoint.
+
+    Requests are sent on a fixed schedule (constant or Poisson pacing, with
+    an optional ramp) regardless of how fast the server answers, by a pool
+    of `concurrency` threads that each keep one keep-alive session. Latency
+    is measured from each request's scheduled send time, so server stalls
+    show up as queueing delay instead of silently lowering the offered load.
+    Requests that would exceed `max_in_flight` outstanding ones are counted
+    as dropped rather than queued without bound.
+    """
+
+    def __init__(self, url, payloads, concurrency=32, timeout=5, max_in_flight=None):
+        self.url = url
+        self.payloads = payloads
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight or 4 * concurrency
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        return session
+
+    def run(self, rate, duration, pacing='constant', ramp_to=None, ramp_seconds=0, seed=None):
+        """
+        Drive the endpoint for `duration` seconds and return a report.
+
+        Returns:
+            dict: Offered and achieved throughput, outcome counts and latency percentiles.
+        """
+        histogram = LatencyHistogram()
+        counts = {"sent": 0, "ok": 0, "errors": 0, "dropped": 0}
+        status_codes = {}
+        lock = threading.Lock()
+        in_flight = threading.BoundedSemaphore(self.max_in_flight)
+
+        def send(payload, scheduled):
+            try:
+                response = self._session().post(self.url, json=payload, timeout=self.timeout)
+                outcome = "ok" if response.status_code < 400 else "errors"
+                code = response.status_code
+            except requests.RequestException as e:
+                outcome, code = "errors", type(e).__name__
+            finally:
+                in_flight.release()
+            histogram.record(time.perf_counter() - scheduled)
+            with lock:
+                counts[outcome] += 1
+                status_codes[code] = status_codes.get(code, 0) + 1
+
+        profile = rate_profile(rate, ramp_to, ramp_seconds)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='loadgen')
+        started = time.perf_counter()
+        try:
+            for offset in arrival_times(profile, duration, pacing, seed):
+                scheduled = started + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if not in_flight.acquire(blocking=False):
+                    counts["dropped"] += 1
+                    continue
+                counts["sent"] += 1
+                executor.submit(send, next(self.payloads), scheduled)
+        finally:
+            executor.shutdown(wait=True)
+        elapsed = time.perf_counter() - started
+
+        return {
+            "url": self.url,
+            "pacing": pacing,
+            "duration_seconds": elapsed,
+            "offered_rps": (counts["sent"] + counts["dropped"]) / duration,
+            "achieved_rps": counts["ok"] / elapsed,
+            **counts,
+            "status_codes": status_codes,
+            "latency": histogram.summary()
+        }
+
+def print_report(report):
+    """Print a load test report."""
+    latency = report["latency"]
+    print(f"📊 {report['pacing']} load on {report['url']} for {report['duration_seconds']:.1f}s")
+    print(f"   Offered {report['offered_rps']:.0f} req/s, achieved {report['achieved_rps']:.0f} req/s")
+    print(f"   Sent {report['sent']}, ok {report['ok']}, errors {report['errors']}, dropped {report['dropped']}")
+    if latency["count"]:
+        print(f"   Latency ms: p50 {latency['p50_ms']:.2f}, p90 {latency['p90_ms']:.2f}, "
+              f"p99 {latency['p99_ms']:.2f}, p999 {latency['p999_ms']:.2f}, max {latency['max_ms']:.2f}")
+    if report["errors"]:
+        print(f"   Status codes: {report['status_codes']}")
+
+def cycle_payloads(make_payloads):
+    """Yield payloads from make_payloads() forever, restarting it whenever it is exhausted."""
+    while True:
+        empty = True
+        for payload in make_payloads():
+            empty = False
+            yield payload
+        if empty:
+            raise ValueError("The payload source is empty.")
+
+def synthetic_payloads(attack_types, n_ips=1000, seed=None):
+    """Yield random ingest payloads, for load tests without replay files."""
+    rng = random.Random(seed)
+    while True:
+        attack_type = rng.choice(attack_types)
+        ip = rng.randrange(n_ips)
+        yield {
+            "packet_data": {
+                "src_ip": f"172.16.{ip // 256}.{ip % 256}",
+                "dst_ip": "10.0.0.1",
+                "port": rng.choice([22, 80, 443, 3389, 8080]),
+                "attack_type": attack_type,
+                "confidence_score": rng.uniform(1, 20) if attack_type == "Normal" else rng.uniform(60, 100)
+            },
+            "prediction_data": {"source": "loadgen"}
+        }
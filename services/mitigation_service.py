@@ -1,6 +1,6 @@
 import time
 from services.zerotrust_service import calculate_trust_score, get_trust_level
-from services import database_service
+from services import database_service, talker_service
 from config import (
     ALERT_DURATION_SECONDS, INITIAL_REPUTATION_SCORE,
     REPUTATION_MANUAL_UNBLOCK_RESET_SCORE,
@@ -27,6 +27,10 @@ def process_packet(packet_data, prediction_data):
     packet_trust_score = calculate_trust_score(attack_type, confidence)
     trust_level = get_trust_level(packet_trust_score)
 
+    # Track heavy hitters among malicious traffic in fixed-size sketches
+    if attack_type != 'Normal':
+        talker_service.record_malicious(src_ip, packet_data.get('port'))
+
     # --- Determine action based purely on the packet's trust score ---
     if packet_trust_score <= TRUST_SCORE_THRESHOLD_BLOCK:
         action = "Block"
@@ -50,7 +54,8 @@ def process_packet(packet_data, prediction_data):
         "trust_level": trust_level,
         "ip_reputation": "N/A", # Reputation is no longer a factor
         "action": action,
-        "details": packet_data
+        "details": packet_data,
+        "ingested_at": time.time()
     }
 
 def unblock_ip(ip_to_unblock):
@@ -70,12 +75,33 @@ def unblock_ip(ip_to_unblock):
     else:
         return {"error": "No IP address provided for unblocking."}
 
-def get_blocked_ips():
-    """Return the list of currently permanently blocked IP addresses."""
-    return {"blocked_ips": database_service.get_blocked_ips()}
+def get_blocked_ips(since=None):
+    """
+    Return the list of currently permanently blocked IP addresses.
+
+    If `since` is given, only the IPs added or removed after that blocklist
+    version are returned instead of the full list.
+    """
+    # Read the version first so a concurrent change is re-sent on the next poll, never lost
+    version = database_service.get_state_version(database_service.BLOCKED_LIST)
+    if since is None:
+        return {"version": version, "blocked_ips": database_service.get_blocked_ips()}
+
+    changes = database_service.get_state_changes(database_service.BLOCKED_LIST, since)
+    return {
+        "version": version,
+        "since": since,
+        "added": [change['ip'] for change in changes if change['op'] == 'added'],
+        "removed": [change['ip'] for change in changes if change['op'] == 'removed']
+    }
+
+def get_alerts(since=None):
+    """
+    Return the list of IPs in the alert state with remaining time.
 
-def get_alerts():
-    """Return the list of IPs in the alert state with remaining time."""
+    If `since` is given, only the alerts added, changed or removed after that
+    alert version are returned instead of the full list.
+    """
     # This function can remain as is, as it's a good way to manage temporary blocks
     # First, remove any expired alerts from the database
     current_time = time.time()
@@ -85,13 +111,30 @@ def get_alerts():
             database_service.remove_alerted_ip(alert['ip'])
             print(f"✅ IP {alert['ip']} automatically unblocked from alerts.")
 
+    version = database_service.get_state_version(database_service.ALERTED_LIST)
+    if since is not None:
+        changes = database_service.get_state_changes(database_service.ALERTED_LIST, since)
+        return {
+            "version": version,
+            "since": since,
+            "changed": [
+                _format_alert(change, current_time) for change in changes if change['op'] == 'changed'
+            ],
+            "removed": [change['ip'] for change in changes if change['op'] == 'removed']
+        }
+
     # Then, fetch the remaining alerts
     remaining_alerts = database_service.get_alerted_ips()
-    formatted_alerts = [
-        {"ip": alert['ip'], "remaining_time": alert['unblock_time'] - current_time}
-        for alert in remaining_alerts
-    ]
-    return {"alerts": formatted_alerts}
+    formatted_alerts = [_format_alert(alert, current_time) for alert in remaining_alerts]
+    return {"version": version, "alerts": formatted_alerts}
+
+def _format_alert(alert, current_time):
+    """Format an alert row for the API, keeping the absolute unblock time for cached clients."""
+    return {
+        "ip": alert['ip'],
+        "remaining_time": alert['unblock_time'] - current_time,
+        "unblock_time": alert['unblock_time']
+    }
 
 def clear_all_blocks():
     """Clear all permanently blocked IPs and all temporarily alerted IPs."""
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+import joblib
+from config import MODEL_PATHS, MODEL_MMAP_MODE
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _current_rss_bytes():
+    """Return the resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+class ModelRegistry:
+    """
+    Loads model artifacts on first use and keeps one shared instance per name.
+
+    Artifacts are opened with joblib.load(mmap_mode=...), so the large NumPy
+    arrays inside joblib-dumped models are memory-mapped from disk instead of
+    copied onto the heap; worker processes loading the same file share those
+    pages through the OS page cache. Load time and the growth in resident
+    memory caused by each load are recorded for reporting.
+    """
+
+    def __init__(self, paths, mmap_mode=MODEL_MMAP_MODE):
+        self.paths = dict(paths)
+        self.mmap_mode = mmap_mode
+        self._models = {}
+        self._stats = {}
+        # Loads are serialised so the resident-size delta belongs to a single model
+        self._lock = threading.Lock()
+
+    def resolve_path(self, name):
+        if name not in self.paths:
+            raise KeyError(f"Unknown model '{name}'. Registered: {', '.join(sorted(self.paths))}.")
+        path = self.paths[name]
+        return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+    def get(self, name):
+        """Return the model registered under `name`, loading it on first use."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            if name not in self._models:
+                self._load(name)
+            return self._models[name]
+
+    def _load(self, name):
+        path = self.resolve_path(name)
+        rss_before = _current_rss_bytes()
+        started = time.perf_counter()
+        model = joblib.load(path, mmap_mode=self.mmap_mode)
+        load_seconds = time.perf_counter() - started
+        rss_after = _current_rss_bytes()
+
+        file_stat = os.stat(path)
+        self._models[name] = model
+        self._stats[name] = {
+            "path": path,
+            "file_bytes": file_stat.st_size,
+            "file_mtime_ns": file_stat.st_mtime_ns,
+            "load_seconds": load_seconds,
+            "resident_bytes": None if rss_before is None else rss_after - rss_before
+        }
+        print(f"✅ Model '{name}' loaded in {load_seconds * 1000:.1f} ms.")
+
+    def preload(self, names=None):
+        """Load the given models (all registered ones by default) ahead of first use."""
+        for name in names or self.paths:
+            self.get(name)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def stats(self):
+        """Return load time and resident size for every registered model."""
+        return {
+            name: {"loaded": name in self._models, **self._stats.get(name, {"path": self.resolve_path(name)})}
+            for name in self.paths
+        }
+
+    def version(self, names=None):
+        """
+        Return a fingerprint of the loaded artifacts (path, size and modification time at load).
+
+        Models whose file changed on disk since they were loaded are reloaded
+        first, and models not loaded yet are loaded, so the fingerprint always
+        describes the models get() returns: caches of model outputs keyed by
+        it are invalidated exactly when the models change. The value is a
+        BLAKE2b digest, so it is the same in every process.
+        """
+        names = sorted(self.paths) if names is None else names
+        for name in names:
+            self.refresh(name)
+        with self._lock:
+            fingerprint = tuple(
+                (name, *(self._stats[name][key] for key in ("path", "file_bytes", "file_mtime_ns")))
+                for name in names
+            )
+        return hashlib.blake2b(repr(fingerprint).encode('utf-8'), digest_size=16).hexdigest()
+
+    def refresh(self, name):
+        """Load a model, or reload it when its file changed since it was loaded."""
+        path = self.resolve_path(name)
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is not None:
+                try:
+                    file_stat = os.stat(path)
+                except OSError:
+                    # Keep serving the loaded model while its file is being replaced
+                    return
+                if (file_stat.st_size, file_stat.st_mtime_ns) == (stat["file_bytes"], stat["file_mtime_ns"]):
+                    return
+                print(f"🔄 Model '{name}' changed on disk, reloading.")
+            self._load(name)
+
+    def unload(self, name):
+        """Forget a loaded model so the next get() reloads it from disk."""
+        with self._lock:
+            self._models.pop(name, None)
+            self._stats.pop(name, None)
+
+# Process-wide registry of the repository's model artifacts
+registry = ModelRegistry(MODEL_PATHS)
+
+def load_model(name):
+    """Return a model from the shared registry (a picklable loader for worker processes)."""
+    return registry.get(name)
+
+def report(names=None):
+    """Load the given models and print their load time and resident size."""
+    registry.preload(names)
+    print(f"{'Model':<22} | {'Load (ms)':>9} | {'Resident (MB)':>13} | {'File (MB)':>9}")
+    print("-" * 62)
+    for name, stat in registry.stats().items():
+        if not stat["loaded"]:
+            continue
+        resident = stat["resident_bytes"]
+        resident_mb = "n/a" if resident is None else f"{resident / 2**20:.1f}"
+        print(f"{name:<22} | {stat['load_seconds'] * 1000:>9.1f} | {resident_mb:>13} | {stat['file_bytes'] / 2**20:>9.1f}")
+
+if __name__ == '__main__':
+    report(sys.argv[1:] or None)
@@ -0,0 +1,99 @@
+import hashlib
+import threading
+import numpy as np
+from services.cache_service import LRUCache
+from config import PREDICTION_CACHE_SIZE, PREDICTION_CACHE_QUANTUM
+
+_MISSING = object()
+
+class PredictionCache:
+    """
+    Bounded LRU cache of ensemble scores keyed by quantized feature vectors.
+
+    Each row of the (already scaled) feature matrix is rounded to a multiple
+    of `quantum` and hashed, so repeated flows map to the same key. Only
+    rows whose key is not cached are sent to the models, once per distinct
+    key in the batch; the rest reuse the stored scores. Passing a different
+    `model_version` drops every entry, so stale scores are never served
+    after the models change. Rows that cannot be quantized to a 64-bit
+    key (NaN, infinite or huge values) are always scored and never cached.
+    """
+
+    def __init__(self, maxsize=PREDICTION_CACHE_SIZE, quantum=PREDICTION_CACHE_QUANTUM):
+        self.quantum = quantum
+        self.model_version = None
+        self.rows = 0
+        self.inferred_rows = 0
+        self._cache = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def keys(self, features):
+        """Return one hash key per row of the quantized feature matrix (None for rows that cannot be cached)."""
+        with np.errstate(invalid='ignore', over='ignore'):
+            scaled = np.rint(np.asarray(features, dtype=np.float64) / self.quantum)
+            cacheable = (np.abs(scaled) < 2.0 ** 62).all(axis=1)
+        quantized = np.ascontiguousarray(np.where(cacheable[:, None], scaled, 0), dtype=np.int64)
+        return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() if ok else None
+                for row, ok in zip(quantized, cacheable.tolist())]
+
+    def predict(self, features, predict_fn, model_version=None):
+        """
+        Return predict_fn's output for every row, running it only on uncached rows.
+
+        Args:
+            features (array-like): Scaled feature matrix, one row per flow.
+            predict_fn (callable): Scores a feature matrix; returns an array
+                with one entry per row or a dict of such arrays.
+            model_version: Fingerprint of the models behind predict_fn.
+
+        Returns:
+            The same structure predict_fn returns, for all rows.
+        """
+        features = np.asarray(features)
+        with self._lock:
+            if model_version != self.model_version:
+                self._cache.clear()
+                self.model_version = model_version
+
+        results = [None] * len(features)
+        missing = {}  # key -> rows sharing it
+        for i, key in enumerate(self.keys(features)):
+            if key is None:
+                missing[i] = [i]  # Scored on its own and not stored
+                continue
+            value = self._cache.get(key, _MISSING)
+            if value is _MISSING:
+                missing.setdefault(key, []).append(i)
+            else:
+                results[i] = value
+
+        computed = None
+        if missing:
+            computed = predict_fn(features[[rows[0] for rows in missing.values()]])
+            for j, (key, rows) in enumerate(missing.items()):
+                value = {name: values[j] for name, values in computed.items()} if isinstance(computed, dict) else computed[j]
+                if not isinstance(key, int):
+                    self._cache.put(key, value)
+                for i in rows:
+                    results[i] = value
+
+        with self._lock:
+            self.rows += len(features)
+            self.inferred_rows += len(missing)
+
+        if isinstance(computed, dict) or (computed is None and results and isinstance(results[0], dict)):
+            return {name: np.array([value[name] for value in results]) for name in results[0]}
+        return np.array(results)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        """Return cache size, lookup hit rate and the share of rows that skipped inference."""
+        with self._lock:
+            return {
+                **self._cache.stats(),
+                "rows": self.rows,
+                "inferred_rows": self.inferred_rows,
+                "inference_skip_rate": 1 - self.inferred_rows / self.rows if self.rows else 0.0
+            }
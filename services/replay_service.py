@@ -0,0 +1,114 @@
+import math
+import threading
+import time
+from datetime import datetime
+import pandas as pd
+from config import REPLAY_CHUNK_ROWS
+
+def iter_chunks(path, chunk_rows=REPLAY_CHUNK_ROWS):
+    """Yield a CSV file as DataFrames of at most `chunk_rows` rows, parsing lazily."""
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        yield from reader
+
+def iter_records(chunks):
+    """Yield every row of a stream of DataFrames as a dict of native Python values."""
+    for chunk in chunks:
+        # One vectorized conversion per chunk instead of a Series and .item() calls per row
+        yield from chunk.to_dict('records')
+
+def iter_payloads(packet_path, prediction_path, chunk_rows=REPLAY_CHUNK_ROWS):
+    """
+    Stream the packet and prediction files side by side as simulator payloads.
+
+    Both files are read in aligned chunks, so memory use depends on
+    `chunk_rows`, not on the file sizes. The stream ends with the shorter
+    file; closing the generator closes both files.
+
+    Yields:
+        dict: {"packet_data": ..., "prediction_data": ...} for each row.
+    """
+    packets = iter_records(iter_chunks(packet_path, chunk_rows))
+    predictions = iter_records(iter_chunks(prediction_path, chunk_rows))
+    try:
+        for packet_data, prediction_data in zip(packets, predictions):
+            yield {"packet_data": packet_data, "prediction_data": prediction_data}
+    finally:
+        packets.close()
+        predictions.close()
+
+def parse_speed(value):
+    """
+    Parse a replay speed factor: a positive number (1 = real time, 10 = ten
+    times faster) or 'max' / None for no waiting at all.
+
+    Raises:
+        ValueError: If the value is not a positive number or 'max'.
+    """
+    if value is None or (isinstance(value, str) and value.strip().lower() == 'max'):
+        return None
+    speed = float(str(value).strip().lower().rstrip('x'))
+    if not math.isfinite(speed) or speed <= 0:
+        raise ValueError(f"Replay speed must be a positive number or 'max', got {value!r}.")
+    return speed
+
+def to_seconds(timestamp):
+    """Return a packet timestamp (epoch number or ISO 8601 string) as epoch seconds, or None if it cannot be parsed."""
+    if isinstance(timestamp, (int, float)):
+        return None if isinstance(timestamp, bool) or math.isnan(timestamp) else float(timestamp)
+    try:
+        return datetime.fromisoformat(str(timestamp).strip()).timestamp()
+    except ValueError:
+        return None
+
+class ReplayScheduler:
+    """
+    Releases payloads at their recorded inter-arrival times, divided by `speed`.
+
+    Each payload's due time is computed from the first payload's timestamp
+    and the monotonic clock at the start of the replay, never from the
+    previous sleep, so oversleeping and slow consumers do not accumulate
+    drift: a replay that falls behind releases the overdue payloads back to
+    back until it is on schedule again, reproducing bursts rather than
+    smoothing them out. Payloads without a parsable timestamp, or whose
+    timestamp goes backwards, are released immediately.
+
+    With `speed=None` nothing waits and payloads are released as fast as
+    they are consumed. Setting `stop` (a threading.Event) ends the replay,
+    interrupting any wait.
+    """
+
+    def __init__(self, speed=1.0, stop=None, timestamp_key='timestamp'):
+        self.speed = speed
+        self.stop = stop or threading.Event()
+        self.timestamp_key = timestamp_key
+        self.released = 0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    def replay(self, payloads):
+        """Yield payloads ({"packet_data": ...} dicts) as they become due."""
+        start = None  # (first timestamp, monotonic time it was released)
+        for payload in payloads:
+            if self.stop.is_set():
+                return
+            if self.speed is not None:
+                timestamp = to_seconds(payload["packet_data"].get(self.timestamp_key))
+                if timestamp is not None:
+                    if start is None:
+                        start = (timestamp, time.monotonic())
+                    due = start[1] + (timestamp - start[0]) / self.speed
+                    delay = due - time.monotonic()
+                    if delay > 0 and self.stop.wait(delay):
+                        return
+                    lag = max(time.monotonic() - due, 0.0)
+                    self.max_lag = max(self.max_lag, lag)
+                    self.total_lag += lag
+            self.released += 1
+            yield payload
+
+    def stats(self):
+        return {
+            "released": self.released,
+            "mean_lag_ms": 1000 * self.total_lag / self.released if self.released else 0.0,
+            "max_lag_ms": 1000 * self.max_lag
+        }
@@ -0,0 +1,266 @@
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import pandas as pd
+from services.batch_mitigation_service import IPStateTracker, plan_mitigation, merge_plans
+from config import CONTROLLER_IP_STATE_SIZE, CONTROLLER_IP_SCORE_DECAY
+
+# How often a waiting coordinator checks that a silent worker is still alive
+_POLL_SECONDS = 0.5
+
+def partition_by_ip(src_ips, n_shards):
+    """
+    Return the shard index of every row, hashing the source IP.
+
+    The hash is stable across processes and runs (unlike Python's hash()),
+    so an IP always lands on the same worker.
+    """
+    hashes = pd.util.hash_array(np.asarray(src_ips, dtype=object))
+    return (hashes % np.uint64(n_shards)).astype(np.int64)
+
+def _pack(df, rows):
+    """
+    Copy the numeric columns of df.iloc[rows] into a new shared-memory buffer.
+
+    Returns:
+        tuple: (buffer, layout of (name, dtype, offset) per packed column,
+        remaining columns as arrays, original column order, row index).
+    """
+    packed = [name for name in df.columns
+              if isinstance(df[name].dtype, np.dtype) and df[name].dtype.kind in 'biufc']
+    layout, size = [], 0
+    for name in packed:
+        dtype = df[name].dtype
+        layout.append((name, dtype.str, size))
+        # Keep every column 8-byte aligned
+        size += -(-len(rows) * dtype.itemsize // 8) * 8
+    buffer = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for name, dtype, offset in layout:
+        view = np.ndarray(len(rows), dtype=dtype, buffer=buffer.buf, offset=offset)
+        np.take(df[name].to_numpy(), rows, out=view)
+        del view
+    other = {name: df[name].to_numpy()[rows] for name in df.columns if name not in set(packed)}
+    return buffer, layout, other, list(df.columns), df.index[rows]
+
+def _unpack(shm_name, n_rows, layout, other, columns, index):
+    """Rebuild a shard DataFrame with the coordinator's column order, dtypes and index."""
+    attached = shared_memory.SharedMemory(name=shm_name)
+    try:
+        data = {name: np.ndarray(n_rows, dtype=dtype, buffer=attached.buf, offset=offset).copy()
+                for name, dtype, offset in layout}
+    finally:
+        attached.close()
+    data.update(other)
+    return pd.DataFrame({name: data[name] for name in columns}, index=index, columns=columns)
+
+def _shard_worker(shard_id, score_fn, inbox, outbox, state_size, decay):
+    """
+    Worker process: scores the rows of its shard and plans mitigation for them.
+
+    Numeric columns arrive in a shared-memory buffer created by the
+    coordinator for this batch; they are copied out before scoring. The
+    worker keeps the per-IP state of the IPs its shard owns.
+    """
+    ip_state = IPStateTracker(state_size, decay)
+    while True:
+        task = inbox.get()
+        if task is None:
+            break
+        batch_id, shm_name, n_rows, layout, other, columns, index = task
+        try:
+            df = _unpack(shm_name, n_rows, layout, other, columns, index)
+            scores = score_fn(df)
+            outbox.put((batch_id, shard_id, ip_state.plan(df["src_ip"].to_numpy(), scores), None))
+        except Exception as e:
+            outbox.put((batch_id, shard_id, None, repr(e)))
+
+class ShardedController:
+    """
+    Runs the scoring and mitigation-planning stages on N worker processes.
+
+    Rows are hash-partitioned by src_ip, so each worker sees every row of
+    the IPs it owns and keeps their per-IP state (see IPStateTracker). For
+    every batch the coordinator copies each shard's numeric columns into a
+    new shared-memory buffer and sends only the remaining columns, such as
+    src_ip, through the shard's task queue; workers rebuild the shard with
+    the batch's column order, dtypes and index, so score_fn sees the same
+    frame as in the serial controller. The workers' mitigation plans are
+    merged into one plan that the coordinator applies.
+
+    A worker that has died, or that does not answer within
+    `result_timeout`, is terminated and replaced by a new process with new
+    queues, so later batches neither wait on it nor queue behind the tasks
+    it abandoned; the IP state of that shard starts over. Each batch's
+    buffers are unlinked once the batch is done.
+
+    `score_fn(df)` must be a picklable, module-level function returning one
+    zero-trust score per row of the shard DataFrame.
+    """
+
+    def __init__(self, score_fn, n_workers, result_timeout=None, state_size=CONTROLLER_IP_STATE_SIZE,
+                 decay=CONTROLLER_IP_SCORE_DECAY):
+        self.score_fn = score_fn
+        self.n_workers = n_workers
+        self.result_timeout = result_timeout
+        self.state_size = state_size
+        self.decay = decay
+        self.restarts = 0
+        self._batch_id = 0
+        # Start the resource tracker first so the workers share it instead of each
+        # starting their own, which would unlink the coordinator's buffers on exit
+        resource_tracker.ensure_running()
+        self._context = mp.get_context()
+        self._shards = [self._start(shard) for shard in range(n_workers)]
+
+    def _start(self, shard):
+        """Start a shard's worker process; returns (process, inbox, outbox)."""
+        inbox, outbox = self._context.Queue(), self._context.Queue()
+        process = self._context.Process(
+            target=_shard_worker, args=(shard, self.score_fn, inbox, outbox, self.state_size, self.decay),
+            name=f'controller-shard-{shard}', daemon=True
+        )
+        process.start()
+        return process, inbox, outbox
+
+    def _restart(self, shard, reason):
+        """Replace a dead or stuck worker with a new process and new queues."""
+        print(f"⚠️ Restarting controller shard {shard} ({reason}); its per-IP state starts over.")
+        process, inbox, outbox = self._shards[shard]
+        process.terminate()
+        process.join(timeout=5)
+        for q in (inbox, outbox):
+            # Abandoned tasks must not keep this process from exiting
+            q.cancel_join_thread()
+            q.close()
+        self._shards[shard] = self._start(shard)
+        self.restarts += 1
+
+    def _receive(self, shard, batch_id, deadline):
+        """
+        Wait for a shard's reply to the batch.
+
+        Returns:
+            tuple: (plan, error, failure): the error raised by score_fn, or
+            why the worker itself must be replaced (it died or went silent).
+        """
+        process, _, outbox = self._shards[shard]
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            try:
+                reply_batch, _, plan, error = outbox.get(
+                    timeout=_POLL_SECONDS if remaining is None else max(min(remaining, _POLL_SECONDS), 0)
+                )
+            except queue.Empty:
+                if not process.is_alive():
+                    return None, None, f"exited with code {process.exitcode}"
+                if remaining is not None and remaining <= 0:
+                    return None, None, f"did not answer within {self.result_timeout}s"
+                continue
+            if reply_batch == batch_id:
+                return plan, error, None
+
+    def process(self, df):
+        """
+        Score a batch across the shards and return the merged mitigation plan.
+
+        Raises:
+            RuntimeError: If a worker fails, dies or does not answer in time.
+        """
+        for shard, (process, _, _) in enumerate(self._shards):
+            if not process.is_alive():
+                self._restart(shard, f"exited with code {process.exitcode}")
+
+        self._batch_id += 1
+        batch_id = self._batch_id
+        shards = partition_by_ip(df["src_ip"].to_numpy(), self.n_workers)
+        order = np.argsort(shards, kind='stable')
+        bounds = np.searchsorted(shards[order], np.arange(self.n_workers + 1))
+
+        buffers = []
+        plans, errors = [], []
+        try:
+            submitted = []
+            for shard in range(self.n_workers):
+                rows = order[bounds[shard]:bounds[shard + 1]]
+                if len(rows) == 0:
+                    continue
+                buffer, layout, other, columns, index = _pack(df, rows)
+                buffers.append(buffer)
+                self._shards[shard][1].put((batch_id, buffer.name, len(rows), layout, other, columns, index))
+                submitted.append(shard)
+
+            deadline = None if self.result_timeout is None else time.monotonic() + self.result_timeout
+            for shard in submitted:
+                plan, error, failure = self._receive(shard, batch_id, deadline)
+                if failure is not None:
+                    self._restart(shard, failure)
+                    errors.append(f"shard {shard} {failure}")
+                elif error is not None:
+                    errors.append(f"shard {shard}: {error}")
+                else:
+                    plans.append(plan)
+        finally:
+            # Restarted workers were terminated, so no worker still reads these
+            for buffer in buffers:
+                buffer.close()
+                buffer.unlink()
+        if errors:
+            raise RuntimeError("Controller shard failed: " + "; ".join(errors))
+        return merge_plans(plans)
+
+    def close(self):
+        """Stop the workers."""
+        for _, inbox, _ in self._shards:
+            inbox.put(None)
+        for process, _, _ in self._shards:
+            process.join(timeout=5)
+
+def synthetic_traffic(rows, n_features=32, n_ips=5000, seed=0):
+    """Build a DataFrame of random flows with Zipf-distributed source IPs for benchmarking."""
+    rng = np.random.default_rng(seed)
+    ip_ids = np.minimum(rng.zipf(1.3, rows), n_ips) - 1
+    df = pd.DataFrame(rng.random((rows, n_features)), columns=[f"f{i}" for i in range(n_features)])
+    df["src_ip"] = np.array([f"10.{i // 65536}.{i // 256 % 256}.{i % 256}" for i in range(n_ips)], dtype=object)[ip_ids]
+    return df
+
+def benchmark_score(df):
+    """CPU-bound stand-in for the preprocessing, ensemble and zero-trust stages."""
+    X = df.drop(columns=["src_ip"]).to_numpy()
+    score = np.zeros(len(X))
+    for i in range(20):
+        score += np.sin(X * (i + 1)).mean(axis=1) ** 2
+    return 1.0 - score / score.max()
+
+def benchmark(rows=200_000, batch_rows=20_000, max_workers=None):
+    """Print controller throughput in rows/sec for 1..max_workers shards."""
+    max_workers = max_workers or os.cpu_count() or 1
+    df = synthetic_traffic(rows)
+    batches = [df.iloc[start:start + batch_rows] for start in range(0, rows, batch_rows)]
+
+    started = time.perf_counter()
+    for batch in batches:
+        plan_mitigation(batch["src_ip"].to_numpy(), benchmark_score(batch))
+    baseline = rows / (time.perf_counter() - started)
+
+    print(f"📊 {rows} rows in batches of {batch_rows}")
+    print(f"{'Workers':>8} | {'Rows/sec':>10} | {'Speedup':>7}")
+    print("-" * 32)
+    print(f"{'inline':>8} | {baseline:>10.0f} | {1.0:>7.2f}")
+    for n_workers in range(1, max_workers + 1):
+        controller = ShardedController(benchmark_score, n_workers)
+        try:
+            controller.process(batches[0])  # warm up the workers
+            started = time.perf_counter()
+            for batch in batches:
+                controller.process(batch)
+            throughput = rows / (time.perf_counter() - started)
+        finally:
+            controller.close()
+        print(f"{n_workers:>8} | {throughput:>10.0f} | {throughput / baseline:>7.2f}")
+
+if __name__ == '__main__':
+    benchmark(max_workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -1,77 +1,81 @@
-import requests
+import time
+from services import aggregate_service, talker_service, llm_service
+from services.cache_service import LRUCache
+from config import SUMMARY_CACHE_SIZE
 
-def generate_summary_from_llm(interval_minutes, packet_logs):
-    """
-    Generates a summary of recent network activity using an external LLM.
+# Generated summaries keyed by (interval, aggregate high-water mark, minute)
+summary_cache = LRUCache(SUMMARY_CACHE_SIZE)
 
-    Args:
-        interval_minutes (int): The time interval in minutes to summarize (currently unused).
-        packet_logs (list): A list of packet log dictionaries.
+class _FallbackSummary(Exception):
+    """Carries a template summary out of the cache so it is returned but not stored."""
 
-    Returns:
-        str: The generated summary.
-    """
-    if not packet_logs:
-        return "No significant network activity detected."
-
-    # Format the data for the LLM prompt
-    formatted_data = "Recent Network Activity:\n"
-    for log in packet_logs:
-        formatted_data += f"- IP: {log.get('details', {}).get('src_ip', 'N/A')}, Prediction: {log.get('attack_prediction', 'N/A')}, Action: {log.get('action', 'N/A')}\n"
+    def __init__(self, summary):
+        super().__init__(summary)
+        self.summary = summary
 
-    prompt = f"""
-    Analyze the following network activity logs and provide a detailed textual summary.
-    The summary should include:
-    1. An overview of the detected activity.
-    2. A breakdown of the types of predictions (e.g., how many 'Benign', 'DDoS', etc.).
-    3. A list of the actions taken (e.g., 'Allow', 'Block').
-    4. A concluding paragraph that assesses the overall security posture based on the logs.
-
-    Logs:
-    {formatted_data}
+def get_summary(interval_minutes):
     """
+    Return the summary for the last `interval_minutes` minutes, reusing a cached one when possible.
 
-    # This is a placeholder for the actual implementation of the LLM summary generation.
-    # In a real-world scenario, this would involve making a request to the LLM API.
-    # Example using a hypothetical Llama 2 API:
+    The cache key covers only the interval, the aggregate high-water mark and
+    the current minute: it changes whenever new events are aggregated or the
+    minute window slides. The scoring policy is read from config once at
+    import, so it cannot change while the cache is alive. A miss is rebuilt
+    from the per-minute aggregates rather than the raw logs, and concurrent
+    requests for the same key share a single computation. The template
+    summary served while the LLM is unavailable is not cached, so the next
+    request tries the LLM again.
     """
+    key = (interval_minutes, aggregate_service.get_high_water_mark(), int(time.time() // 60))
+
+    def compute():
+        aggregates = aggregate_service.get_aggregates(interval_minutes)
+        top_talkers = talker_service.get_top_talkers(interval_minutes)
+        try:
+            return generate_summary_from_llm(interval_minutes, aggregates, top_talkers, fallback=False)
+        except llm_service.SummarizerError as e:
+            print(f"❌ {e} Falling back to the template summary.")
+            raise _FallbackSummary(_template_summary(interval_minutes, aggregates, top_talkers))
+
     try:
-        response = requests.post(
-            "https://api.example.com/llama2/generate",
-            json={
-                "prompt": prompt,
-                "max_tokens": 500
-            },
-            headers={"Authorization": "Bearer YOUR_API_KEY"}
-        )
-        response.raise_for_status()
-        llm_summary = response.json().get("summary")
-    except requests.exceptions.RequestException as e:
-        print(f"Error calling LLM API: {e}")
-        llm_summary = "Error generating summary from LLM."
+        return summary_cache.get_or_compute(key, compute)
+    except _FallbackSummary as e:
+        return e.summary
+
+def generate_summary_from_llm(interval_minutes, aggregates, top_talkers=None, fallback=True):
     """
+    Generates a summary of recent network activity using the configured summary backend.
 
-    # Mock summary for demonstration
-    predictions = [log.get('attack_prediction', 'N/A') for log in packet_logs]
-    actions = [log.get('action', 'N/A') for log in packet_logs]
-    prediction_counts = {pred: predictions.count(pred) for pred in set(predictions)}
-    action_counts = {act: actions.count(act) for act in set(actions)}
+    Args:
+        interval_minutes (int): The time interval in minutes to summarize.
+        aggregates (dict): Pre-aggregated counts for the interval, as returned by
+            aggregate_service.get_aggregates.
+        top_talkers (dict): Top malicious source IPs and ports for the interval, as
+            returned by talker_service.get_top_talkers (optional).
+        fallback (bool): Return the template summary when the backend fails.
 
-    llm_summary = "Detailed Network Activity Report\n\n"
-    llm_summary += "Overview:\n"
-    llm_summary += f"The system has processed {len(packet_logs)} packets. "
-    llm_summary += "The activity includes a mix of benign and potentially malicious traffic, with corresponding actions taken by the system.\n\n"
-    llm_summary += "Prediction Breakdown:\n"
-    for pred, count in prediction_counts.items():
-        llm_summary += f"- {pred}: {count}\n"
-    llm_summary += "\nActions Taken:\n"
-    for act, count in action_counts.items():
-        llm_summary += f"- {act}: {count}\n"
-    llm_summary += "\nConclusion:\n"
-    if 'Block' in actions or 'Temporary Block' in actions:
-        llm_summary += "The system has actively mitigated potential threats by blocking suspicious IP addresses. This indicates that the automated incident response is functioning as expected. However, the presence of malicious traffic warrants continued monitoring."
-    else:
-        llm_summary += "The network activity appears to be normal, with no major threats detected. The system is monitoring the traffic, and all connections have been allowed. The security posture is currently stable."
+    Returns:
+        str: The generated summary.
 
-    return llm_summary
+    Raises:
+        SummarizerError: If the backend fails and `fallback` is False.
+    """
+    if not aggregates or not aggregates.get('total'):
+        return "No significant network activity detected."
+
+    prompt = llm_service.build_prompt(interval_minutes, aggregates, top_talkers)
+    context = {"interval_minutes": interval_minutes, "aggregates": aggregates, "top_talkers": top_talkers}
+    try:
+        return llm_service.get_summarizer().summarize(prompt, context)
+    except llm_service.SummarizerError as e:
+        if not fallback:
+            raise
+        # Fall back to the offline report so the endpoint stays fast while the LLM is unavailable
+        print(f"❌ {e} Falling back to the template summary.")
+        return llm_service.TemplateSummarizer().summarize(prompt, context)
 
+def _template_summary(interval_minutes, aggregates, top_talkers=None):
+    """Build the offline template summary."""
+    prompt = llm_service.build_prompt(interval_minutes, aggregates, top_talkers)
+    context = {"interval_minutes": interval_minutes, "aggregates": aggregates, "top_talkers": top_talkers}
+    return llm_service.TemplateSummarizer().summarize(prompt, context)
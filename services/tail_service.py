@@ -0,0 +1,97 @@
+import csv
+import io
+import itertools
+import os
+import pandas as pd
+
+class CSVTailer:
+    """
+    Incrementally reads rows appended to a growing CSV file, like `tail -F`.
+
+    The tailer remembers the byte offset and inode of the file so each call
+    only parses newly appended, complete lines, at most `chunk_size` lines
+    at a time, so a long backlog is never read into memory at once. A
+    partial last line is left in the file until its newline arrives. If the
+    file is replaced (rotation) the rest of the old file is drained before
+    switching to the new one; if it shrinks (truncation) reading restarts
+    from the top, including the header.
+    """
+
+    def __init__(self, path, chunk_size=5000):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._file = None
+        self._inode = None
+        self._offset = 0
+        self._columns = None
+
+    def _open(self):
+        """Open the file at the start; returns False if it does not exist yet."""
+        try:
+            self._file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._reset_position()
+        return True
+
+    def _reset_position(self):
+        self._offset = 0
+        self._columns = None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read_chunks(self):
+        """
+        Yield DataFrames of at most `chunk_size` rows appended since the last call.
+
+        A chunk's rows count as read only once the caller asks for the next
+        chunk (or the generator finishes). If processing a chunk raises and
+        the generator is abandoned, the same rows are yielded again by the
+        next call instead of being lost.
+        """
+        if self._file is None and not self._open():
+            return
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+
+        if stat is not None and stat.st_ino != self._inode:
+            # Rotated: finish what was appended to the old file, then follow the new one
+            yield from self._read_available()
+            self.close()
+            if not self._open():
+                return
+        elif stat is not None and stat.st_size < self._offset:
+            # Truncated in place: start over from the header
+            self._reset_position()
+
+        yield from self._read_available()
+
+    def _read_available(self):
+        """Parse the complete lines after the saved offset, `chunk_size` lines at a time."""
+        while True:
+            self._file.seek(self._offset)
+            if self._columns is None:
+                header = self._file.readline()
+                if not header.endswith(b'\n'):
+                    return
+                self._columns = next(csv.reader([header.decode('utf-8').rstrip('\r\n')]))
+                self._offset += len(header)
+
+            lines = list(itertools.islice(self._file, self.chunk_size))
+            if lines and not lines[-1].endswith(b'\n'):
+                # The last line is still being written
+                lines.pop()
+            if not lines:
+                return
+            data = b''.join(lines)
+            if data.strip():
+                yield pd.read_csv(io.BytesIO(data), names=self._columns, header=None)
+            # Commit only once the caller has taken the chunk
+            self._offset += len(data)
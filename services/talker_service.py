@@ -0,0 +1,152 @@
+import heapq
+import threading
+import time
+from config import TOP_TALKERS_SKETCH_CAPACITY, TOP_TALKERS_RETENTION_MINUTES
+
+class SpaceSaving:
+    """
+    SpaceSaving heavy-hitter sketch that tracks at most `capacity` items.
+
+    Each tracked item keeps an estimated count and the maximum overestimation
+    (error) of that count, so memory stays fixed however many distinct items
+    are seen. Sketches built on different workers can be merged.
+    """
+
+    def __init__(self, capacity=TOP_TALKERS_SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # Min-heap of (count, item); entries may be stale lower bounds and are refreshed lazily
+        self._heap = []
+
+    def add(self, item, weight=1):
+        """Count `weight` occurrences of an item."""
+        if item in self.counts:
+            self.counts[item] += weight
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[item] = weight
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (weight, item))
+            return
+
+        # Replace the item with the smallest count, inheriting it as the error bound
+        min_count, min_item = self._pop_min()
+        del self.counts[min_item]
+        del self.errors[min_item]
+        self.counts[item] = min_count + weight
+        self.errors[item] = min_count
+        heapq.heappush(self._heap, (min_count + weight, item))
+
+    def _pop_min(self):
+        """Pop the tracked item with the smallest current count."""
+        while True:
+            count, item = heapq.heappop(self._heap)
+            current = self.counts[item]
+            if current == count:
+                return count, item
+            heapq.heappush(self._heap, (current, item))
+
+    def min_count(self):
+        """Return the smallest tracked count, or 0 while the sketch is not full."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """Return a new sketch summarising the streams of both sketches."""
+        self_min, other_min = self.min_count(), other.min_count()
+        counts, errors = {}, {}
+        for item in self.counts.keys() | other.counts.keys():
+            counts[item] = self.counts.get(item, self_min) + other.counts.get(item, other_min)
+            errors[item] = self.errors.get(item, self_min) + other.errors.get(item, other_min)
+
+        merged = SpaceSaving(max(self.capacity, other.capacity))
+        for item in heapq.nlargest(merged.capacity, counts, key=counts.get):
+            merged.counts[item] = counts[item]
+            merged.errors[item] = errors[item]
+        merged._heap = [(count, item) for item, count in merged.counts.items()]
+        heapq.heapify(merged._heap)
+        return merged
+
+    def top(self, n):
+        """Return the `n` heaviest items as (item, count, error) tuples."""
+        items = heapq.nlargest(n, self.counts, key=self.counts.get)
+        return [(item, self.counts[item], self.errors[item]) for item in items]
+
+    def to_dict(self):
+        """Serialise the sketch, e.g. to ship it between worker processes."""
+        return {
+            "capacity": self.capacity,
+            "items": [[item, count, self.errors[item]] for item, count in self.counts.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch serialised with to_dict."""
+        sketch = cls(data["capacity"])
+        for item, count, error in data["items"]:
+            sketch.counts[item] = count
+            sketch.errors[item] = error
+        sketch._heap = [(count, item) for item, count in sketch.counts.items()]
+        heapq.heapify(sketch._heap)
+        return sketch
+
+# Per-minute windows of malicious-traffic sketches keyed by epoch minute, in time order
+_windows = {}
+_lock = threading.Lock()
+
+def record_malicious(src_ip, port, timestamp=None):
+    """Count one malicious packet against its source IP and destination port."""
+    if timestamp is None:
+        timestamp = time.time()
+    minute = int(timestamp // 60)
+
+    with _lock:
+        window = _windows.get(minute)
+        if window is None:
+            window = _windows[minute] = {"src_ips": SpaceSaving(), "ports": SpaceSaving()}
+            cutoff = minute - TOP_TALKERS_RETENTION_MINUTES
+            while _windows and next(iter(_windows)) <= cutoff:
+                del _windows[next(iter(_windows))]
+        window["src_ips"].add(src_ip)
+        if port is not None:
+            window["ports"].add(port)
+
+def get_merged_sketches(interval_minutes, now=None):
+    """Merge the per-minute sketches of the last `interval_minutes` minutes."""
+    if now is None:
+        now = time.time()
+    current_minute = int(now // 60)
+    interval_minutes = max(1, min(interval_minutes, TOP_TALKERS_RETENTION_MINUTES))
+
+    src_ips, ports = SpaceSaving(), SpaceSaving()
+    with _lock:
+        for minute in range(current_minute - interval_minutes + 1, current_minute + 1):
+            window = _windows.get(minute)
+            if window is not None:
+                src_ips = src_ips.merge(window["src_ips"])
+                ports = ports.merge(window["ports"])
+    return {"src_ips": src_ips, "ports": ports}
+
+def get_top_talkers(interval_minutes, n=10, now=None):
+    """
+    Return the top source IPs and destination ports by malicious volume.
+
+    Counts are SpaceSaving estimates: the true count lies between count - error and count.
+    """
+    sketches = get_merged_sketches(interval_minutes, now)
+    return {
+        "interval_minutes": max(1, min(interval_minutes, TOP_TALKERS_RETENTION_MINUTES)),
+        "src_ips": [
+            {"ip": ip, "count": count, "error": error} for ip, count, error in sketches["src_ips"].top(n)
+        ],
+        "ports": [
+            {"port": port, "count": count, "error": error} for port, count, error in sketches["ports"].top(n)
+        ]
+    }
+
+def reset():
+    """Discard all windows."""
+    with _lock:
+        _windows.clear()
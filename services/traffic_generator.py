@@ -0,0 +1,222 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Attack types from app.py's ATTACK_CATEGORY_MAP
+ATTACK_TYPES = [
+    "Normal", "Brute Force", "Port Scanning", "DDoS", "DoS attacks-Hulk",
+    "Botnet", "Infiltration", "Web attacks", "DoS attacks-GoldenEye",
+    "DoS attacks-Slowloris", "SSH-Bruteforce", "FTP-BruteForce",
+    "Heartbleed", "SQL Injection", "XSS"
+]
+
+# Headers for the CSV file
+HEADERS = [
+    'timestamp', 'src_ip', 'dst_ip', 'protocol', 'port',
+    'attack_type', 'confidence_score', 'is_malicious'
+]
+
+PROTOCOLS = np.array(['TCP', 'UDP', 'ICMP'], dtype=object)
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+def parse_attack_mix(spec):
+    """
+    Parse an attack mix such as "DDoS=5,Port Scanning=2,XSS=1" into {attack_type: weight}.
+
+    Raises:
+        ValueError: For unknown attack types or non-positive weights.
+    """
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ATTACK_TYPES or name == "Normal":
+            raise ValueError(f"Unknown attack type '{name}'.")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] <= 0:
+            raise ValueError(f"The weight of '{name}' must be positive.")
+    if not mix:
+        raise ValueError("The attack mix is empty.")
+    return mix
+
+def random_ips(rng, n):
+    """Return n random IPv4 addresses as an object array of strings."""
+    octets = np.column_stack([
+        rng.integers(1, 256, n), rng.integers(0, 256, n), rng.integers(0, 256, n), rng.integers(1, 255, n)
+    ]).tolist()
+    return np.array([f"{a}.{b}.{c}.{d}" for a, b, c, d in octets], dtype=object)
+
+class TrafficGenerator:
+    """
+    Vectorized generator of synthetic honeypot traffic, in chunks.
+
+    Every chunk is built with a handful of NumPy calls, so memory depends
+    only on the chunk size. Background traffic draws its source IPs from a
+    pool with Zipf-distributed popularity (a few IPs send most packets),
+    is an attack with probability `attack_ratio` (typed by the weights in
+    `attack_mix`), and arrives `gap_ms` apart. Attack campaigns start with
+    probability `campaign_rate` per row and last `campaign_rows` rows on
+    average: one source IP sends one attack type to one port with
+    `burst_gap_ms` gaps, so the output contains realistic bursts. A campaign
+    that starts while another is running replaces it. Campaigns carry over
+    chunk boundaries. The same seed and chunk sizes reproduce
+    the same rows.
+    """
+
+    def __init__(self, seed=None, n_ips=20, zipf_exponent=1.2, attack_ratio=0.5, attack_mix=None,
+                 campaign_rate=0.0, campaign_rows=500, gap_ms=(50, 500), burst_gap_ms=(1, 20), start=None,
+                 n_dst_ips=65536):
+        self.rng = np.random.default_rng(seed)
+        self.attack_ratio = attack_ratio
+        self.campaign_rate = campaign_rate
+        self.campaign_rows = campaign_rows
+        self.gap_ms = gap_ms
+        self.burst_gap_ms = burst_gap_ms
+
+        attack_mix = attack_mix or {name: 1.0 for name in ATTACK_TYPES if name != "Normal"}
+        self.attack_types = np.array(["Normal", *attack_mix], dtype=object)
+        weights = np.array(list(attack_mix.values()), dtype=np.float64)
+        self._attack_cdf = np.cumsum(weights / weights.sum())
+
+        self.src_ips = random_ips(self.rng, n_ips)
+        ranks = np.arange(1, n_ips + 1, dtype=np.float64)
+        popularity = ranks ** -zipf_exponent
+        self._src_cdf = np.cumsum(popularity / popularity.sum())
+        self.dst_ips = random_ips(self.rng, n_dst_ips)
+
+        start = pd.Timestamp.now() if start is None else pd.Timestamp(start)
+        self._clock_ms = start.value // 1_000_000
+        # Open campaign carried into the next chunk: (rows left, attack code, src IP index, port)
+        self._campaign = None
+
+    def _draw(self, cdf, n):
+        """Draw n indices from a discrete distribution given by its CDF."""
+        return np.minimum(np.searchsorted(cdf, self.rng.random(n), side='right'), len(cdf) - 1)
+
+    def _campaign_rows(self, n):
+        """
+        Return, for each row, the index of the campaign it belongs to (-1 for
+        background traffic) and the campaigns' attack codes, source IPs and ports.
+        """
+        rng = self.rng
+        starts = np.flatnonzero(rng.random(n) < self.campaign_rate) if self.campaign_rate > 0 else np.empty(0, np.int64)
+        lengths = rng.geometric(1.0 / self.campaign_rows, len(starts))
+        codes = 1 + self._draw(self._attack_cdf, len(starts))
+        sources = self._draw(self._src_cdf, len(starts))
+        ports = rng.integers(1, 65536, len(starts))
+        if self._campaign is not None and (len(starts) == 0 or starts[0] > 0):
+            left, code, source, port = self._campaign
+            starts = np.concatenate([[0], starts])
+            lengths = np.concatenate([[left], lengths])
+            codes = np.concatenate([[code], codes])
+            sources = np.concatenate([[source], sources])
+            ports = np.concatenate([[port], ports])
+
+        marker = np.full(n, -1, dtype=np.int64)
+        marker[starts] = np.arange(len(starts))
+        campaign = np.maximum.accumulate(marker)
+        active = campaign >= 0
+        ends = starts + lengths
+        active[active] = np.arange(n)[active] < ends[campaign[active]]
+        campaign[~active] = -1
+
+        self._campaign = None
+        if len(starts) and ends[-1] > n:
+            self._campaign = (int(ends[-1] - n), int(codes[-1]), int(sources[-1]), int(ports[-1]))
+        return campaign, codes, sources, ports
+
+    def chunk(self, n):
+        """Return the next n rows as a DataFrame with the HEADERS columns."""
+        rng = self.rng
+        campaign, codes, sources, ports = self._campaign_rows(n)
+        in_campaign = campaign >= 0
+        owner = campaign[in_campaign]
+
+        attack_code = np.where(rng.random(n) < self.attack_ratio, 1 + self._draw(self._attack_cdf, n), 0)
+        attack_code[in_campaign] = codes[owner]
+        src = self._draw(self._src_cdf, n)
+        src[in_campaign] = sources[owner]
+        port = rng.integers(1, 65536, n)
+        port[in_campaign] = ports[owner]
+
+        gaps = rng.integers(self.gap_ms[0], self.gap_ms[1] + 1, n)
+        gaps[in_campaign] = rng.integers(self.burst_gap_ms[0], self.burst_gap_ms[1] + 1, int(in_campaign.sum()))
+        timestamps = self._clock_ms + np.cumsum(gaps)
+        if n:
+            self._clock_ms = int(timestamps[-1])
+
+        is_malicious = (attack_code > 0).astype(np.int8)
+        # Confidence of being an attack: high for attacks, low for normal traffic so its trust score stays > 60
+        confidence = np.where(is_malicious, rng.uniform(80, 99, n), rng.uniform(1, 20, n)).round(2)
+
+        return pd.DataFrame({
+            'timestamp': timestamps.astype('datetime64[ms]'),
+            'src_ip': self.src_ips[src],
+            'dst_ip': self.dst_ips[rng.integers(0, len(self.dst_ips), n)],
+            'protocol': PROTOCOLS[rng.integers(0, len(PROTOCOLS), n)],
+            'port': port,
+            'attack_type': self.attack_types[attack_code],
+            'confidence_score': confidence,
+            'is_malicious': is_malicious
+        }, columns=HEADERS)
+
+def generate_chunks(rows, chunk_rows=1_000_000, **options):
+    """Yield `rows` rows of synthetic traffic as DataFrames of at most `chunk_rows` rows."""
+    generator = TrafficGenerator(**options)
+    for start in range(0, rows, chunk_rows):
+        yield generator.chunk(min(chunk_rows, rows - start))
+
+def write_dataset(chunks, path, fmt=None):
+    """
+    Write a stream of DataFrames to one CSV or Parquet file, chunk by chunk.
+
+    The format defaults to the file extension; Parquet needs pyarrow.
+
+    Returns:
+        int: Rows written.
+    """
+    fmt = fmt or ('parquet' if os.path.splitext(path)[1].lower() == '.parquet' else 'csv')
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{fmt}'. Use one of: {', '.join(OUTPUT_FORMATS)}.")
+
+    rows = 0
+    if fmt == 'csv':
+        with open(path, 'w', newline='') as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, header=i == 0, index=False)
+                rows += len(chunk)
+        return rows
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet output requires pyarrow (pip install pyarrow); use CSV instead.")
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def benchmark(rows=2_000_000, chunk_rows=500_000):
+    """Print generation and CSV writing throughput in rows/sec."""
+    started = time.perf_counter()
+    for _ in generate_chunks(rows, chunk_rows, seed=0, n_ips=100_000, campaign_rate=1e-4):
+        pass
+    generated = time.perf_counter() - started
+
+    started = time.perf_counter()
+    write_dataset(generate_chunks(rows, chunk_rows, seed=0, n_ips=100_000, campaign_rate=1e-4), os.devnull, 'csv')
+    written = time.perf_counter() - started
+    print(f"📊 {rows} rows: generated at {rows / generated:,.0f} rows/sec, generated and written as CSV at {rows / written:,.0f} rows/sec")
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,334 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+class CompiledForest:
+    """
+    A tree ensemble flattened into contiguous NumPy node arrays.
+
+    All trees share one set of arrays indexed by global node id: the split
+    feature and threshold, the left and right child, the side taken by
+    missing (NaN) values and the leaf values. Leaves point to themselves, so
+    a batch is evaluated level by level for every row and tree at once with
+    a few gathers per level and no Python loop over rows or trees.
+
+    `combine` says how leaf values become probabilities:
+        'average' - leaves hold class probabilities, averaged over trees (random forests).
+        'softmax' - leaves hold one margin each, summed per class and softmaxed (multi-class boosting).
+        'sigmoid' - leaves hold one margin each, summed and passed through a sigmoid (binary boosting).
+    """
+
+    def __init__(self, feature, threshold, left, right, nan_left, value, roots, max_depth,
+                 classes, combine='average', tree_class=None, base_score=0.0, input_dtype=np.float32):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.nan_left = np.ascontiguousarray(nan_left, dtype=bool)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.classes_ = np.asarray(classes)
+        self.combine = combine
+        self.tree_class = None if tree_class is None else np.asarray(tree_class, dtype=np.int32)
+        self.base_score = np.asarray(base_score, dtype=np.float64)
+        self.input_dtype = np.dtype(input_dtype)
+
+        # Evaluation layout: both children of a node side by side (right, left) so
+        # one gather picks the next node, and thresholds in the input dtype,
+        # rounded down so x <= threshold keeps its float64 meaning
+        self._children = np.column_stack([self.right, self.left]).ravel()
+        self._threshold = self.threshold.astype(self.input_dtype)
+        rounded_up = self._threshold > self.threshold
+        self._threshold[rounded_up] = np.nextafter(self._threshold[rounded_up], self.input_dtype.type(-np.inf))
+
+        if combine != 'average':
+            # Routes each tree's margin to its class with one matrix product
+            n_outputs = 1 if combine == 'sigmoid' else len(self.classes_)
+            self._class_matrix = np.zeros((len(self.roots), n_outputs))
+            self._class_matrix[np.arange(len(self.roots)), self.tree_class] = 1.0
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def apply(self, X):
+        """Return the leaf node id reached in every tree, shape (n_rows, n_trees)."""
+        X = np.ascontiguousarray(X, dtype=self.input_dtype)
+        flat = X.ravel()
+        row_offsets = (np.arange(len(X), dtype=np.int64) * X.shape[1])[:, None]
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0)
+        check_missing = bool(np.isnan(flat).any())
+        for _ in range(self.max_depth):
+            x = np.take(flat, row_offsets + np.take(self.feature, nodes))
+            go_left = x <= np.take(self._threshold, nodes)
+            if check_missing:
+                go_left |= np.isnan(x) & np.take(self.nan_left, nodes)
+            nodes = np.take(self._children, 2 * nodes + go_left)
+        return nodes
+
+    def predict_proba(self, X, chunk_rows=4096):
+        """Return class probabilities, evaluating at most `chunk_rows` rows at a time."""
+        X = np.asarray(X)
+        if len(X) <= chunk_rows:
+            return self._predict_chunk(X)
+        return np.vstack([self._predict_chunk(X[start:start + chunk_rows]) for start in range(0, len(X), chunk_rows)])
+
+    def _predict_chunk(self, X):
+        leaves = self.apply(X)
+        if self.combine == 'average':
+            return np.take(self.value, leaves, axis=0).sum(axis=1) / self.n_trees
+
+        margin = np.take(self.value[:, 0], leaves) @ self._class_matrix + self.base_score
+        if self.combine == 'sigmoid':
+            positive = 1.0 / (1.0 + np.exp(-margin[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        margin -= margin.max(axis=1, keepdims=True)
+        np.exp(margin, out=margin)
+        margin /= margin.sum(axis=1, keepdims=True)
+        return margin
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def save(self, path):
+        """Write the node arrays to a single .npz file."""
+        np.savez(
+            path, feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            nan_left=self.nan_left, value=self.value, roots=self.roots, max_depth=self.max_depth,
+            classes=self.classes_, combine=self.combine,
+            tree_class=np.array([]) if self.tree_class is None else self.tree_class,
+            base_score=self.base_score, input_dtype=self.input_dtype.str
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            combine = str(data['combine'])
+            return cls(
+                data['feature'], data['threshold'], data['left'], data['right'], data['nan_left'],
+                data['value'], data['roots'], int(data['max_depth']), data['classes'], combine,
+                None if combine == 'average' else data['tree_class'], data['base_score'],
+                np.dtype(str(data['input_dtype']))
+            )
+
+class _NodeArrays:
+    """Accumulates nodes of several trees into flat lists while converting a model."""
+
+    def __init__(self, n_values=1):
+        self.n_values = n_values
+        self._empty_value = np.zeros(n_values)
+        self.feature, self.threshold, self.left, self.right = [], [], [], []
+        self.nan_left, self.value, self.roots = [], [], []
+        self.max_depth = 0
+
+    def add_node(self):
+        node = len(self.feature)
+        for values in (self.feature, self.threshold, self.left, self.right, self.nan_left, self.value):
+            values.append(None)
+        return node
+
+    def set_split(self, node, feature, threshold, left, right, nan_left):
+        self.feature[node], self.threshold[node] = feature, threshold
+        self.left[node], self.right[node], self.nan_left[node] = left, right, nan_left
+        self.value[node] = self._empty_value
+
+    def set_leaf(self, node, value):
+        # Leaves loop back to themselves so extra levels leave them in place
+        self.feature[node], self.threshold[node] = 0, 0.0
+        self.left[node] = self.right[node] = node
+        self.nan_left[node] = False
+        self.value[node] = value
+
+    def build(self, **kwargs):
+        return CompiledForest(
+            self.feature, self.threshold, self.left, self.right, self.nan_left,
+            np.vstack(self.value).reshape(len(self.value), self.n_values), self.roots, self.max_depth, **kwargs
+        )
+
+def _compile_sklearn(model):
+    """Flatten a fitted sklearn decision tree or forest classifier."""
+    estimators = getattr(model, 'estimators_', [model])
+    n_classes = len(model.classes_)
+    offset = 0
+    parts = {name: [] for name in ('feature', 'threshold', 'left', 'right', 'nan_left', 'value')}
+    roots, max_depth = [], 0
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        if tree.n_outputs != 1:
+            raise NotImplementedError("Multi-output trees are not supported.")
+        ids = np.arange(tree.node_count)
+        leaf = tree.children_left < 0
+        parts['feature'].append(np.where(leaf, 0, tree.feature))
+        parts['threshold'].append(np.where(leaf, 0.0, tree.threshold))
+        parts['left'].append(np.where(leaf, ids, tree.children_left) + offset)
+        parts['right'].append(np.where(leaf, ids, tree.children_right) + offset)
+        missing_left = getattr(tree, 'missing_go_to_left', None)
+        parts['nan_left'].append(np.zeros(tree.node_count, dtype=bool) if missing_left is None
+                                 else (missing_left.astype(bool) & ~leaf))
+
+        value = tree.value[:, 0, :n_classes].astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        parts['value'].append(np.divide(value, totals, out=np.zeros_like(value), where=totals > 0))
+
+        roots.append(offset)
+        max_depth = max(max_depth, tree.max_depth)
+        offset += tree.node_count
+
+    return CompiledForest(
+        *(np.concatenate(parts[name]) for name in ('feature', 'threshold', 'left', 'right', 'nan_left', 'value')),
+        roots=roots, max_depth=max_depth, classes=model.classes_, combine='average', input_dtype=np.float32
+    )
+
+def _compile_lightgbm(model):
+    """Flatten a fitted LightGBM classifier from its JSON model dump."""
+    dump = model.booster_.dump_model()
+    n_classes = len(model.classes_)
+    trees_per_iteration = dump.get('num_tree_per_iteration', 1)
+    arrays = _NodeArrays()
+    tree_class = []
+
+    def visit(spec, depth):
+        node = arrays.add_node()
+        arrays.max_depth = max(arrays.max_depth, depth)
+        if 'leaf_value' in spec:
+            arrays.set_leaf(node, np.array([spec['leaf_value']]))
+            return node
+        if spec.get('decision_type', '<=') != '<=':
+            raise NotImplementedError("Categorical LightGBM splits are not supported.")
+        missing_type = spec.get('missing_type', 'None')
+        if missing_type == 'Zero':
+            raise NotImplementedError("LightGBM models trained with zero_as_missing are not supported.")
+        threshold = float(spec['threshold'])
+        # With missing_type 'None' LightGBM treats NaN as 0
+        nan_left = bool(spec.get('default_left', True)) if missing_type == 'NaN' else 0.0 <= threshold
+        left = visit(spec['left_child'], depth + 1)
+        right = visit(spec['right_child'], depth + 1)
+        arrays.set_split(node, int(spec['split_feature']), threshold, left, right, nan_left)
+        return node
+
+    for i, info in enumerate(dump['tree_info']):
+        arrays.roots.append(visit(info['tree_structure'], 0))
+        tree_class.append(i % trees_per_iteration)
+
+    binary = n_classes == 2 and trees_per_iteration == 1
+    if binary and 'sigmoid:' in dump.get('objective', ''):
+        # LightGBM scales binary margins by its sigmoid parameter
+        scale = float(dump['objective'].split('sigmoid:')[1].split()[0])
+        arrays.value = [v * scale for v in arrays.value]
+    return arrays.build(
+        classes=model.classes_, combine='sigmoid' if binary else 'softmax',
+        tree_class=tree_class, input_dtype=np.float64
+    )
+
+def _compile_xgboost(model):
+    """Flatten a fitted XGBoost classifier from its JSON tree dump."""
+    booster = model.get_booster()
+    config = json.loads(booster.save_config())
+    objective = config['learner']['objective']['name']
+    n_classes = len(model.classes_)
+    trees_per_iteration = n_classes if objective.startswith('multi:') else 1
+    feature_index = {name: i for i, name in enumerate(booster.feature_names or [])}
+
+    raw_base = config['learner']['learner_model_param']['base_score'].strip('[]')
+    base_values = np.array([float(v) for v in raw_base.split(',')])
+    if objective == 'binary:logistic':
+        base_score = np.log(base_values / (1.0 - base_values))
+    elif objective.startswith('multi:'):
+        base_score = base_values
+    else:
+        raise NotImplementedError(f"XGBoost objective '{objective}' is not supported.")
+
+    arrays = _NodeArrays()
+    tree_class = []
+
+    def visit(spec, depth):
+        node = arrays.add_node()
+        arrays.max_depth = max(arrays.max_depth, depth)
+        if 'leaf' in spec:
+            arrays.set_leaf(node, np.array([spec['leaf']]))
+            return node
+        split = spec['split']
+        feature = feature_index[split] if split in feature_index else int(split.lstrip('f'))
+        children = {child['nodeid']: child for child in spec['children']}
+        left = visit(children[spec['yes']], depth + 1)
+        right = visit(children[spec['no']], depth + 1)
+        # XGBoost goes left on x < t (in float32); the largest float32 below t gives the same split with <=
+        threshold = float(np.nextafter(np.float32(spec['split_condition']), np.float32(-np.inf)))
+        arrays.set_split(node, feature, threshold, left, right, spec['missing'] == spec['yes'])
+        return node
+
+    for i, dump in enumerate(booster.get_dump(dump_format='json')):
+        arrays.roots.append(visit(json.loads(dump), 0))
+        tree_class.append(i % trees_per_iteration)
+
+    return arrays.build(
+        classes=model.classes_, combine='softmax' if trees_per_iteration > 1 else 'sigmoid',
+        tree_class=tree_class, base_score=base_score, input_dtype=np.float32
+    )
+
+def compile_ensemble(model):
+    """
+    Convert a fitted tree classifier into a CompiledForest.
+
+    Supports sklearn decision trees and random/extra-trees forests, LightGBM
+    LGBMClassifier and XGBoost XGBClassifier (numerical splits only).
+
+    Raises:
+        NotImplementedError: For other models or unsupported split types.
+    """
+    if hasattr(model, 'booster_'):
+        return _compile_lightgbm(model)
+    if hasattr(model, 'get_booster'):
+        return _compile_xgboost(model)
+    if hasattr(model, 'tree_') or hasattr(getattr(model, 'estimators_', [None])[0], 'tree_'):
+        return _compile_sklearn(model)
+    raise NotImplementedError(f"Cannot compile model of type {type(model).__name__}.")
+
+def _latency_ms(fn, X, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn(X)
+    return 1000 * (time.perf_counter() - started) / repeats
+
+def benchmark(names=None, batch_size=1024, single_row_repeats=200):
+    """
+    Compare compiled and original CICIDS2018 models on the test CSV.
+
+    Prints the largest probability difference (differential check) and the
+    single-row and batch latency of each implementation.
+    """
+    from services.model_registry import registry, BASE_DIR
+    from config import LIVE_CLASSIFIER_MODELS, LIVE_CLASSIFIER_SCALER, LIVE_CLASSIFIER_FEATURES, LIVE_CLASSIFIER_BENCHMARK_CSV
+
+    features = registry.get(LIVE_CLASSIFIER_FEATURES)
+    df = pd.read_csv(os.path.join(BASE_DIR, LIVE_CLASSIFIER_BENCHMARK_CSV), nrows=batch_size)
+    X = registry.get(LIVE_CLASSIFIER_SCALER).transform(df[features].to_numpy(dtype=np.float32))
+    row = X[:1]
+
+    print(f"{'Model':<12} | {'Max |dp|':>9} | {'1 row orig':>10} | {'1 row comp':>10} | "
+          f"{f'{batch_size} orig':>10} | {f'{batch_size} comp':>10}  (ms)")
+    print("-" * 80)
+    for name in names or LIVE_CLASSIFIER_MODELS:
+        model = registry.get(name)
+        started = time.perf_counter()
+        compiled = compile_ensemble(model)
+        print(f"🔧 Compiled '{name}': {compiled.n_trees} trees, {compiled.n_nodes} nodes, "
+              f"depth {compiled.max_depth} in {time.perf_counter() - started:.2f}s")
+        diff = np.abs(compiled.predict_proba(X) - model.predict_proba(X)).max()
+        print(f"{name:<12} | {diff:>9.2e} | "
+              f"{_latency_ms(model.predict_proba, row, single_row_repeats):>10.3f} | "
+              f"{_latency_ms(compiled.predict_proba, row, single_row_repeats):>10.3f} | "
+              f"{_latency_ms(model.predict_proba, X, 5):>10.2f} | "
+              f"{_latency_ms(compiled.predict_proba, X, 5):>10.2f}")
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1:] or None)
@@ -211,6 +211,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 list.className = 'list-group';
 
                 data.alerts.forEach(alert => {
+                    // Responses may be served from the browser cache after a 304, so
+                    // derive the remaining time from the absolute unblock time when present.
+                    if (alert.unblock_time) {
+                        alert.remaining_time = alert.unblock_time - Date.now() / 1000;
+                    }
                     const listItem = document.createElement('li');
                     listItem.className = 'list-group-item d-flex justify-content-between align-items-center';
                     listItem.innerHTML = `
@@ -0,0 +1,14 @@
+import os
+import shutil
+import tempfile
+from services import database_service
+
+# Importing app initialises the database, so point it at a scratch copy before
+# any test module is collected to keep the tracked incident_response.db untouched
+_scratch_dir = tempfile.mkdtemp(prefix='incident_response_tests_')
+
+def pytest_configure(config):
+    database_service.DATABASE_NAME = os.path.join(_scratch_dir, 'incident_response.db')
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_scratch_dir, ignore_errors=True)
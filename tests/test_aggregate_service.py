@@ -0,0 +1,44 @@
+import pytest
+from unittest.mock import patch
+from services import aggregate_service
+
+NOW = 1_000_000 * 60  # An exact minute boundary
+
+@pytest.fixture(autouse=True)
+def reset_buckets():
+    aggregate_service.reset()
+    yield
+    aggregate_service.reset()
+
+def make_log(prediction, action, trust_level, src_ip):
+    return {"attack_prediction": prediction, "action": action, "trust_level": trust_level,
+            "details": {"src_ip": src_ip}}
+
+def test_get_aggregates_honours_interval():
+    """Test that only the buckets inside the interval are merged."""
+    aggregate_service.record(make_log("DDoS", "Block", "Critical Risk", "1.1.1.1"), NOW - 30 * 60)
+    aggregate_service.record(make_log("Normal", "Allow", "Trusted", "2.2.2.2"), NOW - 5 * 60)
+    aggregate_service.record(make_log("DDoS", "Block", "Critical Risk", "1.1.1.1"), NOW + 10)
+
+    recent = aggregate_service.get_aggregates(15, now=NOW + 20)
+    assert recent["total"] == 2
+    assert recent["predictions"] == {"Normal": 1, "DDoS": 1}
+
+    hour = aggregate_service.get_aggregates(60, now=NOW + 20)
+    assert hour["total"] == 3
+    assert hour["actions"] == {"Block": 2, "Allow": 1}
+    assert hour["top_src_ips"][0] == ("1.1.1.1", 2)
+    assert {"prediction": "DDoS", "action": "Block", "trust_level": "Critical Risk", "count": 2} in hour["breakdown"]
+
+def test_old_buckets_are_evicted():
+    """Test that buckets older than the retention window are dropped."""
+    with patch('services.aggregate_service.SUMMARY_BUCKET_RETENTION_MINUTES', 10):
+        aggregate_service.record(make_log("DDoS", "Block", "Critical Risk", "1.1.1.1"), NOW - 20 * 60)
+        aggregate_service.record(make_log("Normal", "Allow", "Trusted", "2.2.2.2"), NOW)
+        assert len(aggregate_service._buckets) == 1
+
+def test_reset_clears_aggregates():
+    """Test that reset empties all counters."""
+    aggregate_service.record(make_log("Normal", "Allow", "Trusted", "2.2.2.2"), NOW)
+    aggregate_service.reset()
+    assert aggregate_service.get_aggregates(15, now=NOW)["total"] == 0
@@ -0,0 +1,91 @@
+import time
+import pytest
+from unittest.mock import patch
+from app import app
+from services import database_service
+
+# Run the versioned endpoints against a fresh temporary database for every test
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    with patch('services.database_service.DATABASE_NAME', str(tmp_path / 'test.db')):
+        database_service.init_db()
+        yield
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    app.config['LOGIN_DISABLED'] = True
+    with app.test_client() as client:
+        yield client
+    app.config['LOGIN_DISABLED'] = False
+
+@pytest.mark.parametrize('url', ['/api/blocked_ips', '/api/alerts'])
+def test_unchanged_list_returns_304(client, url):
+    """Test that a poll with the current ETag gets an empty 304."""
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers['ETag']
+
+    second = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+    assert second.data == b''
+
+def test_blocked_ips_etag_changes_with_the_list(client):
+    """Test that blocking an IP invalidates the blocked_ips ETag."""
+    first = client.get('/api/blocked_ips')
+    database_service.add_blocked_ip('1.1.1.1')
+
+    second = client.get('/api/blocked_ips', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert second.json == {"version": 1, "blocked_ips": ['1.1.1.1']}
+
+def test_alerts_etag_changes_with_the_list(client):
+    """Test that alerting an IP invalidates the alerts ETag."""
+    first = client.get('/api/alerts')
+    database_service.add_alerted_ip('3.3.3.3', time.time() + 60)
+
+    second = client.get('/api/alerts', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert [alert['ip'] for alert in second.json['alerts']] == ['3.3.3.3']
+
+def test_blocked_ips_since_returns_delta(client):
+    """Test that ?since= returns only the blocklist changes after that version."""
+    database_service.add_blocked_ip('1.1.1.1')
+    version = client.get('/api/blocked_ips').json['version']
+    database_service.add_blocked_ip('2.2.2.2')
+    database_service.remove_blocked_ip('1.1.1.1')
+
+    response = client.get(f'/api/blocked_ips?since={version}')
+    assert response.status_code == 200
+    assert response.json == {
+        "version": version + 2,
+        "since": version,
+        "added": ['2.2.2.2'],
+        "removed": ['1.1.1.1']
+    }
+
+def test_alerts_since_returns_delta(client):
+    """Test that ?since= returns only the alert changes after that version."""
+    unblock_time = time.time() + 60
+    database_service.add_alerted_ip('3.3.3.3', unblock_time)
+    version = client.get('/api/alerts').json['version']
+    database_service.add_alerted_ip('4.4.4.4', unblock_time)
+    database_service.remove_alerted_ip('3.3.3.3')
+
+    response = client.get(f'/api/alerts?since={version}')
+    assert response.status_code == 200
+    body = response.json
+    assert body['version'] == version + 2
+    assert body['since'] == version
+    assert [alert['ip'] for alert in body['changed']] == ['4.4.4.4']
+    assert body['changed'][0]['unblock_time'] == unblock_time
+    assert body['removed'] == ['3.3.3.3']
+
+def test_since_etag_differs_from_full_list(client):
+    """Test that a delta and the full list never share an ETag."""
+    database_service.add_blocked_ip('1.1.1.1')
+    full = client.get('/api/blocked_ips')
+    delta = client.get('/api/blocked_ips?since=0', headers={'If-None-Match': full.headers['ETag']})
+    assert delta.status_code == 200
+    assert delta.headers['ETag'] != full.headers['ETag']
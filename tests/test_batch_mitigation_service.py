@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+from services.batch_mitigation_service import plan_mitigation, apply_plan, merge_plans
+
+def test_plan_uses_worst_score_per_ip():
+    """Test that each IP gets one action based on its lowest score in the batch."""
+    src_ips = ['1.1.1.1', '1.1.1.1', '2.2.2.2', '2.2.2.2', '3.3.3.3', '4.4.4.4']
+    scores = [0.90, 0.10, 0.50, 0.95, 0.80, 0.30]
+
+    plan = plan_mitigation(src_ips, scores)
+
+    assert plan['block'] == ['1.1.1.1']
+    assert plan['rate_limit'] == ['2.2.2.2', '4.4.4.4']  # 0.30 is rate-limited, not blocked
+    assert plan['allow'] == ['3.3.3.3']
+    assert plan['worst_scores']['1.1.1.1'] == 0.10
+    assert plan['counts'] == {"rows": 6, "ips": 4, "block": 1, "rate_limit": 2, "allow": 1}
+
+def test_apply_plan_calls_each_ip_once():
+    """Test that repeated rows from one IP only trigger a single mitigation call."""
+    plan = plan_mitigation(['5.5.5.5'] * 100 + ['6.6.6.6'] * 50, [0.05] * 100 + [0.45] * 50)
+    block_ip, rate_limit = MagicMock(), MagicMock()
+
+    counts = apply_plan(plan, block_ip=block_ip, rate_limit=rate_limit)
+
+    block_ip.assert_called_once_with('5.5.5.5')
+    rate_limit.assert_called_once_with('6.6.6.6')
+    assert counts['rows'] == 150
+
+def test_merge_plans_combines_disjoint_ips():
+    """Test that plans for separate IP sets merge into one plan with summed counts."""
+    first = plan_mitigation(['1.1.1.1', '2.2.2.2'], [0.1, 0.9])
+    second = plan_mitigation(['3.3.3.3', '3.3.3.3'], [0.5, 0.7])
+
+    merged = merge_plans([first, second])
+
+    assert merged['block'] == ['1.1.1.1']
+    assert merged['rate_limit'] == ['3.3.3.3']
+    assert merged['allow'] == ['2.2.2.2']
+    assert merged['worst_scores'] == {'1.1.1.1': 0.1, '2.2.2.2': 0.9, '3.3.3.3': 0.5}
+    assert merged['counts'] == {"rows": 4, "ips": 3, "block": 1, "rate_limit": 1, "allow": 1}
+
+def test_ip_state_remembers_recent_offenders():
+    """Test that an IP's running score keeps it mitigated for a while after a bad batch."""
+    from services.batch_mitigation_service import IPStateTracker
+    tracker = IPStateTracker(maxsize=10, decay=0.5)
+    first = tracker.plan(['1.1.1.1', '1.1.1.1', '2.2.2.2'], [0.9, 0.1, 0.9])
+    assert first['block'] == ['1.1.1.1']
+
+    second = tracker.plan(['1.1.1.1', '2.2.2.2'], [0.9, 0.9])
+    assert second['rate_limit'] == ['1.1.1.1']  # running score 0.5 is still below the rate limit threshold
+    assert second['worst_scores']['1.1.1.1'] == 0.5
+    assert tracker.get('1.1.1.1') == (0.5, 3)
+    assert second['counts']['rows'] == 2
+
+def test_ip_state_is_bounded():
+    """Test that the least recently seen IPs are forgotten beyond maxsize."""
+    from services.batch_mitigation_service import IPStateTracker
+    tracker = IPStateTracker(maxsize=2)
+    tracker.plan(['1.1.1.1', '2.2.2.2'], [0.9, 0.9])
+    tracker.plan(['3.3.3.3'], [0.9])
+    assert len(tracker) == 2 and tracker.get('1.1.1.1') is None
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Models import DropPackets
+from Models.zerotrustpacketanalyzer2 import calculate_trust_score, get_trust_level, process_dataset, score_frame
+from services.batch_scoring_service import run_pipeline
+
+ATTACKS = ["DDoS", "Normal", "XSS", "Port Scanning", "Unknown Attack", "Reconnaissance"]
+
+@pytest.fixture
+def packets_csv(tmp_path):
+    """Write 2,500 packets with known and unknown attack types."""
+    rng = np.random.default_rng(0)
+    rows = 2500
+    df = pd.DataFrame({
+        'packet_id': [f'pkt-{i}' for i in range(rows)],
+        'attack_type': rng.choice(ATTACKS, rows),
+        'confidence_score': rng.uniform(0, 100, rows).round(2),
+        'is_malicious': rng.integers(0, 2, rows),
+        'src_ip': '10.0.0.1'
+    })
+    path = tmp_path / 'packets.csv'
+    df.to_csv(path, index=False)
+    return path
+
+def test_score_frame_matches_row_scoring():
+    """Test that vectorized scores and levels equal the per-row functions."""
+    df = pd.DataFrame({
+        'packet_id': range(6),
+        'attack_type': pd.Categorical(ATTACKS),
+        'confidence_score': [100.0, 5.0, 55.5, 0.0, 99.9, 61.0]
+    })
+    scored = score_frame(df)
+    for row in scored.itertuples():
+        expected = calculate_trust_score(row.attack_type, row.confidence_score)
+        assert row.trust_score == pytest.approx(round(expected, 2))
+        assert row.trust_level == get_trust_level(expected)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pipeline_matches_analyzer_and_drop_packets(packets_csv, tmp_path, workers):
+    """Test that the streaming pipeline writes what process_dataset and drop_critical_packets produced."""
+    scores_path, filtered_path = tmp_path / 'scores.csv', tmp_path / 'filtered.csv'
+    report = run_pipeline(str(packets_csv), str(scores_path), str(filtered_path), chunk_rows=300, workers=workers)
+
+    expected_scores = pd.DataFrame(process_dataset(str(packets_csv)))
+    legacy_scores_path = tmp_path / 'legacy_scores.csv'
+    expected_scores.to_csv(legacy_scores_path, index=False)
+    expected_filtered = DropPackets.drop_critical_packets(str(legacy_scores_path)).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(pd.read_csv(scores_path), pd.read_csv(legacy_scores_path))
+    pd.testing.assert_frame_equal(pd.read_csv(filtered_path), expected_filtered)
+
+    assert report["rows"] == 2500
+    assert report["kept"] == len(expected_filtered)
+    assert report["dropped"] == 2500 - len(expected_filtered)
+    assert report["trust_levels"] == {
+        level: int((expected_scores['trust_level'] == level).sum()) for level in report["trust_levels"]
+    }
+    dropped = expected_scores[expected_scores['trust_score'] < DropPackets.CRITICAL_TRUST_SCORE]
+    assert {attack: data["count"] for attack, data in report["dropped_by_attack"].items()} == \
+        dropped['attack_type'].value_counts().to_dict()
+    assert set(report["stage_seconds"]) == {"read", "score", "filter", "format", "write"}
+
+def test_scores_file_is_optional(packets_csv, tmp_path):
+    """Test that only the filtered packets are written by default."""
+    filtered_path = tmp_path / 'filtered.csv'
+    report = run_pipeline(str(packets_csv), filtered_path=str(filtered_path), chunk_rows=1000, workers=1)
+    assert len(pd.read_csv(filtered_path)) == report["kept"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['filtered.csv', 'packets.csv']
@@ -0,0 +1,119 @@
+import threading
+import time
+import numpy as np
+import pytest
+from services.batching_service import MicroBatcher
+
+class RecordingModel:
+    """Sums each row and records the size of every batch it is called with."""
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, features):
+        self.batch_sizes.append(len(features))
+        return features.sum(axis=1)
+
+def test_results_are_routed_to_each_caller():
+    """Test that every caller receives the result for its own row."""
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=16, max_delay_ms=20, adaptive=False)
+    try:
+        futures = [batcher.submit([i, i]) for i in range(40)]
+        assert [f.result(timeout=2) for f in futures] == [2 * i for i in range(40)]
+    finally:
+        batcher.close()
+    assert max(model.batch_sizes) <= 16
+    assert len(model.batch_sizes) < 40
+
+def test_deadline_dispatches_partial_batch():
+    """Test that a lone row is answered after the deadline instead of waiting for a full batch."""
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=64, max_delay_ms=20, adaptive=False)
+    try:
+        started = time.monotonic()
+        assert batcher.predict([1, 2], timeout=2) == 3
+        assert time.monotonic() - started < 0.5
+    finally:
+        batcher.close()
+    assert model.batch_sizes == [1]
+
+def test_dict_results_and_errors():
+    """Test per-model dict results and that prediction errors reach the callers."""
+    batcher = MicroBatcher(lambda X: {"rf": X[:, 0], "svm": X[:, 1]}, max_delay_ms=5)
+    try:
+        assert batcher.predict([0.25, 0.75], timeout=2) == {"rf": 0.25, "svm": 0.75}
+    finally:
+        batcher.close()
+
+    def failing(X):
+        raise ValueError("model unavailable")
+    batcher = MicroBatcher(failing, max_delay_ms=5)
+    try:
+        with pytest.raises(ValueError):
+            batcher.predict([1.0], timeout=2)
+    finally:
+        batcher.close()
+
+def test_adapts_to_bursts_and_idle_traffic():
+    """Test that batch size grows under a burst and the delay shrinks when traffic is light."""
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=128, max_delay_ms=50, min_batch_size=4, min_delay_ms=1)
+    try:
+        batcher.batch_size = 8
+        threads = [threading.Thread(target=lambda: [batcher.submit([1.0]) for _ in range(250)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.predict([1.0], timeout=2)
+        assert max(model.batch_sizes) > 8
+
+        # A trickle of single requests should stop waiting for the full deadline
+        for _ in range(8):
+            batcher.predict([1.0], timeout=2)
+            time.sleep(0.06)
+        assert batcher.stats()["delay_ms"] < 50
+    finally:
+        batcher.close()
+    assert batcher.stats()["rows"] == 1009
+
+def test_submit_after_close_raises():
+    """Test that a closed batcher refuses new rows instead of returning a Future that never resolves."""
+    batcher = MicroBatcher(RecordingModel(), max_delay_ms=50, adaptive=False)
+    queued = batcher.submit([1, 2])
+    batcher.close()
+    assert queued.result(timeout=1) == 3
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit([1, 2])
+    batcher.close()
+
+def test_cancelled_futures_are_skipped():
+    """Test that a cancelled row is not predicted and does not stop the scheduler."""
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=16, max_delay_ms=100, adaptive=False)
+    try:
+        cancelled = batcher.submit([1, 1])
+        kept = batcher.submit([2, 2])
+        assert cancelled.cancel()
+        assert kept.result(timeout=2) == 4
+        assert batcher.submit([3, 3]).result(timeout=2) == 6
+    finally:
+        batcher.close()
+    assert model.batch_sizes[0] == 1
+
+def test_short_results_fail_the_batch_not_the_scheduler():
+    """Test that a predict_fn returning too few rows fails that batch and later batches still run."""
+    calls = []
+    def predict_fn(features):
+        calls.append(len(features))
+        return features.sum(axis=1)[:1] if len(calls) == 1 else features.sum(axis=1)
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=16, max_delay_ms=100, adaptive=False)
+    try:
+        first = [batcher.submit([i, i]) for i in range(3)]
+        for future in first:
+            with pytest.raises(ValueError, match="rows for a batch of 3"):
+                future.result(timeout=2)
+        assert batcher.submit([5, 5]).result(timeout=2) == 10
+    finally:
+        batcher.close()
@@ -0,0 +1,62 @@
+import threading
+import time
+import pytest
+from services.cache_service import LRUCache
+
+def test_lru_eviction_order():
+    """Test that the least recently used entry is evicted first."""
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+def test_get_or_compute_caches_value():
+    """Test that a computed value is reused and hit rate is tracked."""
+    cache = LRUCache(4)
+    calls = []
+    compute = lambda: calls.append(1) or 'value'
+    assert cache.get_or_compute('k', compute) == 'value'
+    assert cache.get_or_compute('k', compute) == 'value'
+    assert len(calls) == 1
+    assert cache.stats()['hit_rate'] == 0.5
+
+def test_get_or_compute_single_flight():
+    """Test that concurrent callers for the same key share one computation."""
+    cache = LRUCache(4)
+    calls = []
+    def slow_compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return 42
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k', slow_compute)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+
+def test_get_or_compute_propagates_errors():
+    """Test that a failed computation is not cached."""
+    cache = LRUCache(4)
+    def failing():
+        raise RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('k', failing)
+    assert cache.get_or_compute('k', lambda: 'ok') == 'ok'
+
+def test_put_if_absent_keeps_the_first_value():
+    """Test that put_if_absent stores a key once and reports later attempts."""
+    cache = LRUCache(2)
+    assert cache.put_if_absent('a', 1)
+    assert not cache.put_if_absent('a', 2)
+    assert cache.get('a') == 1
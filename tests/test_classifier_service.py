@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+from sklearn.preprocessing import MinMaxScaler
+from services import classifier_service
+from services.classifier_service import LiveClassifier
+
+FEATURES = ['f0', 'f1', 'f2', 'f3']
+CLASS_NAMES = {0: 'Normal', 1: 'DDoS', 2: 'Botnet'}
+
+@pytest.fixture
+def trained():
+    """Provide a scaler, two tree models and training data with classes 0-2."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 4)) * 50, columns=FEATURES)
+    y = (X['f0'] > 0).astype(int) + (X['f1'] > 20).astype(int)
+    scaler = MinMaxScaler().fit(X.to_numpy())
+    models = [
+        RandomForestClassifier(n_estimators=10, random_state=0).fit(scaler.transform(X.to_numpy()), y),
+        ExtraTreesClassifier(n_estimators=10, random_state=0).fit(scaler.transform(X.to_numpy()), y),
+    ]
+    return scaler, models, X
+
+@pytest.fixture
+def classifier(trained):
+    scaler, models, _ = trained
+    return LiveClassifier(FEATURES, scaler, models, CLASS_NAMES, capacity=4)
+
+def test_classify_matches_soft_vote(classifier, trained):
+    """Test that records are scored with the averaged probabilities of all models."""
+    scaler, models, X = trained
+    rows = X.iloc[:10]
+    result = classifier.classify(rows.to_dict('records'))
+
+    scaled = scaler.transform(rows.to_numpy(dtype=np.float32))
+    proba = sum(m.predict_proba(scaled) for m in models) / len(models)
+    expected_labels = [CLASS_NAMES[c] for c in proba.argmax(axis=1)]
+    assert list(result['attack_type']) == expected_labels
+    np.testing.assert_allclose(result['confidence_score'], 100 * proba.max(axis=1), rtol=1e-6)
+
+def test_frame_and_records_agree(classifier, trained):
+    """Test that DataFrame and dict inputs give the same predictions."""
+    _, _, X = trained
+    rows = X.iloc[:25]
+    from_frame = classifier.classify_frame(rows)
+    from_records = classifier.classify(rows.to_dict('records'))
+    assert list(from_frame['attack_type']) == list(from_records['attack_type'])
+    np.testing.assert_allclose(from_frame['confidence_score'], from_records['confidence_score'])
+
+def test_missing_and_bad_values_become_zero(classifier):
+    """Test that missing, non-numeric and unknown fields do not break feature building."""
+    features = classifier.collate([
+        {'f0': 5, 'f1': 'abc', 'f2': None, 'extra': 7},
+        {'f3': '2.5'},
+    ])
+    assert features.dtype == np.float32
+    np.testing.assert_array_equal(features, [[5, 0, 0, 0], [0, 0, 0, 2.5]])
+
+def test_feature_matrix_is_reused(classifier):
+    """Test that the preallocated matrix is reused and only grows for larger batches."""
+    first = classifier.collate([{'f0': 1}])
+    second = classifier.collate([{'f0': 2}, {'f0': 3}])
+    assert np.shares_memory(first, second)
+    grown = classifier.collate([{'f0': i} for i in range(10)])
+    assert len(grown) == 10 and classifier._matrix.shape[0] >= 10
+
+def test_unmapped_classes_are_unknown(trained):
+    """Test that class codes without a configured name are reported as Unknown."""
+    scaler, models, _ = trained
+    classifier = LiveClassifier(FEATURES, scaler, models, {0: 'Normal'})
+    assert list(classifier.labels) == ['Normal', 'Unknown', 'Unknown']
+
+def test_score_packet(classifier, trained):
+    """Test that score_packet overrides the precomputed prediction through the micro-batcher."""
+    _, _, X = trained
+    features = X.iloc[0].to_dict()
+    expected = classifier.classify([features])
+    packet = {'src_ip': '10.0.0.1', 'attack_type': 'Normal', 'confidence_score': 1.0}
+
+    with patch.object(classifier_service, 'LIVE_CLASSIFIER_ENABLED', True), \
+         patch.object(classifier_service, 'load_classifier', return_value=classifier), \
+         patch.object(classifier_service, '_batcher', None):
+        scored = classifier_service.score_packet(packet, features)
+        classifier_service._batcher.close()
+
+    assert scored['src_ip'] == '10.0.0.1'
+    assert scored['attack_type'] == expected['attack_type'][0]
+    assert scored['confidence_score'] == pytest.approx(expected['confidence_score'][0])
+    assert isinstance(scored['confidence_score'], float)
+
+def test_score_packet_disabled_or_failing():
+    """Test that the packet is returned unchanged when the classifier is off or fails."""
+    packet = {'src_ip': '10.0.0.1', 'attack_type': 'DDoS', 'confidence_score': 90.0}
+    assert classifier_service.score_packet(packet, {}) is packet
+    with patch.object(classifier_service, 'LIVE_CLASSIFIER_ENABLED', True), \
+         patch.object(classifier_service, 'get_batcher', side_effect=FileNotFoundError('missing')):
+        assert classifier_service.score_packet(packet, {}) is packet
+
+def test_prediction_cache_skips_repeated_rows(trained):
+    """Test that repeated feature vectors are served from the prediction cache."""
+    from services.prediction_cache import PredictionCache
+    scaler, models, X = trained
+    cached = LiveClassifier(FEATURES, scaler, models, CLASS_NAMES, cache=PredictionCache(maxsize=100))
+    plain = LiveClassifier(FEATURES, scaler, models, CLASS_NAMES)
+    records = X.iloc[:5].to_dict('records') * 3
+
+    result = cached.classify(records)
+    expected = plain.classify(records)
+    assert list(result['attack_type']) == list(expected['attack_type'])
+    np.testing.assert_allclose(result['confidence_score'], expected['confidence_score'])
+    assert cached.cache.stats()['inferred_rows'] == 5
@@ -104,3 +104,42 @@ def test_get_next_packet_by_ip(mock_read_csv):
     packet, index = get_next_packet_by_ip(df, len(df), '10.0.0.1')
     assert packet is None
     assert index == len(df)
+
+def test_get_next_packet_by_src_ip_and_records():
+    """Test source-IP lookups and that packets come back as plain dicts."""
+    df = pd.DataFrame({
+        'src_ip': ['1.1.1.1', '2.2.2.2', None, '1.1.1.1', '2.2.2.2'],
+        'dst_ip': ['10.0.0.1'] * 5,
+        'port': [22, 80, 443, 22, 8080]
+    })
+
+    packet, index = get_next_packet_by_ip(df, 2, '2.2.2.2', column='src_ip')
+    assert index == 4
+    assert packet == {'src_ip': '2.2.2.2', 'dst_ip': '10.0.0.1', 'port': 8080}
+    assert type(packet['port']) is int
+
+    packet, index = get_next_packet_by_ip(df, 4, '1.1.1.1', column='src_ip')
+    assert packet is None and index == 4
+
+    assert isinstance(get_packet_by_index(df, 1), dict)
+
+def test_position_index_is_built_once():
+    """Test that the per-IP index is reused for the same DataFrame."""
+    from services.data_service import get_position_index
+    df = pd.DataFrame({'dst_ip': ['10.0.0.1', '10.0.0.2'] * 50})
+    index = get_position_index(df)
+    assert get_position_index(df) is index
+    assert index.positions['dst_ip']['10.0.0.2'].tolist() == list(range(1, 100, 2))
+    assert get_position_index(df.copy()) is not index
+
+def test_position_index_is_rebuilt_after_changes():
+    """Test that new columns rebuild the index and in-place edits rebuild it once invalidated."""
+    from services.data_service import get_position_index, invalidate_position_index
+    df = pd.DataFrame({'dst_ip': ['10.0.0.1', '10.0.0.2'] * 5})
+    index = get_position_index(df)
+    df['src_ip'] = '1.1.1.1'
+    assert get_position_index(df) is not index
+
+    df.loc[0, 'dst_ip'] = '10.0.0.9'
+    invalidate_position_index(df)
+    assert get_position_index(df).next_position('dst_ip', '10.0.0.9', 0) == 0
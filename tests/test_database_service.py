@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import patch
+from services import database_service
+from services.database_service import BLOCKED_LIST, ALERTED_LIST
+
+# Point the database service at a fresh temporary database for every test
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path):
+    with patch('services.database_service.DATABASE_NAME', str(tmp_path / 'test.db')):
+        database_service.init_db()
+        yield
+
+def test_state_version_starts_at_zero():
+    """Test that untouched lists report version 0."""
+    assert database_service.get_state_version(BLOCKED_LIST) == 0
+    assert database_service.get_state_version(ALERTED_LIST) == 0
+
+def test_blocklist_changes_bump_version():
+    """Test that only real blocklist changes increase the version."""
+    database_service.add_blocked_ip('1.1.1.1')
+    assert database_service.get_state_version(BLOCKED_LIST) == 1
+
+    # Re-adding an existing IP is not a change
+    database_service.add_blocked_ip('1.1.1.1')
+    assert database_service.get_state_version(BLOCKED_LIST) == 1
+
+    database_service.remove_blocked_ip('1.1.1.1')
+    assert database_service.get_state_version(BLOCKED_LIST) == 2
+
+    # Removing an unknown IP is not a change
+    database_service.remove_blocked_ip('9.9.9.9')
+    assert database_service.get_state_version(BLOCKED_LIST) == 2
+    assert database_service.get_state_version(ALERTED_LIST) == 0
+
+def test_state_changes_since_version():
+    """Test that deltas only contain the latest change per IP after a version."""
+    database_service.add_blocked_ip('1.1.1.1')
+    database_service.add_blocked_ip('2.2.2.2')
+    version = database_service.get_state_version(BLOCKED_LIST)
+
+    database_service.remove_blocked_ip('1.1.1.1')
+    database_service.add_blocked_ip('3.3.3.3')
+
+    changes = database_service.get_state_changes(BLOCKED_LIST, version)
+    assert [(c['ip'], c['op']) for c in changes] == [('1.1.1.1', 'removed'), ('3.3.3.3', 'added')]
+    assert database_service.get_state_changes(BLOCKED_LIST, database_service.get_state_version(BLOCKED_LIST)) == []
+
+def test_alert_updates_and_clear_are_recorded():
+    """Test that alert refreshes and bulk clears show up in the delta."""
+    database_service.add_alerted_ip('4.4.4.4', 100.0)
+    database_service.add_alerted_ip('4.4.4.4', 200.0)
+    database_service.add_alerted_ip('5.5.5.5', 300.0)
+
+    changes = database_service.get_state_changes(ALERTED_LIST, 0)
+    assert {c['ip']: c['unblock_time'] for c in changes} == {'4.4.4.4': 200.0, '5.5.5.5': 300.0}
+
+    version = database_service.get_state_version(ALERTED_LIST)
+    database_service.clear_alerted_ips()
+    assert database_service.get_state_version(ALERTED_LIST) == version + 1
+    changes = database_service.get_state_changes(ALERTED_LIST, version)
+    assert sorted(c['ip'] for c in changes) == ['4.4.4.4', '5.5.5.5']
+    assert all(c['op'] == 'removed' for c in changes)
@@ -0,0 +1,122 @@
+import mmap
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from services import dataset_cache
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """Write a small CSV with numeric, text and missing values and cache into tmp_path."""
+    monkeypatch.setattr(dataset_cache, 'DATASET_CACHE_DIR', str(tmp_path / 'cache'))
+    df = pd.DataFrame({
+        'src_ip': ['10.0.0.1', '10.0.0.2', None, '10.0.0.1'],
+        'port': [22, 80, 443, 22],
+        'confidence_score': [90.5, 12.0, np.nan, 88.25],
+        'attack_type': ['DDoS', 'Normal', 'Normal', 'DDoS'],
+    })
+    path = tmp_path / 'traffic.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+def test_round_trip_matches_csv(source):
+    """Test that the npy cache loads the same data as parsing the CSV."""
+    meta = dataset_cache.build_cache(source, 'npy')
+    assert meta['rows'] == 4
+    cached = dataset_cache.load_cache(source)
+    expected = pd.read_csv(source)
+    assert list(cached.columns) == list(expected.columns)
+    np.testing.assert_array_equal(cached['port'].to_numpy(), expected['port'].to_numpy())
+    np.testing.assert_array_equal(cached['confidence_score'].to_numpy(), expected['confidence_score'].to_numpy())
+    assert cached['src_ip'].tolist()[:2] == ['10.0.0.1', '10.0.0.2']
+    assert pd.isna(cached['src_ip'].iloc[2])
+    assert cached.iloc[3]['attack_type'] == 'DDoS'
+
+def test_column_projection_and_memory_mapping(source):
+    """Test that only requested columns are loaded and numeric ones are memory-mapped."""
+    dataset_cache.build_cache(source, 'npy')
+    cached = dataset_cache.load_cache(source, columns=['port'])
+    assert list(cached.columns) == ['port']
+    backing = cached['port'].to_numpy()
+    while isinstance(backing, np.ndarray) and not isinstance(backing, np.memmap):
+        backing = backing.base
+    assert isinstance(backing, (np.memmap, mmap.mmap))
+    with pytest.raises(KeyError):
+        dataset_cache.load_cache(source, columns=['missing'])
+
+def test_loaded_frame_is_writable_without_changing_cache(source):
+    """Test that copy-on-write maps let callers modify the DataFrame but not the cache."""
+    dataset_cache.build_cache(source, 'npy')
+    cached = dataset_cache.load_cache(source)
+    cached.loc[0, 'port'] = 9999
+    assert dataset_cache.load_cache(source)['port'].iloc[0] == 22
+
+def test_cache_is_invalidated_by_source_changes(source):
+    """Test that an edited source makes the cache stale while a touch does not."""
+    dataset_cache.build_cache(source, 'npy')
+    assert dataset_cache.is_fresh(source) is not None
+
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert dataset_cache.is_fresh(source) is not None
+
+    with open(source, 'a') as f:
+        f.write('10.0.0.9,8080,50.0,DDoS\n')
+    assert dataset_cache.is_fresh(source) is None
+
+def test_read_dataset_uses_cache_or_csv(source, monkeypatch):
+    """Test that read_dataset parses the CSV without a cache and reads the cache once built."""
+    assert len(dataset_cache.read_dataset(source)) == 4
+    assert dataset_cache.is_fresh(source) is None
+
+    dataset_cache.build_cache(source, 'npy')
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: pytest.fail("CSV should not be parsed"))
+    df = dataset_cache.read_dataset(source, columns=['src_ip', 'port'])
+    assert list(df.columns) == ['src_ip', 'port']
+
+def test_auto_build(source, monkeypatch):
+    """Test that a missing cache is built on first read when auto-build is enabled."""
+    monkeypatch.setattr(dataset_cache, 'DATASET_CACHE_AUTO_BUILD', True)
+    dataset_cache.read_dataset(source)
+    assert dataset_cache.is_fresh(source) is not None
+
+def test_pyarrow_formats_require_pyarrow(source):
+    """Test that feather/parquet either round-trip or explain that pyarrow is needed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match='pyarrow'):
+            dataset_cache.build_cache(source, 'parquet')
+        return
+    dataset_cache.build_cache(source, 'parquet')
+    assert dataset_cache.load_cache(source, columns=['port'])['port'].tolist() == [22, 80, 443, 22]
+
+def test_mixed_type_columns_keep_their_values(tmp_path, monkeypatch):
+    """Test that text columns mixing numbers and strings load back with the original values and types."""
+    monkeypatch.setattr(dataset_cache, 'DATASET_CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'mixed.csv'
+    pd.DataFrame({'x': [1]}).to_csv(path, index=False)
+    monkeypatch.setattr(dataset_cache.pd, 'read_csv', lambda *args, **kwargs: pd.DataFrame({
+        'code': pd.Series([1, '1', 2.5, True, None], dtype=object)
+    }))
+    dataset_cache.build_cache(str(path), 'npy')
+    loaded = dataset_cache.load_cache(str(path))['code'].tolist()
+    assert loaded[:4] == [1, '1', 2.5, True]
+    assert [type(v) for v in loaded[:4]] == [int, str, float, bool]
+    assert pd.isna(loaded[4])
+
+def test_unstorable_values_are_refused(tmp_path, monkeypatch):
+    """Test that an npy cache is not built for object values JSON cannot hold."""
+    monkeypatch.setattr(dataset_cache, 'DATASET_CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'stamps.csv'
+    pd.DataFrame({'x': [1]}).to_csv(path, index=False)
+    monkeypatch.setattr(dataset_cache.pd, 'read_csv', lambda *args, **kwargs: pd.DataFrame({
+        'when': pd.Series([pd.Timestamp('2024-01-01'), 'later'], dtype=object)
+    }))
+    with pytest.raises(ValueError, match="when"):
+        dataset_cache.build_cache(str(path), 'npy')
+
+def test_default_cache_dir_is_under_the_repository(tmp_path, monkeypatch):
+    """Test that the configured relative cache directory does not depend on the working directory."""
+    monkeypatch.chdir(tmp_path)
+    assert dataset_cache.cache_path('traffic.csv').startswith(os.path.join(dataset_cache.BASE_DIR, '.dataset_cache'))
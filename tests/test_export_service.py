@@ -0,0 +1,65 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from unittest.mock import patch
+from services.export_service import (
+    iter_log_rows, iter_decision_rows, stream_export, parse_time,
+    LOG_EXPORT_FIELDS, DECISION_EXPORT_FIELDS
+)
+
+@pytest.fixture
+def packet_logs():
+    return [
+        {"attack_prediction": "Normal", "action": "Allow", "trust_level": "Trusted", "trust_score": "95.00",
+         "confidence": "5.00%", "ingested_at": 100.0, "details": {"src_ip": "1.1.1.1", "dst_ip": "10.0.0.1"}},
+        {"attack_prediction": "DDoS", "action": "Block", "trust_level": "Critical Risk", "trust_score": "9.75",
+         "confidence": "95.00%", "ingested_at": 200.0, "details": {"src_ip": "2.2.2.2", "dst_ip": "10.0.0.1"}},
+        {"attack_prediction": "DDoS", "action": "Block", "trust_level": "Critical Risk", "trust_score": "9.75",
+         "confidence": "95.00%", "ingested_at": 300.0, "details": {"src_ip": "3.3.3.3", "dst_ip": "10.0.0.2"}},
+    ]
+
+def test_iter_log_rows_filters(packet_logs):
+    """Test that filters and time ranges select the expected rows."""
+    assert len(list(iter_log_rows(packet_logs))) == 3
+    assert [r['src_ip'] for r in iter_log_rows(packet_logs, action='Block')] == ['2.2.2.2', '3.3.3.3']
+    assert [r['src_ip'] for r in iter_log_rows(packet_logs, start=150, end=250)] == ['2.2.2.2']
+    assert [r['src_ip'] for r in iter_log_rows(packet_logs, src_ip='1.1.1.1')] == ['1.1.1.1']
+
+def test_parse_time():
+    """Test parsing of epoch and ISO 8601 times."""
+    assert parse_time(None) is None
+    assert parse_time('123.5') == 123.5
+    assert parse_time('1970-01-01T00:00:10+00:00') == 10
+
+def test_stream_ndjson(packet_logs):
+    """Test that NDJSON output has one JSON document per row."""
+    chunks = list(stream_export(iter_log_rows(packet_logs), 'ndjson', LOG_EXPORT_FIELDS))
+    assert len(chunks) == 3
+    assert json.loads(chunks[1])['attack_prediction'] == 'DDoS'
+
+def test_stream_csv_gzip(packet_logs):
+    """Test that gzip-compressed CSV output round-trips."""
+    chunks = stream_export(iter_log_rows(packet_logs), 'csv', LOG_EXPORT_FIELDS, compress=True)
+    text = gzip.decompress(b''.join(chunks)).decode('utf-8')
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [r['src_ip'] for r in rows] == ['1.1.1.1', '2.2.2.2', '3.3.3.3']
+    assert rows[0]['action'] == 'Allow'
+
+def test_stream_export_rejects_unknown_format(packet_logs):
+    """Test that an unsupported format raises a ValueError."""
+    with pytest.raises(ValueError):
+        stream_export(iter_log_rows(packet_logs), 'xml', LOG_EXPORT_FIELDS)
+
+def test_iter_decision_rows():
+    """Test that decisions combine blocked and alerted IPs."""
+    with patch('services.export_service.database_service') as mock_db:
+        mock_db.iter_blocked_ips.return_value = iter(['1.1.1.1'])
+        mock_db.iter_alerted_ips.return_value = iter([{'ip': '2.2.2.2', 'unblock_time': 50.0}])
+        rows = list(iter_decision_rows())
+    assert rows == [
+        {'list': 'blocked', 'ip': '1.1.1.1', 'unblock_time': None},
+        {'list': 'alerted', 'ip': '2.2.2.2', 'unblock_time': 50.0}
+    ]
+    assert list(rows[0].keys()) == DECISION_EXPORT_FIELDS
@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from services.forwarding_service import Forwarder
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    batches = []
+    status_codes = []  # Answers to give before returning 200
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        status = DashboardHandler.status_codes.pop(0) if DashboardHandler.status_codes else 200
+        if status == 200:
+            DashboardHandler.batches.append(body["packets"])
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def dashboard_url():
+    """Run a local HTTP server standing in for the dashboard's batch ingest endpoint."""
+    DashboardHandler.batches = []
+    DashboardHandler.status_codes = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DashboardHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/ingest/batch"
+    server.shutdown()
+    server.server_close()
+
+def received():
+    return [packet["id"] for batch in DashboardHandler.batches for packet in batch]
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_payloads_are_posted_in_batches(dashboard_url):
+    """Test that submitted payloads arrive in order, grouped into few posts."""
+    forwarder = Forwarder(dashboard_url, workers=1, batch_size=10, max_delay_ms=50)
+    for i in range(25):
+        assert forwarder.submit({"id": i})
+    forwarder.close(timeout=5)
+
+    assert received() == list(range(25))
+    assert len(DashboardHandler.batches) < 25
+    assert all(len(batch) <= 10 for batch in DashboardHandler.batches)
+    assert forwarder.stats()["sent"] == 25
+
+def test_server_errors_are_retried(dashboard_url):
+    """Test that a batch is retried after 5xx answers."""
+    DashboardHandler.status_codes = [503, 500]
+    forwarder = Forwarder(dashboard_url, workers=1, backoff=0.01, max_retries=3)
+    forwarder.submit({"id": 1})
+    assert wait_for(lambda: received() == [1])
+    forwarder.close(timeout=5)
+    assert forwarder.stats()["retries"] == 2
+
+def test_rejected_batches_are_dropped(dashboard_url, tmp_path):
+    """Test that a 4xx answer is not retried or spilled."""
+    DashboardHandler.status_codes = [400]
+    spill_path = tmp_path / "spill.ndjson"
+    forwarder = Forwarder(dashboard_url, spill_path=str(spill_path), workers=1, backoff=0.01)
+    forwarder.submit({"id": 1})
+    assert wait_for(lambda: forwarder.stats()["dropped"] == 1)
+    forwarder.close(timeout=5)
+    assert forwarder.stats()["retries"] == 0
+    assert not spill_path.exists()
+
+def test_spilled_payloads_are_replayed(dashboard_url, tmp_path):
+    """Test that batches that exhaust their retries are spilled and resent once the dashboard recovers."""
+    DashboardHandler.status_codes = [503, 503]
+    spill_path = tmp_path / "spill.ndjson"
+    forwarder = Forwarder(dashboard_url, spill_path=str(spill_path), workers=1, max_delay_ms=1,
+                          backoff=0.01, max_retries=1, circuit_reset=0.05)
+    forwarder.submit({"id": 1})
+    assert wait_for(lambda: forwarder.stats()["spilled"] == 1)
+    assert [json.loads(line)["id"] for line in spill_path.read_text().splitlines()] == [1]
+
+    time.sleep(0.1)
+    forwarder.submit({"id": 2})
+    assert wait_for(lambda: sorted(received()) == [1, 2])
+    forwarder.close(timeout=5)
+    assert forwarder.stats()["replayed"] == 1
+    assert not spill_path.exists()
+
+def test_payloads_carry_unique_forward_ids(dashboard_url):
+    """Test that each payload gets a forward_id the dashboard can deduplicate retries with."""
+    forwarder = Forwarder(dashboard_url, workers=1)
+    for i in range(5):
+        forwarder.submit({"id": i})
+    forwarder.submit({"id": 5, "forward_id": "kept"})
+    forwarder.close(timeout=5)
+    ids = [packet["forward_id"] for batch in DashboardHandler.batches for packet in batch]
+    assert len(set(ids)) == 6 and ids[-1] == "kept"
+
+def test_failed_replay_spills_the_rest_of_the_file(dashboard_url, tmp_path):
+    """Test that replay posts the spill file batch by batch and keeps what was not delivered."""
+    spill_path = tmp_path / "spill.ndjson"
+    spill_path.write_text("".join(json.dumps({"id": i}) + "\n" for i in range(25)) + '{"id": 9')
+    DashboardHandler.status_codes = [200, 200, 503]
+    forwarder = Forwarder(dashboard_url, spill_path=str(spill_path), workers=1, batch_size=10, max_delay_ms=1)
+    forwarder.submit({"id": 100})
+    assert wait_for(lambda: forwarder.stats()["replayed"] == 10 and forwarder.stats()["spilled"] > 0)
+    forwarder.close(timeout=5)
+
+    assert received() == [100, *range(10)]
+    lines = spill_path.read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines[:15]] == list(range(10, 25))
+    assert lines[15:] == ['{"id": 9']
+
+def test_unreachable_dashboard_spills_without_blocking(tmp_path):
+    """Test that submit returns immediately and payloads are spilled while the dashboard is down."""
+    spill_path = tmp_path / "spill.ndjson"
+    forwarder = Forwarder('http://127.0.0.1:9/api/ingest/batch', spill_path=str(spill_path), workers=1,
+                          max_delay_ms=1, backoff=0.01, max_retries=1, timeout=0.5, circuit_reset=60)
+    started = time.monotonic()
+    for i in range(50):
+        forwarder.submit({"id": i})
+    assert time.monotonic() - started < 0.5
+    forwarder.close(timeout=5)
+
+    spilled = [json.loads(line)["id"] for line in spill_path.read_text().splitlines()]
+    assert sorted(spilled) == list(range(50))
+    assert forwarder.stats()["circuit"] == "open"
+
+def test_full_queue_spills_to_disk(tmp_path):
+    """Test that payloads beyond the queue size go straight to the spill file."""
+    spill_path = tmp_path / "spill.ndjson"
+    forwarder = Forwarder('http://127.0.0.1:9/api/ingest/batch', spill_path=str(spill_path), workers=0, queue_size=2)
+    assert forwarder.submit({"id": 0}) and forwarder.submit({"id": 1})
+    assert not forwarder.submit({"id": 2})
+    assert [json.loads(line)["id"] for line in spill_path.read_text().splitlines()] == [2]
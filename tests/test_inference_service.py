@@ -0,0 +1,175 @@
+import time
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from services.inference_service import ModelRunner, CascadeRunner
+
+class SlowModel:
+    def predict_proba(self, features):
+        time.sleep(1.0)
+        return np.zeros((len(features), 2))
+
+class BrokenModel:
+    def predict_proba(self, features):
+        raise ValueError("corrupt model")
+
+@pytest.fixture(scope='module')
+def trained():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 5))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+    models = {
+        "log_reg": LogisticRegression().fit(X, y),
+        "tree": DecisionTreeClassifier(max_depth=3, random_state=0).fit(X, y)
+    }
+    return models, X
+
+@pytest.mark.parametrize('mode', ['serial', 'thread', 'process'])
+def test_modes_match_direct_predictions(trained, mode):
+    """Test that every executor mode returns the same probabilities as calling the models directly."""
+    models, X = trained
+    runner = ModelRunner(models, mode=mode, workers=2, timeout=30)
+    try:
+        preds = runner.predict(X)
+    finally:
+        runner.close()
+
+    assert set(preds) == {"log_reg", "tree"}
+    for name, model in models.items():
+        np.testing.assert_allclose(preds[name], model.predict_proba(X)[:, 1])
+    assert set(runner.last_timings) == {"log_reg", "tree"}
+    assert runner.last_failures == {}
+
+def test_failed_and_slow_models_are_skipped(trained):
+    """Test that a failing or slow model is left out instead of stalling the batch."""
+    models, X = trained
+    runner = ModelRunner({**models, "slow": SlowModel(), "broken": BrokenModel()},
+                         mode='thread', workers=4, timeout=0.3)
+    started = time.monotonic()
+    try:
+        preds = runner.predict(X)
+    finally:
+        runner.close()
+
+    assert time.monotonic() - started < 0.9
+    assert set(preds) == {"log_reg", "tree"}
+    assert set(runner.last_failures) == {"slow", "broken"}
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_timed_out_workers_do_not_block_later_batches(trained, mode):
+    """Test that the pool is replaced after a timeout so the next batch gets free workers."""
+    models, X = trained
+    runner = ModelRunner({"slow": SlowModel(), "log_reg": models["log_reg"]}, mode=mode, workers=1, timeout=0.5)
+    try:
+        runner.predict(X, names=["log_reg"])  # start the worker
+        with pytest.raises(RuntimeError):
+            runner.predict(X, names=["slow"])
+        started = time.monotonic()
+        preds = runner.predict(X, names=["log_reg"])
+    finally:
+        runner.close()
+
+    assert time.monotonic() - started < 0.5
+    assert set(preds) == {"log_reg"}
+    assert runner.pool_restarts == 1
+
+def test_all_models_failing_raises(trained):
+    """Test that a batch with no usable model raises."""
+    _, X = trained
+    runner = ModelRunner({"broken": BrokenModel()}, mode='serial')
+    with pytest.raises(RuntimeError):
+        runner.predict(X)
+
+def test_unknown_mode_rejected(trained):
+    """Test that an unsupported executor mode is rejected."""
+    models, _ = trained
+    with pytest.raises(ValueError):
+        ModelRunner(models, mode='gpu')
+
+def test_loader_defers_model_loading(trained):
+    """Test that models given by name are only loaded on the first prediction."""
+    models, X = trained
+    loaded = []
+    def loader(name):
+        loaded.append(name)
+        return models[name]
+
+    runner = ModelRunner(["log_reg", "tree"], mode='serial', loader=loader)
+    assert loaded == []
+    preds = runner.predict(X)
+    runner.predict(X)
+    assert loaded == ["log_reg", "tree"]
+    np.testing.assert_allclose(preds["tree"], models["tree"].predict_proba(X)[:, 1])
+
+@pytest.mark.parametrize('mode', ['serial', 'process'])
+def test_reload_models_uses_the_loaders_current_models(trained, mode):
+    """Test that reload_models makes the next batch use the models the loader returns now."""
+    models, X = trained
+    current = {"m": models["log_reg"]}
+    runner = ModelRunner(["m"], mode=mode, workers=1, timeout=30, loader=current.__getitem__)
+    try:
+        runner.predict(X)
+        current["m"] = models["tree"]
+        runner.reload_models()
+        preds = runner.predict(X)
+    finally:
+        runner.close()
+    np.testing.assert_allclose(preds["m"], models["tree"].predict_proba(X)[:, 1])
+
+class FixedModel:
+    """Returns preset positive-class probabilities and records how many rows it saw."""
+    def __init__(self, proba):
+        self.proba = np.asarray(proba, dtype=float)
+        self.rows_seen = []
+
+    def predict_proba(self, features):
+        rows = np.asarray(features)[:, 0].astype(int)
+        self.rows_seen.append(len(rows))
+        p = self.proba[rows]
+        return np.column_stack([1 - p, p])
+
+def test_cascade_escalates_only_uncertain_rows():
+    """Test that only rows inside the uncertainty band reach the expensive models."""
+    X = np.arange(5).reshape(-1, 1)
+    cheap = FixedModel([0.01, 0.5, 0.99, 0.3, 0.95])
+    expensive = FixedModel([0.9, 0.9, 0.9, 0.1, 0.9])
+    runner = ModelRunner({"cheap": cheap, "rf": expensive}, mode='serial')
+    cascade = CascadeRunner(runner, cheap_model="cheap", band=(0.2, 0.8))
+
+    preds = cascade.predict(X)
+
+    assert expensive.rows_seen == [2]
+    np.testing.assert_allclose(preds["cheap"], [0.01, 0.5, 0.99, 0.3, 0.95])
+    np.testing.assert_allclose(preds["rf"], [0.01, 0.9, 0.99, 0.1, 0.95])
+    assert cascade.stats()["escalation_rate"] == pytest.approx(0.4)
+
+def test_cascade_leaves_out_failed_expensive_models():
+    """Test that an expensive model failing on the escalated rows is dropped instead of copying the cheap model."""
+    X = np.arange(3).reshape(-1, 1)
+    cheap = FixedModel([0.01, 0.5, 0.4])
+    expensive = FixedModel([0.9, 0.9, 0.9])
+    runner = ModelRunner({"cheap": cheap, "rf": expensive, "broken": BrokenModel()}, mode='serial')
+    preds = CascadeRunner(runner, cheap_model="cheap", band=(0.2, 0.8)).predict(X)
+    assert set(preds) == {"cheap", "rf"}
+    np.testing.assert_allclose(preds["rf"], [0.01, 0.9, 0.9])
+    assert set(runner.last_failures) == {"broken"}
+
+    only_broken = ModelRunner({"cheap": cheap, "broken": BrokenModel()}, mode='serial')
+    assert set(CascadeRunner(only_broken, cheap_model="cheap").predict(X)) == {"cheap"}
+
+def test_cascade_audit_measures_agreement():
+    """Test that audits compare the cascade's ensemble calls with the full ensemble."""
+    X = np.arange(4).reshape(-1, 1)
+    cheap = FixedModel([0.1, 0.9, 0.1, 0.5])
+    expensive = FixedModel([0.9, 0.9, 0.1, 0.9])
+    runner = ModelRunner({"cheap": cheap, "rf": expensive}, mode='serial')
+    mean_ensemble = lambda preds: np.mean(list(preds.values()), axis=0)
+    cascade = CascadeRunner(runner, cheap_model="cheap", band=(0.2, 0.8), combine=mean_ensemble, audit_every=1)
+
+    cascade.predict(X)
+
+    # Row 0 is confidently benign to the cheap model but the full ensemble averages to 0.5
+    stats = cascade.stats()
+    assert stats["audited_rows"] == 4
+    assert stats["agreement_with_full_ensemble"] == pytest.approx(0.75)
@@ -0,0 +1,99 @@
+import time
+import pytest
+from llm_stub_server import start_stub_server
+from services.circuit_breaker import CircuitBreaker
+from services.llm_service import build_prompt, estimate_tokens, HTTPSummarizer, SummarizerError
+
+@pytest.fixture
+def aggregates():
+    return {
+        "total": 5000,
+        "predictions": {"DDoS": 3000, "Normal": 2000},
+        "actions": {"Block": 3000, "Allow": 2000},
+        "trust_levels": {"Critical Risk": 3000, "Trusted": 2000},
+        "top_src_ips": [(f"10.0.{i}.1", 100 - i) for i in range(50)],
+        "breakdown": [
+            {"prediction": "DDoS", "action": "Block", "trust_level": "Critical Risk", "count": 3000},
+            {"prediction": "Normal", "action": "Allow", "trust_level": "Trusted", "count": 2000}
+        ]
+    }
+
+@pytest.fixture
+def stub_server():
+    servers = []
+    def start(**kwargs):
+        server = start_stub_server(**kwargs)
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}/generate"
+    yield start
+    for server in servers:
+        server.shutdown()
+
+def make_summarizer(url, read_timeout=2, threshold=2):
+    return HTTPSummarizer(url, timeout=(1, read_timeout), max_tokens=100, pool_size=2,
+                          breaker=CircuitBreaker(threshold, reset_timeout=60))
+
+def test_build_prompt_respects_token_budget(aggregates):
+    """Test that long lists are truncated to keep the prompt inside the budget."""
+    talkers = {"src_ips": [{"ip": f"172.16.0.{i}", "count": i} for i in range(500)], "ports": []}
+    prompt = build_prompt(15, aggregates, talkers, token_budget=300)
+    assert estimate_tokens(prompt) <= 300
+    assert "DDoS: 3000" in prompt
+    assert "more)" in prompt
+
+    roomy = build_prompt(15, aggregates, token_budget=5000)
+    assert "Notable incidents:" in roomy
+    assert "3000 x DDoS -> Block (Critical Risk)" in roomy
+
+def test_http_summarizer_uses_stub_server(aggregates, stub_server):
+    """Test a round trip to the local stand-in LLM server."""
+    server, url = stub_server()
+    summarizer = make_summarizer(url)
+    summary = summarizer.summarize(build_prompt(15, aggregates), {})
+    assert summary.startswith("Stub LLM summary")
+    summarizer.summarize("again", {})
+    assert server.requests_served == 2
+
+def test_circuit_breaker_skips_failing_backend(stub_server):
+    """Test that the circuit opens after repeated failures and stops calling the server."""
+    server, url = stub_server(fail=True)
+    summarizer = make_summarizer(url, threshold=2)
+    for _ in range(2):
+        with pytest.raises(SummarizerError):
+            summarizer.summarize("prompt", {})
+    assert summarizer.breaker.state == "open"
+
+    with pytest.raises(SummarizerError):
+        summarizer.summarize("prompt", {})
+    assert server.requests_served == 2
+
+def test_timeout_bounds_latency(stub_server):
+    """Test that a slow backend fails within the read timeout."""
+    server, url = stub_server(delay_seconds=1.0)
+    summarizer = make_summarizer(url, read_timeout=0.2)
+    started = time.monotonic()
+    with pytest.raises(SummarizerError):
+        summarizer.summarize("prompt", {})
+    assert time.monotonic() - started < 0.9
+
+@pytest.mark.parametrize('body', [["not", "an", "object"], {"summary": 42}, "text"])
+def test_unexpected_payload_is_a_failure(stub_server, body):
+    """Test that a JSON answer without a summary string raises SummarizerError and reopens a half-open circuit."""
+    _, url = stub_server(response_body=body)
+    summarizer = HTTPSummarizer(url, timeout=(1, 2), max_tokens=100, pool_size=1,
+                                breaker=CircuitBreaker(1, reset_timeout=0))
+    summarizer.breaker.record_failure()  # Open; with reset_timeout=0 the next call is the half-open trial
+    with pytest.raises(SummarizerError, match="no summary"):
+        summarizer.summarize("prompt", {})
+    assert summarizer.breaker.state == "open"
+    assert summarizer.breaker.allow()
+
+def test_circuit_breaker_half_open_recovers():
+    """Test that a successful trial call closes the circuit again."""
+    breaker = CircuitBreaker(1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow()
+    assert breaker.state == "half-open"
+    breaker.record_success()
+    assert breaker.state == "closed"
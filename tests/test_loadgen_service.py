@@ -0,0 +1,91 @@
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from services.loadgen_service import (
+    LatencyHistogram, LoadGenerator, arrival_times, cycle_payloads, rate_profile, synthetic_payloads
+)
+
+class IngestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        IngestHandler.received.append(body)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def ingest_url():
+    """Run a local HTTP server that accepts ingest posts."""
+    IngestHandler.received = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), IngestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/ingest"
+    server.shutdown()
+    server.server_close()
+
+def test_histogram_percentiles():
+    """Test that percentiles are within the histogram's precision."""
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.02)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.02)
+    assert histogram.percentile(99.9) == pytest.approx(0.999, rel=0.02)
+    assert histogram.percentile(100) == pytest.approx(1.0)
+    assert LatencyHistogram().percentile(50) is None
+
+def test_constant_and_poisson_schedules():
+    """Test that both pacing modes offer the configured rate on average."""
+    constant = list(arrival_times(rate_profile(100), 10))
+    assert len(constant) in (999, 1000)
+    assert constant[1] - constant[0] == pytest.approx(0.01)
+
+    poisson = list(arrival_times(rate_profile(100), 100, pacing='poisson', seed=1))
+    assert len(poisson) == pytest.approx(10_000, rel=0.05)
+    gaps = [b - a for a, b in zip(poisson, poisson[1:])]
+    assert len(set(round(g, 6) for g in gaps)) > 100
+
+def test_ramp_profile():
+    """Test that a ramp moves linearly to the target rate and then holds it."""
+    profile = rate_profile(10, ramp_to=110, ramp_seconds=10)
+    assert profile(0) == 10
+    assert profile(5) == 60
+    assert profile(20) == 110
+    ramped = list(arrival_times(profile, 10))
+    assert len(ramped) == pytest.approx(600, rel=0.05)
+
+def test_cycle_payloads_restarts_and_rejects_empty_sources():
+    """Test that payload sources are replayed from the start when exhausted."""
+    payloads = cycle_payloads(lambda: iter([1, 2]))
+    assert [next(payloads) for _ in range(5)] == [1, 2, 1, 2, 1]
+    with pytest.raises(ValueError):
+        next(cycle_payloads(lambda: iter([])))
+
+def test_load_generator_reports_throughput_and_latency(ingest_url):
+    """Test a short run against a local server."""
+    payloads = synthetic_payloads(['Normal', 'DDoS'], seed=0)
+    report = LoadGenerator(ingest_url, payloads, concurrency=4).run(rate=200, duration=0.5, seed=0)
+
+    assert report['sent'] + report['dropped'] == 99
+    assert report['ok'] == report['sent'] > 0 and report['errors'] == 0
+    assert len(IngestHandler.received) == report['sent']
+    assert report['status_codes'] == {200: report['sent']}
+    assert report['offered_rps'] == pytest.approx(198)
+    assert report['latency']['count'] == report['sent']
+    assert report['latency']['p50_ms'] <= report['latency']['p99_ms'] <= report['latency']['max_ms']
+
+def test_errors_are_counted():
+    """Test that connection failures are reported as errors, not raised."""
+    payloads = synthetic_payloads(['Normal'])
+    report = LoadGenerator('http://127.0.0.1:9/api/ingest', payloads, concurrency=2, timeout=0.5).run(rate=20, duration=0.2)
+    assert report['ok'] == 0
+    assert report['errors'] == report['sent'] > 0
@@ -0,0 +1,67 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from services.model_registry import ModelRegistry
+
+@pytest.fixture
+def model_paths(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(100, 4))
+    y = (X[:, 0] > 0).astype(int)
+    rf = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    weights = np.arange(100_000, dtype=np.float64)
+    joblib.dump(rf, tmp_path / 'rf.pkl')
+    joblib.dump({"weights": weights}, tmp_path / 'weights.pkl')
+    return {"rf": str(tmp_path / 'rf.pkl'), "weights": str(tmp_path / 'weights.pkl')}, X, rf
+
+def test_models_load_on_first_use(model_paths):
+    """Test that nothing is loaded until a model is requested, and it is loaded only once."""
+    paths, X, rf = model_paths
+    registry = ModelRegistry(paths)
+    assert not registry.is_loaded("rf")
+
+    model = registry.get("rf")
+    assert registry.is_loaded("rf")
+    assert not registry.is_loaded("weights")
+    assert registry.get("rf") is model
+    np.testing.assert_allclose(model.predict_proba(X), rf.predict_proba(X))
+
+def test_arrays_are_memory_mapped(model_paths):
+    """Test that large arrays are memory-mapped read-only rather than copied."""
+    paths, _, _ = model_paths
+    weights = ModelRegistry(paths, mmap_mode='r').get("weights")["weights"]
+    assert isinstance(weights, np.memmap)
+    assert not weights.flags.writeable
+
+def test_stats_report_load_time_and_size(model_paths):
+    """Test that stats cover every registered model."""
+    paths, _, _ = model_paths
+    registry = ModelRegistry(paths)
+    registry.get("weights")
+    stats = registry.stats()
+    assert stats["weights"]["loaded"] is True
+    assert stats["weights"]["load_seconds"] >= 0
+    assert stats["weights"]["file_bytes"] > 800_000
+    assert "resident_bytes" in stats["weights"]
+    assert stats["rf"]["loaded"] is False
+
+def test_unknown_model_raises(model_paths):
+    """Test that an unregistered name raises a KeyError."""
+    paths, _, _ = model_paths
+    with pytest.raises(KeyError):
+        ModelRegistry(paths).get("missing")
+
+def test_version_follows_the_loaded_models(model_paths):
+    """Test that the version describes the loaded models and a replaced file is reloaded with a new version."""
+    paths, X, rf = model_paths
+    registry = ModelRegistry(paths)
+    before = registry.version(["rf"])
+    assert registry.is_loaded("rf")
+    assert registry.version(["rf"]) == before
+    assert ModelRegistry(paths).version(["rf"]) == before
+
+    replacement = RandomForestClassifier(n_estimators=2, random_state=1).fit(X, X[:, 1] > 0)
+    joblib.dump(replacement, paths["rf"])
+    assert registry.version(["rf"]) != before
+    np.testing.assert_allclose(registry.get("rf").predict_proba(X), replacement.predict_proba(X))
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from services.prediction_cache import PredictionCache
+
+class CountingModel:
+    """Scores rows by their sum and records how many rows it was asked to score."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, features):
+        self.calls.append(len(features))
+        return features.sum(axis=1)
+
+def test_repeated_rows_skip_inference():
+    """Test that only distinct, uncached rows reach the model."""
+    model = CountingModel()
+    cache = PredictionCache(maxsize=100, quantum=1e-4)
+    features = np.array([[0.1, 0.2], [0.3, 0.4], [0.1, 0.2], [0.1, 0.2]])
+
+    np.testing.assert_allclose(cache.predict(features, model), [0.3, 0.7, 0.3, 0.3])
+    assert model.calls == [2]
+
+    np.testing.assert_allclose(cache.predict(features[:2], model), [0.3, 0.7])
+    assert model.calls == [2]
+
+    stats = cache.stats()
+    assert stats["rows"] == 6
+    assert stats["inferred_rows"] == 2
+    assert stats["inference_skip_rate"] == pytest.approx(4 / 6)
+    assert stats["hits"] == 2
+
+def test_quantization_merges_nearby_vectors():
+    """Test that vectors equal after quantization share a cache entry."""
+    model = CountingModel()
+    cache = PredictionCache(maxsize=100, quantum=1e-3)
+    cache.predict(np.array([[0.5000, 0.25]]), model)
+    cache.predict(np.array([[0.50004, 0.25]]), model)
+    cache.predict(np.array([[0.502, 0.25]]), model)
+    assert model.calls == [1, 1]
+
+def test_model_version_change_invalidates():
+    """Test that a new model version drops cached scores."""
+    model = CountingModel()
+    cache = PredictionCache(maxsize=100)
+    features = np.array([[1.0, 2.0]])
+    cache.predict(features, model, model_version=1)
+    cache.predict(features, model, model_version=1)
+    assert model.calls == [1]
+    cache.predict(features, model, model_version=2)
+    assert model.calls == [1, 1]
+
+def test_dict_results_and_eviction():
+    """Test that dict outputs are cached per row and the cache stays bounded."""
+    calls = []
+    def predict_fn(features):
+        calls.append(len(features))
+        return {"label": np.where(features[:, 0] > 0, 'attack', 'normal'), "score": features[:, 0] * 10}
+
+    cache = PredictionCache(maxsize=2)
+    first = cache.predict(np.array([[1.0], [-1.0], [2.0]]), predict_fn)
+    assert list(first["label"]) == ['attack', 'normal', 'attack']
+    np.testing.assert_allclose(first["score"], [10, -10, 20])
+    assert len(cache._cache) == 2
+
+    # [-1.0] and [2.0] are cached; [1.0] was evicted
+    second = cache.predict(np.array([[2.0], [-1.0]]), predict_fn)
+    assert list(second["label"]) == ['attack', 'normal']
+    assert calls == [3]
+
+def test_non_finite_rows_bypass_the_cache():
+    """Test that rows with NaN, infinite or huge values are scored every time and never cached."""
+    model = CountingModel()
+    cache = PredictionCache(maxsize=100, quantum=1e-4)
+    features = np.array([[np.nan, 1.0], [np.inf, 1.0], [1e300, 1.0], [1.0, 1.0], [np.nan, 1.0]])
+
+    first = cache.predict(features, model)
+    assert model.calls == [5]
+    assert np.isnan(first[0]) and np.isinf(first[1]) and first[3] == 2.0
+    cache.predict(features, model)
+    assert model.calls == [5, 4]
+    assert len(cache._cache) == 1
@@ -0,0 +1,102 @@
+import math
+import threading
+import time
+import pandas as pd
+import pytest
+from services.replay_service import iter_chunks, iter_payloads, parse_speed, to_seconds, ReplayScheduler
+
+@pytest.fixture
+def replay_files(tmp_path):
+    """Write a packet file of 25 rows and a prediction file of 23 rows."""
+    packets = pd.DataFrame({
+        'src_ip': [f'10.0.0.{i}' for i in range(25)],
+        'port': range(25),
+        'confidence_score': [float(i) if i % 5 else None for i in range(25)],
+    })
+    predictions = pd.DataFrame({'label': [f'class-{i}' for i in range(23)], 'score': [i / 10 for i in range(23)]})
+    packet_path, prediction_path = tmp_path / 'packets.csv', tmp_path / 'predictions.csv'
+    packets.to_csv(packet_path, index=False)
+    predictions.to_csv(prediction_path, index=False)
+    return str(packet_path), str(prediction_path)
+
+def test_chunks_are_bounded(replay_files):
+    """Test that files are parsed in chunks of at most chunk_rows rows."""
+    packet_path, _ = replay_files
+    assert [len(chunk) for chunk in iter_chunks(packet_path, chunk_rows=10)] == [10, 10, 5]
+
+def test_payloads_are_aligned_native_records(replay_files):
+    """Test that rows of both files are paired in order as native Python values."""
+    payloads = list(iter_payloads(*replay_files, chunk_rows=4))
+    assert len(payloads) == 23  # stops with the shorter file
+
+    first = payloads[7]
+    assert first['packet_data'] == {'src_ip': '10.0.0.7', 'port': 7, 'confidence_score': 7.0}
+    assert first['prediction_data'] == {'label': 'class-7', 'score': 0.7}
+    assert type(first['packet_data']['port']) is int
+    assert math.isnan(payloads[5]['packet_data']['confidence_score'])
+
+def test_closing_stops_reading(replay_files):
+    """Test that a partially consumed stream can be closed early."""
+    payloads = iter_payloads(*replay_files, chunk_rows=4)
+    assert next(payloads)['packet_data']['port'] == 0
+    payloads.close()
+    with pytest.raises(StopIteration):
+        next(payloads)
+
+def timed_payloads(offsets_ms, start='2024-05-01 12:00:00'):
+    base = pd.Timestamp(start)
+    return [{"packet_data": {"id": i, "timestamp": str(base + pd.Timedelta(milliseconds=ms))}, "prediction_data": {}}
+            for i, ms in enumerate(offsets_ms)]
+
+def release_times(scheduler, payloads, consume=None):
+    started = time.monotonic()
+    times = []
+    for payload in scheduler.replay(payloads):
+        times.append(time.monotonic() - started)
+        if consume:
+            consume(payload)
+    return times
+
+def test_parse_speed_and_timestamps():
+    """Test speed factors and timestamp parsing."""
+    assert parse_speed(10) == 10.0 and parse_speed('2.5x') == 2.5
+    assert parse_speed('max') is None and parse_speed(None) is None
+    for bad in (0, -1, 'fast', float('inf')):
+        with pytest.raises(ValueError):
+            parse_speed(bad)
+    assert to_seconds('2024-05-01 12:00:00.250') - to_seconds('2024-05-01 12:00:00') == pytest.approx(0.25)
+    assert to_seconds(1700000000) == 1700000000.0
+    assert to_seconds('not a time') is None and to_seconds(float('nan')) is None
+
+def test_replay_reproduces_scaled_gaps():
+    """Test that payloads are released at their recorded offsets divided by the speed."""
+    times = release_times(ReplayScheduler(speed=10), timed_payloads([0, 500, 1000, 3000]))
+    assert times == pytest.approx([0, 0.05, 0.1, 0.3], abs=0.03)
+
+def test_replay_catches_up_without_drift():
+    """Test that a slow consumer is followed by a burst that returns to the original schedule."""
+    def slow_first(payload):
+        if payload["packet_data"]["id"] == 0:
+            time.sleep(0.15)
+
+    scheduler = ReplayScheduler(speed=1)
+    times = release_times(scheduler, timed_payloads([0, 20, 40, 60, 200]), consume=slow_first)
+    # The three overdue payloads go out back to back, the last one on its original time
+    assert times[3] - times[1] < 0.02
+    assert times[4] == pytest.approx(0.2, abs=0.03)
+    assert scheduler.stats()["max_lag_ms"] > 100
+
+def test_replay_max_speed_and_untimed_rows():
+    """Test that speed None and rows without timestamps do not wait."""
+    payloads = timed_payloads([0, 5000]) + [{"packet_data": {"id": 2}, "prediction_data": {}}]
+    assert release_times(ReplayScheduler(speed=None), payloads)[-1] < 0.05
+    assert [p["packet_data"]["id"] for p in ReplayScheduler(speed=None).replay(payloads)] == [0, 1, 2]
+
+def test_replay_stops_during_a_wait():
+    """Test that setting the stop event interrupts a long wait."""
+    stop = threading.Event()
+    threading.Timer(0.05, stop.set).start()
+    started = time.monotonic()
+    released = list(ReplayScheduler(speed=1, stop=stop).replay(timed_payloads([0, 60_000])))
+    assert len(released) == 1
+    assert time.monotonic() - started < 1
@@ -0,0 +1,118 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from services.batch_mitigation_service import IPStateTracker, plan_mitigation
+from services.sharding_service import ShardedController, partition_by_ip, synthetic_traffic
+
+def score_from_feature(df):
+    """Use the first feature column as the zero-trust score."""
+    return df["f0"].to_numpy()
+
+def failing_score(df):
+    raise ValueError("model unavailable")
+
+def checked_score(df):
+    """Fail unless the shard keeps the column order, dtypes and index of the batch."""
+    assert list(df.columns) == ["f0", "port", "src_ip", "flag"]
+    assert (df.dtypes["port"], df.dtypes["flag"]) == (np.dtype(np.int32), np.dtype(bool))
+    assert (df.index >= 1000).all()
+    return df["f0"].to_numpy()
+
+def slow_score(df):
+    """Sleep for as long as the batch asks, then score from the first feature."""
+    time.sleep(df["delay"].iloc[0])
+    return df["f0"].to_numpy()
+
+@pytest.fixture
+def traffic():
+    return synthetic_traffic(2000, n_features=4, n_ips=50)
+
+def test_partition_is_stable_and_complete(traffic):
+    """Test that every row gets a shard and an IP always maps to the same shard."""
+    shards = partition_by_ip(traffic["src_ip"], 4)
+    assert shards.min() >= 0 and shards.max() < 4
+    per_ip = pd.Series(shards).groupby(traffic["src_ip"].to_numpy()).nunique()
+    assert (per_ip == 1).all()
+    np.testing.assert_array_equal(partition_by_ip(traffic["src_ip"], 4), shards)
+
+def test_sharded_plan_matches_single_process(traffic):
+    """Test that the merged plan from the shards equals the plan for the whole batch."""
+    expected = plan_mitigation(traffic["src_ip"].to_numpy(), traffic["f0"].to_numpy())
+    controller = ShardedController(score_from_feature, n_workers=3, result_timeout=30)
+    try:
+        plan = controller.process(traffic)
+        # A second batch gets new shared-memory buffers
+        second = controller.process(traffic.iloc[:500])
+    finally:
+        controller.close()
+
+    for action in ("block", "rate_limit", "allow"):
+        assert sorted(plan[action]) == sorted(expected[action])
+    assert plan["worst_scores"] == pytest.approx(expected["worst_scores"])
+    assert plan["counts"] == expected["counts"]
+    # Each worker keeps the state of its IPs, so the second plan matches a serial tracker fed both batches
+    serial = IPStateTracker()
+    serial.plan(traffic["src_ip"].to_numpy(), traffic["f0"].to_numpy())
+    expected_second = serial.plan(traffic["src_ip"].to_numpy()[:500], traffic["f0"].to_numpy()[:500])
+    assert second["counts"] == expected_second["counts"]
+    assert second["worst_scores"] == pytest.approx(expected_second["worst_scores"])
+
+def test_shards_see_the_original_frame(traffic):
+    """Test that workers rebuild the batch with its column order, dtypes and index."""
+    df = pd.DataFrame({
+        "f0": traffic["f0"], "port": np.arange(len(traffic), dtype=np.int32),
+        "src_ip": traffic["src_ip"], "flag": traffic["f1"] > 0.5
+    }).iloc[1000:]
+    controller = ShardedController(checked_score, n_workers=2, result_timeout=30)
+    try:
+        plan = controller.process(df)
+    finally:
+        controller.close()
+    assert plan["counts"] == plan_mitigation(df["src_ip"].to_numpy(), df["f0"].to_numpy())["counts"]
+
+def test_timed_out_worker_is_replaced(traffic):
+    """Test that a worker that misses the deadline is restarted and the next batch gets its own plan."""
+    slow = traffic.assign(delay=1.0, f0=0.0)
+    fast = traffic.assign(delay=0.0)
+    controller = ShardedController(slow_score, n_workers=1, result_timeout=0.3)
+    try:
+        with pytest.raises(RuntimeError, match="did not answer"):
+            controller.process(slow)
+        controller.result_timeout = 30
+        plan = controller.process(fast)
+    finally:
+        controller.close()
+    assert plan["counts"] == plan_mitigation(fast["src_ip"].to_numpy(), fast["f0"].to_numpy())["counts"]
+    assert controller.restarts == 1
+
+def test_killed_worker_is_replaced(traffic):
+    """Test that a worker killed mid-batch fails only that batch and is restarted for the next one."""
+    controller = ShardedController(slow_score, n_workers=2, result_timeout=30)
+    try:
+        victim = controller._shards[0][0]
+        killer = threading.Timer(0.3, victim.kill)
+        killer.start()
+        with pytest.raises(RuntimeError, match="exited"):
+            controller.process(traffic.assign(delay=1.0))
+        killer.join()
+        plan = controller.process(traffic.assign(delay=0.0))
+    finally:
+        controller.close()
+    assert controller.restarts == 1
+    assert controller._shards[0][0] is not victim
+    assert plan["counts"]["rows"] == len(traffic)
+
+def test_worker_that_died_between_batches_is_replaced(traffic):
+    """Test that a dead worker is restarted before the next batch is sent to it."""
+    controller = ShardedController(score_from_feature, n_workers=2, result_timeout=30)
+    try:
+        victim = controller._shards[1][0]
+        victim.kill()
+        victim.join()
+        plan = controller.process(traffic)
+    finally:
+        controller.close()
+    assert controller.restarts == 1
+    assert plan["counts"]["rows"] == len(traffic)
@@ -0,0 +1,57 @@
+from services.summary_service import generate_summary_from_llm
+
+def test_summary_without_activity():
+    """Test the summary when nothing was ingested in the interval."""
+    assert generate_summary_from_llm(15, {"total": 0}) == "No significant network activity detected."
+
+def test_summary_reports_aggregates():
+    """Test that the summary reports the aggregated counts."""
+    aggregates = {
+        "total": 3,
+        "predictions": {"DDoS": 2, "Normal": 1},
+        "actions": {"Block": 2, "Allow": 1},
+        "top_src_ips": [("1.1.1.1", 2)]
+    }
+    summary = generate_summary_from_llm(15, aggregates)
+    assert "processed 3 packets in the last 15 minutes" in summary
+    assert "- DDoS: 2" in summary
+    assert "- 1.1.1.1: 2" in summary
+    assert "actively mitigated" in summary
+
+def test_get_summary_is_cached_until_new_events():
+    """Test that summaries are reused until new events are aggregated."""
+    from unittest.mock import patch
+    from services import summary_service, aggregate_service, talker_service
+    aggregate_service.reset()
+    talker_service.reset()
+    summary_service.summary_cache.clear()
+
+    with patch('services.summary_service.generate_summary_from_llm', return_value='report') as mock_generate:
+        summary_service.get_summary(15)
+        summary_service.get_summary(15)
+        assert mock_generate.call_count == 1
+
+        aggregate_service.record({"attack_prediction": "DDoS", "action": "Block", "trust_level": "Critical Risk",
+                                  "details": {"src_ip": "1.1.1.1"}})
+        summary_service.get_summary(15)
+        assert mock_generate.call_count == 2
+    aggregate_service.reset()
+
+def test_fallback_summaries_are_not_cached():
+    """Test that the template summary served during an LLM outage is replaced once the LLM recovers."""
+    from unittest.mock import patch, MagicMock
+    from services import summary_service, aggregate_service, talker_service, llm_service
+    aggregate_service.reset()
+    talker_service.reset()
+    summary_service.summary_cache.clear()
+    aggregate_service.record({"attack_prediction": "DDoS", "action": "Block", "trust_level": "Critical Risk",
+                              "details": {"src_ip": "1.1.1.1"}})
+
+    summarizer = MagicMock()
+    summarizer.summarize.side_effect = [llm_service.SummarizerError("LLM down"), "llm report"]
+    with patch.object(llm_service, 'get_summarizer', return_value=summarizer):
+        assert "processed 1 packets" in summary_service.get_summary(15)
+        assert summary_service.get_summary(15) == "llm report"
+        assert summary_service.get_summary(15) == "llm report"
+    assert summarizer.summarize.call_count == 2
+    aggregate_service.reset()
@@ -0,0 +1,90 @@
+import os
+import pytest
+from services.tail_service import CSVTailer
+
+@pytest.fixture
+def csv_path(tmp_path):
+    return tmp_path / 'latest.csv'
+
+def read_all(tailer):
+    chunks = list(tailer.read_chunks())
+    return [row for chunk in chunks for row in chunk['src_ip'].tolist()], chunks
+
+def test_reads_only_appended_rows(csv_path):
+    """Test that each call parses only the rows appended since the previous one."""
+    csv_path.write_text("src_ip,score\n1.1.1.1,0.1\n2.2.2.2,0.2\n")
+    tailer = CSVTailer(str(csv_path))
+    assert read_all(tailer)[0] == ['1.1.1.1', '2.2.2.2']
+    assert read_all(tailer)[0] == []
+
+    with open(csv_path, 'a') as f:
+        f.write("3.3.3.3,0.3\n4.4.4")
+    assert read_all(tailer)[0] == ['3.3.3.3']
+
+    # The partial line is completed by the next write
+    with open(csv_path, 'a') as f:
+        f.write(".4,0.4\n")
+    assert read_all(tailer)[0] == ['4.4.4.4']
+
+def test_missing_file_yields_nothing(csv_path):
+    """Test that a file that does not exist yet is simply skipped."""
+    tailer = CSVTailer(str(csv_path))
+    assert read_all(tailer)[0] == []
+    csv_path.write_text("src_ip,score\n1.1.1.1,0.1\n")
+    assert read_all(tailer)[0] == ['1.1.1.1']
+
+def test_chunks_are_bounded(csv_path):
+    """Test that rows are yielded in chunks of at most chunk_size with a fresh index."""
+    csv_path.write_text("src_ip,score\n" + "".join(f"10.0.0.{i},0.5\n" for i in range(25)))
+    rows, chunks = read_all(CSVTailer(str(csv_path), chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(chunks[1].index) == list(range(10))
+    assert len(rows) == 25
+
+def test_truncation_restarts_from_header(csv_path):
+    """Test that a truncated file is re-read from the top."""
+    csv_path.write_text("src_ip,score\n1.1.1.1,0.1\n2.2.2.2,0.2\n")
+    tailer = CSVTailer(str(csv_path))
+    read_all(tailer)
+    with open(csv_path, 'w') as f:
+        f.write("src_ip,score\n5.5.5.5,0.5\n")
+    assert read_all(tailer)[0] == ['5.5.5.5']
+
+def test_rotation_drains_old_file_then_follows_new(csv_path):
+    """Test that rows appended before rotation are not lost."""
+    csv_path.write_text("src_ip,score\n1.1.1.1,0.1\n")
+    tailer = CSVTailer(str(csv_path))
+    read_all(tailer)
+
+    with open(csv_path, 'a') as f:
+        f.write("2.2.2.2,0.2\n")
+    os.rename(csv_path, str(csv_path) + '.1')
+    csv_path.write_text("src_ip,score\n3.3.3.3,0.3\n")
+    assert read_all(tailer)[0] == ['2.2.2.2', '3.3.3.3']
+
+def test_failed_chunk_is_read_again(csv_path):
+    """Test that rows of a chunk whose processing raised are yielded again by the next call."""
+    csv_path.write_text("src_ip,score\n" + "".join(f"10.0.0.{i},0.5\n" for i in range(25)))
+    tailer = CSVTailer(str(csv_path), chunk_size=10)
+    seen = []
+    with pytest.raises(RuntimeError):
+        for chunk in tailer.read_chunks():
+            if seen:
+                raise RuntimeError("scoring failed")
+            seen.extend(chunk['src_ip'])
+
+    rows, chunks = read_all(tailer)
+    assert rows == [f"10.0.0.{i}" for i in range(10, 25)]
+    assert [len(chunk) for chunk in chunks] == [10, 5]
+
+def test_backlog_is_read_one_chunk_at_a_time(csv_path):
+    """Test that only about chunk_size lines are read before a chunk is yielded."""
+    csv_path.write_text("src_ip,score\n" + "".join(f"10.0.0.{i % 250},0.5\n" for i in range(10_000)))
+    tailer = CSVTailer(str(csv_path), chunk_size=100)
+    chunks = tailer.read_chunks()
+    assert len(next(chunks)) == 100
+    assert tailer._file.raw.tell() < csv_path.stat().st_size / 5
+    assert tailer._offset == len("src_ip,score\n")  # Not committed until the next chunk is asked for
+    next(chunks)
+    assert tailer._offset > len("src_ip,score\n")
+    chunks.close()
@@ -0,0 +1,63 @@
+import random
+import pytest
+from collections import Counter
+from services import talker_service
+from services.talker_service import SpaceSaving
+
+NOW = 1_000_000 * 60  # An exact minute boundary
+
+@pytest.fixture(autouse=True)
+def reset_windows():
+    talker_service.reset()
+    yield
+    talker_service.reset()
+
+def make_stream(seed):
+    """A few heavy hitters hidden in a long tail of spoofed one-off IPs."""
+    rng = random.Random(seed)
+    stream = ['10.0.0.1'] * 500 + ['10.0.0.2'] * 300 + ['10.0.0.3'] * 200
+    stream += [f"172.16.{rng.randint(0, 255)}.{rng.randint(0, 255)}" for _ in range(3000)]
+    rng.shuffle(stream)
+    return stream
+
+def test_space_saving_finds_heavy_hitters_in_fixed_memory():
+    """Test that heavy hitters are found while the sketch stays at capacity."""
+    sketch = SpaceSaving(capacity=20)
+    stream = make_stream(1)
+    for ip in stream:
+        sketch.add(ip)
+
+    assert len(sketch.counts) == 20
+    top = sketch.top(3)
+    assert [item for item, _, _ in top] == ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+
+    # Estimates never undercount, and count - error never overcounts
+    exact = Counter(stream)
+    for item, count, error in top:
+        assert count - error <= exact[item] <= count
+
+def test_space_saving_merge_and_serialisation():
+    """Test that sketches built on separate workers merge into the same heavy hitters."""
+    left, right = SpaceSaving(capacity=20), SpaceSaving(capacity=20)
+    for ip in make_stream(1):
+        left.add(ip)
+    for ip in make_stream(2):
+        right.add(ip)
+
+    merged = left.merge(SpaceSaving.from_dict(right.to_dict()))
+    assert len(merged.counts) == 20
+    assert [item for item, _, _ in merged.top(3)] == ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+    assert merged.top(1)[0][1] >= 1000
+
+def test_get_top_talkers_is_windowed():
+    """Test that only windows inside the interval are reported."""
+    talker_service.record_malicious('1.1.1.1', 22, NOW - 30 * 60)
+    talker_service.record_malicious('2.2.2.2', 80, NOW)
+    talker_service.record_malicious('2.2.2.2', 80, NOW + 5)
+
+    recent = talker_service.get_top_talkers(15, now=NOW + 10)
+    assert recent["src_ips"] == [{"ip": "2.2.2.2", "count": 2, "error": 0}]
+    assert recent["ports"] == [{"port": 80, "count": 2, "error": 0}]
+
+    hour = talker_service.get_top_talkers(60, now=NOW + 10)
+    assert [t["ip"] for t in hour["src_ips"]] == ['2.2.2.2', '1.1.1.1']
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from services.traffic_generator import (
+    TrafficGenerator, generate_chunks, parse_attack_mix, write_dataset, HEADERS
+)
+
+def test_seed_reproduces_rows():
+    """Test that the same seed and chunk sizes give identical data."""
+    first = pd.concat(generate_chunks(5000, 1000, seed=7, start='2024-01-01'))
+    second = pd.concat(generate_chunks(5000, 1000, seed=7, start='2024-01-01'))
+    pd.testing.assert_frame_equal(first, second)
+    assert list(first.columns) == HEADERS
+    assert len(first) == 5000
+
+def test_background_traffic_distribution():
+    """Test the attack ratio, attack mix, Zipf-skewed source IPs and gaps of background rows."""
+    df = TrafficGenerator(seed=1, n_ips=1000, zipf_exponent=1.2, attack_ratio=0.3,
+                          attack_mix={"DDoS": 3, "XSS": 1}).chunk(100_000)
+    assert df["is_malicious"].mean() == pytest.approx(0.3, abs=0.01)
+    attacks = df.loc[df["is_malicious"] == 1, "attack_type"].value_counts(normalize=True)
+    assert set(attacks.index) == {"DDoS", "XSS"}
+    assert attacks["DDoS"] == pytest.approx(0.75, abs=0.02)
+    assert (df.loc[df["is_malicious"] == 0, "attack_type"] == "Normal").all()
+    assert df.loc[df["is_malicious"] == 1, "confidence_score"].min() >= 80
+
+    ip_share = df["src_ip"].value_counts(normalize=True)
+    assert ip_share.iloc[0] > 0.15  # the most popular IP of 1000 sends a large share
+    gaps = df["timestamp"].diff().dropna().dt.total_seconds() * 1000
+    assert gaps.min() >= 50 and gaps.max() <= 500
+
+def test_campaigns_are_bursts_that_cross_chunks():
+    """Test that campaign rows share source, attack and port, arrive in bursts and continue into the next chunk."""
+    generator = TrafficGenerator(seed=3, attack_ratio=0.0, campaign_rate=0.002, campaign_rows=400)
+    chunks = [generator.chunk(2000) for _ in range(10)]
+    df = pd.concat(chunks, ignore_index=True)
+    campaign = df["is_malicious"] == 1
+    assert 0.1 < campaign.mean() < 0.9
+
+    # Runs of consecutive campaign rows
+    run_ids = (campaign != campaign.shift()).cumsum()[campaign]
+    for _, run in df[campaign].groupby(run_ids):
+        if len(run) > 1:
+            gaps = run["timestamp"].diff().dropna().dt.total_seconds() * 1000
+            assert gaps.max() <= 20
+    crossing = [i for i in range(1, 10) if chunks[i - 1]["is_malicious"].iloc[-1] and chunks[i]["is_malicious"].iloc[0]]
+    assert crossing
+    for i in crossing:
+        last, first = chunks[i - 1].iloc[-1], chunks[i].iloc[0]
+        assert (last["src_ip"], last["attack_type"], last["port"]) == (first["src_ip"], first["attack_type"], first["port"])
+        assert first["timestamp"] > last["timestamp"]
+
+def test_write_csv_in_chunks(tmp_path):
+    """Test that chunks are written as one CSV with a single header and millisecond timestamps."""
+    path = tmp_path / "traffic.csv"
+    rows = write_dataset(generate_chunks(2500, 1000, seed=0, start='2024-01-01 00:00:00'), str(path))
+    df = pd.read_csv(path)
+    assert rows == len(df) == 2500
+    assert list(df.columns) == HEADERS
+    assert pd.to_datetime(df["timestamp"]).is_monotonic_increasing
+    assert df["timestamp"].str.match(r"^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\.\d{3}$").all()
+
+def test_write_parquet(tmp_path):
+    """Test Parquet output (needs pyarrow)."""
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "traffic.parquet"
+    assert write_dataset(generate_chunks(2500, 1000, seed=0), str(path)) == 2500
+    assert list(pd.read_parquet(path).columns) == HEADERS
+
+def test_parse_attack_mix():
+    """Test attack mix parsing and validation."""
+    assert parse_attack_mix("DDoS=5, Port Scanning=2,XSS") == {"DDoS": 5.0, "Port Scanning": 2.0, "XSS": 1.0}
+    for bad in ("Teleportation=1", "Normal=1", "DDoS=0", ""):
+        with pytest.raises(ValueError):
+            parse_attack_mix(bad)
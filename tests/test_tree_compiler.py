@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+from sklearn.tree import DecisionTreeClassifier
+from services.tree_compiler import CompiledForest, compile_ensemble
+
+@pytest.fixture
+def data():
+    """Provide a small three-class dataset and rows to score."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 6)).astype(np.float32)
+    y = (X[:, 0] > 0).astype(int) + (X[:, 1] + X[:, 2] > 0.5).astype(int)
+    X_test = rng.normal(size=(300, 6)).astype(np.float32)
+    return X, y, X_test
+
+@pytest.mark.parametrize('model', [
+    RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0),
+    ExtraTreesClassifier(n_estimators=25, random_state=0),
+    DecisionTreeClassifier(random_state=0),
+])
+def test_matches_sklearn(model, data):
+    """Test that compiled sklearn trees give the same probabilities as the originals."""
+    X, y, X_test = data
+    model.fit(X, y)
+    compiled = compile_ensemble(model)
+    np.testing.assert_allclose(compiled.predict_proba(X_test), model.predict_proba(X_test), atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X_test), model.predict(X_test))
+
+def test_string_classes_and_single_row(data):
+    """Test that class labels are kept and a single row is scored correctly."""
+    X, y, X_test = data
+    labels = np.array(['Normal', 'DDoS', 'Botnet'])[y]
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, labels)
+    compiled = compile_ensemble(model)
+    assert list(compiled.classes_) == list(model.classes_)
+    np.testing.assert_allclose(compiled.predict_proba(X_test[:1]), model.predict_proba(X_test[:1]))
+
+def test_chunked_prediction(data):
+    """Test that large batches evaluated in chunks match a single evaluation."""
+    X, y, X_test = data
+    compiled = compile_ensemble(RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y))
+    np.testing.assert_allclose(compiled.predict_proba(X_test, chunk_rows=64), compiled.predict_proba(X_test))
+
+def test_missing_values(data):
+    """Test that NaN inputs follow the same branches as in sklearn."""
+    X, y, X_test = data
+    X = X.copy()
+    X[::7, 0] = np.nan
+    X_test = X_test.copy()
+    X_test[::3, 0] = np.nan
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    np.testing.assert_allclose(compile_ensemble(model).predict_proba(X_test), model.predict_proba(X_test), atol=1e-12)
+
+def test_save_and_load(data, tmp_path):
+    """Test that node arrays round-trip through an .npz file."""
+    X, y, X_test = data
+    compiled = compile_ensemble(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y))
+    compiled.save(tmp_path / 'rf.npz')
+    loaded = CompiledForest.load(tmp_path / 'rf.npz')
+    np.testing.assert_array_equal(loaded.predict_proba(X_test), compiled.predict_proba(X_test))
+
+def test_lightgbm_matches(data):
+    """Test that compiled LightGBM models match the original."""
+    lightgbm = pytest.importorskip('lightgbm')
+    X, y, X_test = data
+    model = lightgbm.LGBMClassifier(n_estimators=20, verbose=-1).fit(X, y)
+    np.testing.assert_allclose(compile_ensemble(model).predict_proba(X_test), model.predict_proba(X_test), atol=1e-9)
+
+def test_xgboost_matches(data):
+    """Test that compiled XGBoost models match the original."""
+    xgboost = pytest.importorskip('xgboost')
+    X, y, X_test = data
+    model = xgboost.XGBClassifier(n_estimators=20, max_depth=4).fit(X, y)
+    np.testing.assert_allclose(compile_ensemble(model).predict_proba(X_test), model.predict_proba(X_test), atol=1e-5)
+
+def test_unsupported_model():
+    """Test that non-tree models are rejected."""
+    with pytest.raises(NotImplementedError):
+        compile_ensemble(object())